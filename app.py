@@ -4,25 +4,61 @@ app.py
 E-Commerce Backend — Flask Application Entry Point
 Architecture | Layered Design | JWT Auth | MySQL
 
-Run:
+Run (development server):
     python app.py
 
 Or with environment variables:
     DB_PASSWORD=secret python app.py
+
+In production use the prefork launcher instead: python server.py
+(or the ASGI entry point, with coroutine routes: uvicorn asgi:app)
 """
 
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 from config import config
+from utils import db
 
 # ── Route blueprints ───────────────────────────────────────────
 from routes.auth_routes    import auth_bp
 from routes.product_routes import products_bp
 from routes.cart_routes    import cart_bp
 from routes.order_routes   import orders_bp
-
-
-def create_app() -> Flask:
-    """Application factory — creates and configures the Flask app."""
+from routes.batch_routes   import batch_bp, SUB_REQUEST
+from routes.async_routes   import init_async_routes
+
+from services.order_service          import OrderService
+from services.recommendation_service import RecommendationService
+from services.token_service          import TokenService
+
+from utils.compression import init_compression
+from utils.deadline    import init_deadlines
+from utils.metrics     import init_metrics
+from utils.profiler    import init_profiling
+from utils.tracing     import init_tracing, start_exporter
+from utils.rate_limit  import init_rate_limiting
+
+
+def start_background_tasks():
+    """
+    Per-process threads: replica health checks, revocation sync, the
+    related-products refresh, the sales-rollup queue and the trace exporter. Threads do not
+    survive fork(), so the prefork launcher (server.py) calls this in
+    every worker instead of letting create_app() start them in the parent.
+    """
+    db.start_replica_health_checks()
+    TokenService.start()
+    RecommendationService.start()
+    OrderService.start()
+    start_exporter()
+
+
+def create_app(background: bool = True, async_routes: bool = None) -> Flask:
+    """
+    Application factory — creates and configures the Flask app.
+    background=False leaves start_background_tasks() to the caller.
+    async_routes (default: config.ASYNC_ROUTES) serves the catalogue,
+    cart and checkout endpoints as coroutines (routes/async_routes.py).
+    """
     app = Flask(__name__)
 
     # ── App config ─────────────────────────────────────────────
@@ -34,6 +70,36 @@ def create_app() -> Flask:
     app.register_blueprint(products_bp)
     app.register_blueprint(cart_bp)
     app.register_blueprint(orders_bp)
+    app.register_blueprint(batch_bp)
+
+    # ── Coroutine routes (utils.adb, needs aiomysql) ───────────
+    if config.ASYNC_ROUTES if async_routes is None else async_routes:
+        init_async_routes(app)
+
+    # ── Database routing (read replicas) ───────────────────────
+    @app.before_request
+    def _reset_routing():
+        # /batch sub-requests keep the batch's routing (see batch_routes)
+        if not request.environ.get(SUB_REQUEST):
+            db.reset_routing()
+
+    # ── Background threads ─────────────────────────────────────
+    if background:
+        start_background_tasks()
+
+    # ── Observability (metrics, tracing, profiler) ─────────────
+    init_metrics(app)
+    init_tracing(app)
+    init_profiling(app)
+
+    # ── Rate limiting & load shedding ──────────────────────────
+    init_rate_limiting(app)
+
+    # ── Request deadlines (504 once the budget is spent) ───────
+    init_deadlines(app)
+
+    # ── Response compression (registered last → runs first) ────
+    init_compression(app)
 
     # ── Root health check ──────────────────────────────────────
     @app.route("/")
@@ -46,7 +112,8 @@ def create_app() -> Flask:
                 "auth":     "/auth",
                 "products": "/products",
                 "cart":     "/cart",
-                "orders":   "/orders"
+                "orders":   "/orders",
+                "batch":    "/batch"
             }
         })
 
@@ -0,0 +1,57 @@
+"""
+asgi.py
+───────
+ASGI entry point — create_app() with the coroutine routes
+(routes/async_routes.py), for an ASGI server such as uvicorn.
+
+  • Flask runs behind asgiref's WsgiToAsgi, each request on a worker
+    thread of its own (WsgiToAsgi alone would queue every request on one
+    shared thread). Flask's hooks and the sync views run there.
+  • The coroutine views run on the server's event loop — lifespan
+    startup binds it through utils.adb — and so do the aiomysql pools:
+    while a view awaits MySQL the loop serves other requests' queries.
+  • WsgiToAsgi reads a request body in full before the app sees it, so
+    large streamed imports (POST /products/bulk) belong on server.py.
+  • Lifespan shutdown closes both connection pools.
+
+Run:
+    uvicorn asgi:app --host 0.0.0.0 --port 5000 --workers 4
+"""
+
+import asyncio
+
+from asgiref.sync import ThreadSensitiveContext
+from asgiref.wsgi import WsgiToAsgi
+
+from app import create_app
+from utils import adb, db
+
+
+def create_asgi_app(background: bool = True):
+    """ASGI application around create_app(async_routes=True)."""
+    wsgi = WsgiToAsgi(create_app(background=background, async_routes=True))
+
+    async def application(scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await lifespan(receive, send)
+        async with ThreadSensitiveContext():
+            await wsgi(scope, receive, send)
+
+    return application
+
+
+async def lifespan(receive, send):
+    """Bind utils.adb to the server's loop on startup; close the pools on shutdown."""
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            adb.bind_loop(asyncio.get_running_loop())
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            adb.close_pools()
+            db.close_pools()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+app = create_asgi_app()
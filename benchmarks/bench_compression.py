@@ -0,0 +1,60 @@
+"""
+benchmarks/bench_compression.py
+───────────────────────────────
+Size and per-request cost of response compression on the largest
+catalogue page (GET /products/?per_page=100) served by create_app()
+against the seeded SQLite stand-in.
+
+  identity    — no Accept-Encoding
+  gzip cold   — compressed on every request (precompressed cache off)
+  gzip cached — compressed once, then served from the cache
+
+Run:
+    python -m benchmarks.bench_compression
+"""
+
+import argparse
+import tempfile
+import time
+
+from benchmarks import harness
+from config import config
+
+PATH = "/products/?per_page=100"
+
+
+def per_request_ms(client, headers: dict, n: int) -> tuple:
+    client.get(PATH, headers=headers)   # warm-up (and cache fill)
+    started = time.perf_counter()
+    for _ in range(n):
+        response = client.get(PATH, headers=headers)
+    return (time.perf_counter() - started) / n * 1000, len(response.data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Response compression benchmark")
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args(argv)
+
+    boot_args = harness.build_parser().parse_args(["--scale", "1"])
+    with tempfile.TemporaryDirectory() as workdir:
+        app, _, _ = harness.boot(boot_args, workdir)
+        client    = app.test_client()
+        gzip      = {"Accept-Encoding": "gzip"}
+
+        rows = [("identity", *per_request_ms(client, {}, args.requests))]
+        limit = config.COMPRESSION_CACHE_MAX_BYTES
+        config.COMPRESSION_CACHE_MAX_BYTES = 0
+        rows.append(("gzip cold", *per_request_ms(client, gzip, args.requests)))
+        config.COMPRESSION_CACHE_MAX_BYTES = limit
+        rows.append(("gzip cached", *per_request_ms(client, gzip, args.requests)))
+
+    print(f"GET {PATH}")
+    print(f"{'':<13}{'bytes':>10}{'ms/req':>10}")
+    print("─" * 33)
+    for label, ms, size in rows:
+        print(f"{label:<13}{size:>10,}{ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
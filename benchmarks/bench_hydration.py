@@ -0,0 +1,100 @@
+"""
+benchmarks/bench_hydration.py
+─────────────────────────────
+Row → JSON-ready dict hydration for product and order listings.
+
+Compares three paths over 100 / 1k / 10k rows shaped like
+mysql-connector dictionary rows (Decimal prices, datetime timestamps):
+
+  legacy  — dict-backed model instance, then to_dict() (pre-__slots__)
+  object  — __slots__ model instance, then to_dict()
+  direct  — Model.row_to_dict(row), no intermediate instance
+
+and the memory held by N model instances (KiB and allocated blocks),
+dict-backed vs __slots__.
+
+Run:
+    python -m benchmarks.bench_hydration
+"""
+
+import gc
+import timeit
+import tracemalloc
+from datetime import datetime
+from decimal import Decimal
+
+from models.order   import Order
+from models.product import Product
+
+
+def product_rows(n: int) -> list:
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    return [{
+        "id": i, "sku": f"SKU-{i}", "name": f"Product {i}", "description": "x" * 200,
+        "price": Decimal("1999.00"), "stock": i % 7, "category_id": i % 20,
+        "image_url": f"https://cdn.example.com/{i}.jpg", "is_active": 1,
+        "created_at": now, "updated_at": now, "category_name": "Electronics",
+    } for i in range(n)]
+
+
+def order_rows(n: int) -> list:
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    return [{
+        "id": i, "user_id": i % 100, "total_amount": Decimal("4999.50"),
+        "status": "pending", "shipping_address": "1 Example Street",
+        "payment_method": "COD", "created_at": now, "updated_at": now,
+    } for i in range(n)]
+
+
+def legacy(model):
+    """The same model without __slots__ — instances carry a per-object __dict__."""
+    return type(f"Legacy{model.__name__}", (),
+                {"__init__": model.__init__, "to_dict": model.to_dict})
+
+
+def best_ms(fn, rows) -> float:
+    return min(timeit.repeat(lambda: fn(rows), number=1, repeat=7)) * 1000
+
+
+def instance_memory(model, rows) -> tuple:
+    """(KiB, blocks) retained by one model instance per row."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    instances = [model(**r) for r in rows]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = [s for s in after.compare_to(before, "filename") if s.size_diff > 0]
+    kib    = sum(s.size_diff for s in stats) / 1024
+    blocks = sum(s.count_diff for s in stats)
+    del instances
+    return kib, blocks
+
+
+CASES = {
+    "product": (Product, product_rows),
+    "order":   (Order, order_rows),
+}
+
+
+def main():
+    print(f"{'model':<9}{'rows':>7}{'legacy ms':>12}{'object ms':>12}{'direct ms':>12}"
+          f"{'dict KiB':>11}{'slots KiB':>11}{'dict blk':>10}{'slots blk':>11}")
+    print("─" * 95)
+    for name, (model, make_rows) in CASES.items():
+        old = legacy(model)
+        for n in (100, 1_000, 10_000):
+            rows = make_rows(n)
+            t_legacy = best_ms(lambda rs: [old(**r).to_dict() for r in rs], rows)
+            t_object = best_ms(lambda rs: [model(**r).to_dict() for r in rs], rows)
+            t_direct = best_ms(lambda rs: [model.row_to_dict(r) for r in rs], rows)
+            dict_kib, dict_blocks   = instance_memory(old, rows)
+            slot_kib, slot_blocks   = instance_memory(model, rows)
+            print(f"{name:<9}{n:>7}{t_legacy:>12.3f}{t_object:>12.3f}{t_direct:>12.3f}"
+                  f"{dict_kib:>11.1f}{slot_kib:>11.1f}{dict_blocks:>10}{slot_blocks:>11}")
+    print("─" * 95)
+
+
+if __name__ == "__main__":
+    main()
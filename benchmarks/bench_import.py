@@ -0,0 +1,126 @@
+"""
+benchmarks/bench_import.py
+──────────────────────────
+POST /products/bulk against the seeded SQLite stand-in: a synthetic
+catalogue is generated while it is being uploaded (never held in
+memory) and imported twice — new SKUs, then the same SKUs again as
+updates. For comparison, a sample of the same rows is created with one
+POST /products/ call each, as catalogues were loaded before.
+
+Reports rows/s and how much the process's peak RSS grew.
+
+Run:
+    python -m benchmarks.bench_import                    # 1M rows, NDJSON
+    python -m benchmarks.bench_import --rows 200000 --format csv
+"""
+
+import argparse
+import io
+import json
+import resource
+import tempfile
+import time
+
+from werkzeug.test import EnvironBuilder
+
+from benchmarks import harness
+
+MIME = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+class Catalogue(io.RawIOBase):
+    """Read-only stream of `rows` synthetic products, generated on demand."""
+
+    def __init__(self, rows: int, fmt: str, price: float = 19.99):
+        self._lines  = self._generate(rows, fmt, price)
+        self._buffer = b""
+
+    @staticmethod
+    def _generate(rows: int, fmt: str, price: float):
+        if fmt == "csv":
+            yield b"sku,name,description,price,stock,category_id\n"
+        for i in range(rows):
+            sku, name, stock, category = f"SKU-{i:08d}", f"Imported product {i}", i % 50, i % 8 + 1
+            if fmt == "csv":
+                yield f"{sku},{name},Bulk loaded,{price},{stock},{category}\n".encode()
+            else:
+                yield (json.dumps({"sku": sku, "name": name, "description": "Bulk loaded",
+                                   "price": price, "stock": stock, "category_id": category})
+                       + "\n").encode()
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer) -> int:
+        while len(self._buffer) < len(buffer):
+            line = next(self._lines, None)
+            if line is None:
+                break
+            self._buffer += line
+        n = min(len(buffer), len(self._buffer))
+        buffer[:n], self._buffer = self._buffer[:n], self._buffer[n:]
+        return n
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def bulk(app, token: str, rows: int, fmt: str, price: float) -> tuple:
+    # Called through WSGI directly: the test client wants a seekable body
+    # to measure, while a real upload arrives chunked, length unknown.
+    environ = EnvironBuilder(path="/products/bulk", method="POST", content_type=MIME[fmt],
+                             headers={"Authorization": f"Bearer {token}"}).get_environ()
+    environ.pop("CONTENT_LENGTH", None)
+    environ["wsgi.input"]            = io.BufferedReader(Catalogue(rows, fmt, price), 1 << 16)
+    environ["wsgi.input_terminated"] = True
+
+    started = time.perf_counter()
+    body    = b"".join(app(environ, lambda status, headers: None))
+    elapsed = time.perf_counter() - started
+    report  = json.loads(body)["data"]
+    assert report["imported"] == rows, report
+    return elapsed, report
+
+
+def one_by_one(client, token: str, rows: int) -> float:
+    started = time.perf_counter()
+    for i in range(rows):
+        response = client.post("/products/", headers={"Authorization": f"Bearer {token}"},
+                               json={"name": f"Single product {i}", "price": 19.99,
+                                     "stock": i % 50, "category_id": i % 8 + 1})
+        assert response.status_code == 201, response.get_json()
+    return time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk product import benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=list(MIME), default="ndjson")
+    parser.add_argument("--single", type=int, default=2_000, help="rows for the one-POST-per-row run")
+    args = parser.parse_args(argv)
+
+    boot_args = harness.build_parser().parse_args(["--scale", "1"])
+    with tempfile.TemporaryDirectory() as workdir:
+        app, tokens, _ = harness.boot(boot_args, workdir)
+        client = app.test_client()
+        token  = tokens["admin"]
+
+        single = one_by_one(client, token, args.single)
+        rss    = peak_rss_mb()
+        insert, _ = bulk(app, token, args.rows, args.format, 19.99)
+        update, _ = bulk(app, token, args.rows, args.format, 17.49)
+        growth = peak_rss_mb() - rss
+
+    print(f"{args.rows:,} rows, {args.format}")
+    print(f"{'':<22}{'seconds':>10}{'rows/s':>12}")
+    print("─" * 44)
+    print(f"{'POST per row':<22}{single / args.single * args.rows:>10.1f}"
+          f"{args.single / single:>12,.0f}   (extrapolated from {args.single:,})")
+    print(f"{'bulk, new SKUs':<22}{insert:>10.1f}{args.rows / insert:>12,.0f}")
+    print(f"{'bulk, existing SKUs':<22}{update:>10.1f}{args.rows / update:>12,.0f}")
+    print(f"peak RSS growth during the bulk runs: {growth:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
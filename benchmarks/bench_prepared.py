@@ -0,0 +1,66 @@
+"""
+benchmarks/bench_prepared.py
+────────────────────────────
+Text protocol vs cached server-side prepared statements for the hot
+model reads, against the real MySQL configured by DB_* (.env).
+
+Each mode runs on a warm pooled connection, so the numbers isolate
+statement parsing / planning from connect cost. Read-only: the data
+already in the database is used as-is.
+
+Run:
+    python -m benchmarks.bench_prepared
+"""
+
+import sys
+import timeit
+
+from config import config
+from models.cart    import Cart
+from models.product import Product
+from models.user    import User
+from utils import db
+
+
+def _per_call_us(fn, number: int) -> float:
+    best = min(timeit.repeat(fn, number=number, repeat=5))
+    return best / number * 1e6
+
+
+def main(number: int = 2000):
+    try:
+        probe = db.execute_query(
+            "SELECT (SELECT MIN(id) FROM products) AS product_id, "
+            "(SELECT MIN(id) FROM users) AS user_id", fetch="one"
+        )
+        user  = User.find_by_id(probe["user_id"]) if probe["user_id"] else None
+    except Exception as e:
+        sys.exit(f"MySQL not reachable with the DB_* settings ({e}).")
+    if not probe["product_id"] or user is None:
+        sys.exit("Needs at least one product and one user — load database/schema.sql (it seeds data) first.")
+
+    cases = {
+        "Product.find_by_id": lambda: Product.find_by_id(probe["product_id"]),
+        "Cart.get_user_cart": lambda: Cart.get_user_cart(user.id),
+        "Cart.item_count":    lambda: Cart.item_count(user.id),
+        "User.find_by_email": lambda: User.find_by_email(user.email),
+        "Product.get_all":    lambda: Product.get_all(page=1, per_page=20),
+    }
+
+    results = {}
+    for prepared in (False, True):
+        config.DB_PREPARED_STATEMENTS = prepared
+        db.close_pools()
+        for name, fn in cases.items():
+            fn()   # warm: connection in the pool, statement prepared
+            results.setdefault(name, []).append(_per_call_us(fn, number))
+
+    print(f"{'call':<22}{'text µs':>10}{'prepared µs':>14}{'speedup':>10}")
+    print("─" * 56)
+    for name, (text, prepared) in results.items():
+        print(f"{name:<22}{text:>10.1f}{prepared:>14.1f}{text / prepared:>9.2f}x")
+    print("─" * 56)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+benchmarks/bench_related.py
+───────────────────────────
+Rebuild time and lookup latency of the co-purchase index behind
+GET /products/<id>/related (services/recommendation_service.py).
+
+Synthetic order lines are shaped like Order.stream_lines chunks:
+orders of 1–4 products drawn with a skewed (Zipf-like) popularity, so
+a few products have many neighbours and most have few. Line generation
+is not timed.
+
+Run:
+    python -m benchmarks.bench_related                  # 10M order lines
+    python -m benchmarks.bench_related --lines 2000000 --products 20000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from services.recommendation_service import CoPurchaseIndex
+
+
+def make_lines(n_lines: int, n_products: int, chunk_size: int, seed: int = 7) -> list:
+    """(order_id, product_id) chunks ordered by order, 1–4 lines per order."""
+    rng        = np.random.default_rng(seed)
+    sizes      = rng.integers(1, 5, size=n_lines // 2)
+    sizes      = sizes[:np.searchsorted(np.cumsum(sizes), n_lines, side="right")]
+    order_id   = np.repeat(np.arange(1, len(sizes) + 1), sizes)
+    weights    = 1.0 / np.arange(1, n_products + 1) ** 0.8
+    product_id = rng.choice(np.arange(1, n_products + 1), size=len(order_id),
+                            p=weights / weights.sum())
+    rows = list(zip(order_id.tolist(), product_id.tolist()))
+    return [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+
+
+def make_cards(n_products: int) -> list:
+    return [[(pid, f"Product {pid}", 9.99, None) for pid in range(1, n_products + 1)]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Co-purchase index benchmark")
+    parser.add_argument("--lines",      type=int, default=10_000_000)
+    parser.add_argument("--products",   type=int, default=50_000)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--top-k",      type=int, default=20)
+    parser.add_argument("--lookups",    type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    lines = make_lines(args.lines, args.products, args.chunk_size)
+    cards = make_cards(args.products)
+    n     = sum(len(chunk) for chunk in lines)
+
+    index   = CoPurchaseIndex(args.top_k)
+    started = time.perf_counter()
+    index.rebuild(lines=lines, cards=cards)
+    rebuild = time.perf_counter() - started
+
+    ids     = np.random.default_rng(1).integers(1, args.products + 1, size=args.lookups).tolist()
+    started = time.perf_counter()
+    for pid in ids:
+        index.related(pid, 10)
+    lookup  = (time.perf_counter() - started) / len(ids)
+
+    # Lookups once orders have accumulated in the delta since the rebuild
+    for order in lines[0][:args.chunk_size // 2:4]:
+        index.record_order([{"product_id": order[1] + d, "name": "", "price": 1.0}
+                            for d in range(3)])
+    started = time.perf_counter()
+    for pid in ids:
+        index.related(pid, 10)
+    lookup_delta = (time.perf_counter() - started) / len(ids)
+
+    print(f"order lines           {n:>12,}")
+    print(f"products              {args.products:>12,}")
+    print("─" * 34)
+    print(f"rebuild               {rebuild:>10.2f} s  ({n / rebuild / 1e6:.2f}M lines/s)")
+    print(f"related() lookup      {lookup * 1e6:>10.1f} µs")
+    print(f"related() with delta  {lookup_delta * 1e6:>10.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+benchmarks/bench_reporting.py
+─────────────────────────────
+Throughput and memory of the item report aggregation (ItemReport)
+on synthetic order_items rows shaped like Order.stream_items chunks.
+
+  vectorised — ItemReport.add per chunk (NumPy bincount)
+  python     — the same aggregates with per-row dict updates
+
+Rows are fed as a cycle of pre-built chunks, so row generation is not
+timed. The pure-Python path runs on a 1M-row slice (its rate is per
+row, so it extrapolates linearly). Peak traced memory of the
+vectorised path is shown for two row counts: it tracks chunk size and
+id ranges, not the number of rows.
+
+Run:
+    python -m benchmarks.bench_reporting                 # 10M rows
+    python -m benchmarks.bench_reporting --rows 2000000 --chunk-size 20000
+"""
+
+import argparse
+import itertools
+import random
+import time
+import tracemalloc
+from collections import defaultdict
+
+from services.report_service import ItemReport
+
+
+def make_chunks(chunk_size: int, n_chunks: int, rng: random.Random) -> list:
+    """Distinct synthetic chunks: 50k products in 20 categories, ~3 lines per order."""
+    chunks, order_id = [], 1
+    for _ in range(n_chunks):
+        chunk = []
+        for _ in range(chunk_size):
+            product_id = rng.randint(1, 50_000)
+            price      = round(rng.uniform(5, 2000), 2)
+            chunk.append((order_id, product_id, product_id % 20 + 1, rng.randint(1, 3),
+                          price, round(price * rng.uniform(0.9, 1.2), 2)))
+            order_id += rng.random() < 0.33
+        chunks.append(chunk)
+    return chunks
+
+
+def feed(chunks: list, rows: int):
+    """Yield chunks cyclically until `rows` rows have been produced."""
+    produced = 0
+    for chunk in itertools.cycle(chunks):
+        if produced >= rows:
+            return
+        take = chunk[:rows - produced]
+        produced += len(take)
+        yield take
+
+
+def vectorised(chunks, rows: int, top: int = 10) -> dict:
+    report = ItemReport()
+    for chunk in feed(chunks, rows):
+        report.add(chunk)
+    return report.result(top)
+
+
+def pure_python(chunks, rows: int) -> dict:
+    units, revenue, category_revenue, orders = (defaultdict(float), defaultdict(float),
+                                                defaultdict(float), set())
+    for chunk in feed(chunks, rows):
+        for order_id, product_id, category_id, quantity, unit_price, current in chunk:
+            orders.add(order_id)
+            units[product_id]             += quantity
+            revenue[product_id]           += quantity * unit_price
+            category_revenue[category_id] += quantity * unit_price
+    return {"orders": len(orders), "products": len(units)}
+
+
+def timed(fn, *args) -> float:
+    started = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - started
+
+
+def peak_mib(fn, *args) -> float:
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2**20
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Item report aggregation benchmark")
+    parser.add_argument("--rows",       type=int, default=10_000_000)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    args = parser.parse_args(argv)
+
+    chunks = make_chunks(args.chunk_size, 8, random.Random(7))
+    py_rows = min(args.rows, 1_000_000)
+
+    t_vec = timed(vectorised, chunks, args.rows)
+    t_py  = timed(pure_python, chunks, py_rows)
+
+    print(f"{'path':<12}{'rows':>12}{'seconds':>10}{'Mrows/s':>10}")
+    print("─" * 44)
+    print(f"{'vectorised':<12}{args.rows:>12,}{t_vec:>10.2f}{args.rows / t_vec / 1e6:>10.2f}")
+    print(f"{'python':<12}{py_rows:>12,}{t_py:>10.2f}{py_rows / t_py / 1e6:>10.2f}")
+    print("─" * 44)
+    print(f"speedup {t_py / py_rows / (t_vec / args.rows):.1f}x per row")
+
+    small = min(args.rows, 1_000_000)
+    print(f"peak traced memory (vectorised, chunk {args.chunk_size:,}): "
+          f"{peak_mib(vectorised, chunks, small):.1f} MiB at {small:,} rows, "
+          f"{peak_mib(vectorised, chunks, 2 * small):.1f} MiB at {2 * small:,} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+benchmarks/bench_server.py
+──────────────────────────
+The same request mix as benchmarks/harness.py, but over real HTTP, against
+the development server (`python app.py`, Flask's threaded server) and the
+prefork launcher (`python server.py`), each run in a subprocess on the
+seeded SQLite stand-in.
+
+The load comes from --client-procs processes of --clients threads each
+(keep-alive connections), so the client is not held back by one GIL.
+After each run the server gets SIGTERM and the time it takes to drain
+and exit is reported.
+
+Run:
+    python -m benchmarks.bench_server                     # 20 s per server
+    python -m benchmarks.bench_server --workers 4 --threads 4 --latency-ms 0.3
+"""
+
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+from benchmarks import harness
+
+
+class HttpClient:
+    """One keep-alive HTTP connection; same interface as harness.InProcessClient."""
+
+    def __init__(self, port: int):
+        self._conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+
+    def request(self, method, path, headers, body) -> int:
+        headers = dict(headers)
+        data    = None
+        if body is not None:
+            data = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        for attempt in (1, 2):   # the server may have closed an idle keep-alive connection
+            try:
+                self._conn.request(method, path, body=data, headers=headers)
+                response = self._conn.getresponse()
+                response.read()
+                if response.will_close:
+                    self._conn.close()
+                return response.status
+            except (OSError, http.client.HTTPException):
+                self._conn.close()
+        return 599
+
+
+# ── Server side ────────────────────────────────────────────────────────────────
+
+def serve(args):
+    """Subprocess: run one server against the seeded database at args.db."""
+    from benchmarks.fake_db import FakeDatabase
+    import utils.db
+    from config import config
+
+    config.RATE_LIMIT_ENABLED = False
+    config.MAX_IN_FLIGHT      = 10**6
+    fake = FakeDatabase(args.db, query_latency_ms=args.latency_ms)
+    utils.db.get_connection = fake.connect
+
+    if args.serve == "dev":
+        from app import create_app
+        create_app().run(host="127.0.0.1", port=args.port, threaded=True)
+    else:
+        from server import Server
+        Server({"bind": f"127.0.0.1:{args.port}", "workers": args.workers,
+                "threads": args.threads, "loglevel": "warning"}).run()
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(port: int, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if HttpClient(port).request("GET", "/health", {}, None) == 200:
+            return
+        time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not come up")
+
+
+# ── Client side ────────────────────────────────────────────────────────────────
+
+def drive(port: int, tokens: dict, dataset: dict, clients: int, warmup: int,
+          duration: float, seed: int) -> tuple:
+    """One client process: `clients` threads for `duration` s → ([(samples, errors)], seconds)."""
+    workers = [harness.Worker(HttpClient(port), tokens, dataset, harness.DEFAULT_MIX, seed + i)
+               for i in range(clients)]
+    for _ in range(warmup):
+        workers[0].run_once()
+    workers[0].samples.clear()
+    workers[0].errors.clear()
+
+    deadline = time.perf_counter() + duration
+
+    def loop(worker):
+        while time.perf_counter() < deadline:
+            worker.run_once()
+
+    threads = [threading.Thread(target=loop, args=(w,)) for w in workers]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return [(w.samples, w.errors) for w in workers], time.perf_counter() - started
+
+
+def bench(mode: str, args, db_path: str, tokens: dict, dataset: dict) -> dict:
+    port   = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.bench_server", "--serve", mode, "--db", db_path,
+         "--port", str(port), "--latency-ms", str(args.latency_ms),
+         "--workers", str(args.workers), "--threads", str(args.threads)],
+        stderr=subprocess.DEVNULL if mode == "dev" else None,
+    )
+    try:
+        wait_ready(port)
+        jobs = [(port, tokens, dataset, args.clients, args.warmup, args.duration, args.seed + 100 * i)
+                for i in range(args.client_procs)]
+        with multiprocessing.get_context("fork").Pool(args.client_procs) as pool:
+            parts = pool.starmap(drive, jobs)
+    finally:
+        stopped = time.perf_counter()
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=60)
+        except subprocess.TimeoutExpired:
+            server.kill()
+            server.wait()
+        drain = time.perf_counter() - stopped
+
+    workers = [SimpleNamespace(samples=s, errors=e) for part, _ in parts for s, e in part]
+    result  = harness.summarize(workers, max(elapsed for _, elapsed in parts))
+    result["drain_s"] = round(drain, 2)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dev server vs prefork launcher")
+    parser.add_argument("--duration",     type=float, default=20)
+    parser.add_argument("--scale",        type=int,   default=1)
+    parser.add_argument("--clients",      type=int,   default=8,  help="threads per client process")
+    parser.add_argument("--client-procs", type=int,   default=2)
+    parser.add_argument("--warmup",       type=int,   default=100)
+    parser.add_argument("--workers",      type=int,   default=2 * (os.cpu_count() or 1) + 1)
+    parser.add_argument("--threads",      type=int,   default=4)
+    parser.add_argument("--latency-ms",   type=float, default=0.0)
+    parser.add_argument("--seed",         type=int,   default=42)
+    parser.add_argument("--serve",        choices=("dev", "prod"), help=argparse.SUPPRESS)
+    parser.add_argument("--db",           help=argparse.SUPPRESS)
+    parser.add_argument("--port",         type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        return serve(args)
+
+    boot_args = harness.build_parser().parse_args(["--scale", str(args.scale), "--seed", str(args.seed)])
+    with tempfile.TemporaryDirectory() as workdir:
+        _, tokens, dataset = harness.boot(boot_args, workdir)
+        db_path = os.path.join(workdir, "bench.db")
+        results = {mode: bench(mode, args, db_path, tokens, dataset) for mode in ("dev", "prod")}
+
+    print(f"\n{args.client_procs}×{args.clients} clients, {args.duration:.0f} s, "
+          f"{os.cpu_count()} CPU(s); launcher: {args.workers} workers × {args.threads} threads")
+    print(f"{'':<26}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}{'drain s':>9}")
+    print("─" * 83)
+    for mode, label in (("dev", "python app.py"), ("prod", "python server.py")):
+        r         = results[mode]
+        endpoints = list(r["endpoints"].values())
+        requests  = sum(e["requests"] for e in endpoints)
+        p50       = sum(e["p50_ms"] * e["requests"] for e in endpoints) / max(1, requests)
+        p95       = max(e["p95_ms"] for e in endpoints)
+        p99       = max(e["p99_ms"] for e in endpoints)
+        errors    = sum(e["errors"] for e in endpoints)
+        print(f"{label:<26}{r['throughput']:>10.1f}{p50:>10.2f}{p95:>10.2f}"
+              f"{p99:>10.2f}{errors:>8}{r['drain_s']:>9.2f}")
+    print("(p50 is request-weighted across endpoints; p95 / p99 are the worst endpoint's)")
+
+
+if __name__ == "__main__":
+    main()
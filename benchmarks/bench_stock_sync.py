@@ -0,0 +1,73 @@
+"""
+benchmarks/bench_stock_sync.py
+──────────────────────────────
+StockService.sync_file on a synthetic warehouse delta file against the
+seeded SQLite stand-in: one line per product, a mix of absolute values,
+relative deltas and lines that leave the stock as it is. Seeding the
+products and writing the file are not timed.
+
+Run:
+    python -m benchmarks.bench_stock_sync                 # 500k lines
+    python -m benchmarks.bench_stock_sync --lines 100000 --batch 500
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks import harness
+from config import config
+from models.product import Product
+from services.stock_service import StockService
+
+STOCK = 100   # every seeded product starts here
+
+
+def seed_products(n: int, chunk: int = 1000):
+    for start in range(0, n, chunk):
+        Product.upsert_many([(f"WH-{i:07d}", f"Warehouse item {i}", None, 9.99, STOCK, None, None)
+                             for i in range(start, min(n, start + chunk))])
+
+
+def write_deltas(path: str, n: int, seed: int = 7):
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        f.write("sku,stock\n")
+        for i in range(n):
+            kind = rng.random()
+            if kind < 0.4:
+                f.write(f"WH-{i:07d},{rng.randint(0, 500)}\n")
+            elif kind < 0.8:
+                f.write(f"WH-{i:07d},{rng.choice('+-')}{rng.randint(1, 20)}\n")
+            else:
+                f.write(f"WH-{i:07d},{STOCK}\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Warehouse stock sync benchmark")
+    parser.add_argument("--lines", type=int, default=500_000)
+    parser.add_argument("--batch", type=int, default=config.STOCK_SYNC_BATCH_SIZE)
+    args = parser.parse_args(argv)
+    config.STOCK_SYNC_BATCH_SIZE = args.batch
+
+    boot_args = harness.build_parser().parse_args(["--scale", "1"])
+    with tempfile.TemporaryDirectory() as workdir:
+        harness.boot(boot_args, workdir)
+        seed_products(args.lines)
+        path = os.path.join(workdir, "deltas.csv")
+        write_deltas(path, args.lines)
+
+        started = time.perf_counter()
+        with open(path, "rb") as f:
+            report = StockService.sync_file(f)
+        elapsed = time.perf_counter() - started
+
+    print(f"{report['lines']:,} lines, batches of {args.batch:,}: {elapsed:.1f}s "
+          f"({report['lines'] / elapsed:,.0f} lines/s)")
+    print(f"updated {report['updated']:,}, unchanged {report['unchanged']:,}, failed {report['failed']:,}")
+
+
+if __name__ == "__main__":
+    main()
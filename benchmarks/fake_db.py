@@ -0,0 +1,433 @@
+"""
+benchmarks/fake_db.py
+─────────────────────
+SQLite stand-in for MySQL, exposing the slice of the mysql-connector API
+that utils.db and the models use (connect → cursor(dictionary=True) →
+execute / fetchone / fetchall / rowcount / lastrowid, start_transaction,
+commit, rollback). Connections run in autocommit mode like the pooled
+MySQL ones; prepared=True cursors are accepted and behave like text ones.
+
+MySQL-only syntax in the models is translated on the fly:
+  • %s placeholders                     → ?
+  • MATCH(a, b) AGAINST (%s IN BOOLEAN MODE) → match_against(a, b, ?)
+  • ON DUPLICATE KEY UPDATE … VALUES(c)  → ON CONFLICT DO UPDATE SET … excluded.c
+  • SELECT … FOR UPDATE                 → SELECT … (transactions are IMMEDIATE)
+  • INSERT IGNORE                        → INSERT OR IGNORE
+  • UNIX_TIMESTAMP(ts)                   → a Python function (UTC timestamps)
+  • UNIX_TIMESTAMP()                     → SQLite's own clock, as MySQL's is the server's
+  • SET SESSION max_execution_time = n   → kept on the connection; SELECTs
+    running longer (injected latency included) fail with errno 3024
+
+Latency can be injected per connect and per statement to approximate
+a networked MySQL server.
+
+connect_async() is the aiomysql-shaped twin for utils.adb: the same
+connection, awaited, with each statement run on a worker thread (so
+injected latency does not block the event loop) and errors raised as
+PyMySQL's, like aiomysql's.
+"""
+
+import asyncio
+import calendar
+import re
+import sqlite3
+import time
+
+from mysql.connector import Error as MySQLError
+
+
+SCHEMA = """
+CREATE TABLE users (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    name        TEXT NOT NULL,
+    email       TEXT NOT NULL UNIQUE,
+    password    TEXT NOT NULL,
+    role        TEXT DEFAULT 'customer',
+    created_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE categories (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    name        TEXT NOT NULL UNIQUE,
+    description TEXT,
+    created_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE products (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    sku          TEXT UNIQUE,
+    name         TEXT NOT NULL,
+    description  TEXT,
+    price        NUMERIC NOT NULL,
+    stock        INTEGER NOT NULL DEFAULT 0,
+    category_id  INTEGER REFERENCES categories(id) ON DELETE SET NULL,
+    image_url    TEXT,
+    is_active    BOOLEAN DEFAULT TRUE,
+    created_at   TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at   TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX idx_category ON products (category_id);
+CREATE INDEX idx_price    ON products (price);
+CREATE INDEX idx_name     ON products (name);
+CREATE INDEX idx_active_created          ON products (is_active, created_at);
+CREATE INDEX idx_active_price            ON products (is_active, price);
+CREATE INDEX idx_active_name             ON products (is_active, name);
+CREATE INDEX idx_active_stock            ON products (is_active, stock);
+CREATE INDEX idx_active_category_created ON products (is_active, category_id, created_at);
+CREATE INDEX idx_active_category_price   ON products (is_active, category_id, price);
+CREATE INDEX idx_active_category_name    ON products (is_active, category_id, name);
+CREATE INDEX idx_active_category_stock   ON products (is_active, category_id, stock);
+CREATE INDEX idx_products_updated        ON products (updated_at);
+-- MySQL's ON UPDATE CURRENT_TIMESTAMP
+CREATE TRIGGER products_touch AFTER UPDATE ON products WHEN NEW.updated_at IS OLD.updated_at
+BEGIN UPDATE products SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id; END;
+
+CREATE TABLE cart (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id     INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    product_id  INTEGER NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+    quantity    INTEGER NOT NULL DEFAULT 1,
+    added_at    TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (user_id, product_id)
+);
+CREATE INDEX idx_user_cart ON cart (user_id);
+
+CREATE TABLE orders (
+    id               INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id          INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    total_amount     NUMERIC NOT NULL,
+    status           TEXT DEFAULT 'pending',
+    shipping_address TEXT NOT NULL,
+    payment_method   TEXT DEFAULT 'COD',
+    item_count       INTEGER NOT NULL DEFAULT 0,
+    first_item_name  TEXT,
+    first_item_image TEXT,
+    created_at       TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at       TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX idx_user_created   ON orders (user_id, created_at);
+CREATE INDEX idx_status_created ON orders (status, created_at);
+CREATE INDEX idx_created_at     ON orders (created_at);
+CREATE INDEX idx_orders_updated ON orders (updated_at);
+CREATE TRIGGER orders_touch AFTER UPDATE ON orders WHEN NEW.updated_at IS OLD.updated_at
+BEGIN UPDATE orders SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id; END;
+
+CREATE TABLE order_items (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    order_id    INTEGER NOT NULL REFERENCES orders(id) ON DELETE CASCADE,
+    product_id  INTEGER NOT NULL REFERENCES products(id),
+    category_id INTEGER,
+    quantity    INTEGER NOT NULL,
+    unit_price  NUMERIC NOT NULL
+);
+CREATE INDEX idx_order_items ON order_items (order_id);
+
+CREATE TABLE user_order_summary (
+    user_id          INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    total_orders     INTEGER NOT NULL DEFAULT 0,
+    pending_orders   INTEGER NOT NULL DEFAULT 0,
+    confirmed_orders INTEGER NOT NULL DEFAULT 0,
+    shipped_orders   INTEGER NOT NULL DEFAULT 0,
+    delivered_orders INTEGER NOT NULL DEFAULT 0,
+    cancelled_orders INTEGER NOT NULL DEFAULT 0,
+    lifetime_spend   NUMERIC NOT NULL DEFAULT 0,
+    updated_at       TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE sales_daily (
+    day          DATE    NOT NULL,
+    status       TEXT    NOT NULL,
+    order_count  INTEGER NOT NULL DEFAULT 0,
+    units        INTEGER NOT NULL DEFAULT 0,
+    revenue      NUMERIC NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, status)
+);
+
+CREATE TABLE sales_daily_category (
+    day          DATE    NOT NULL,
+    category_id  INTEGER NOT NULL,
+    status       TEXT    NOT NULL,
+    order_count  INTEGER NOT NULL DEFAULT 0,
+    units        INTEGER NOT NULL DEFAULT 0,
+    revenue      NUMERIC NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, category_id, status)
+);
+
+CREATE TABLE sales_rollup_queue (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    order_id    INTEGER NOT NULL,
+    old_status  TEXT,
+    new_status  TEXT    NOT NULL
+);
+
+CREATE TABLE token_revocations (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    jti         TEXT    UNIQUE,
+    user_id     INTEGER NOT NULL,
+    not_before  INTEGER,
+    expires_at  INTEGER NOT NULL,
+    created_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX idx_user_not_before ON token_revocations (user_id, not_before);
+CREATE INDEX idx_expires         ON token_revocations (expires_at);
+"""
+
+
+class Error(MySQLError):
+    """SQLite failures surface as mysql.connector errors, like the real driver."""
+
+
+QUERY_TIMEOUT_MESSAGE = "Query execution was interrupted, maximum statement execution time exceeded"
+
+
+# ── SQL translation ────────────────────────────────────────────────────────────
+
+_MATCH = re.compile(
+    r"MATCH\s*\(([^)]*)\)\s*AGAINST\s*\(\s*%s\s+IN\s+BOOLEAN\s+MODE\s*\)", re.I
+)
+
+_UPSERT     = re.compile(r"ON\s+DUPLICATE\s+KEY\s+UPDATE", re.I)
+_VALUES_REF = re.compile(r"\bVALUES\((\w+)\)", re.I)
+_FOR_UPDATE = re.compile(r"\s+FOR\s+UPDATE\s*$", re.I)
+_SET_MAX_EXECUTION_TIME = re.compile(r"^\s*SET\s+SESSION\s+max_execution_time\s*=\s*%s\s*$", re.I)
+_SELECT     = re.compile(r"^\s*SELECT\b", re.I)
+_IGNORE     = re.compile(r"^\s*INSERT\s+IGNORE\b", re.I)
+_NOW_EPOCH  = re.compile(r"\bUNIX_TIMESTAMP\(\s*\)", re.I)
+
+_translated = {}
+
+
+def translate(query: str) -> str:
+    """MySQL dialect used by the models → SQLite (memoised per SQL text)."""
+    sql = _translated.get(query)
+    if sql is None:
+        sql = _MATCH.sub(lambda m: f"match_against({m.group(1)}, ?)", query)
+        if _UPSERT.search(sql):
+            head, tail = _UPSERT.split(sql, 1)
+            sql = head + "ON CONFLICT DO UPDATE SET" + _VALUES_REF.sub(r"excluded.\1", tail)
+        sql = _FOR_UPDATE.sub("", sql)
+        sql = _IGNORE.sub("INSERT OR IGNORE", sql)
+        sql = sql.replace("%s", "?")
+        sql = _NOW_EPOCH.sub("CAST(strftime('%s', 'now') AS INTEGER)", sql)   # after the placeholders
+        _translated[query] = sql
+    return sql
+
+
+def _match_against(*args) -> int:
+    """Boolean-mode prefix search: every term must prefix-match some word."""
+    *columns, expression = args
+    words = " ".join(c for c in columns if c).lower().split()
+    for term in expression.lower().split():
+        prefix = term.rstrip("*")
+        if not any(w.startswith(prefix) for w in words):
+            return 0
+    return 1
+
+
+def _unix_timestamp(value):
+    """SQLite CURRENT_TIMESTAMP text (UTC) → epoch seconds."""
+    if value is None:
+        return None
+    return calendar.timegm(time.strptime(value[:19], "%Y-%m-%d %H:%M:%S"))
+
+
+# ── Connection / cursor ────────────────────────────────────────────────────────
+
+class FakeCursor:
+    def __init__(self, conn, dictionary: bool):
+        self._conn       = conn
+        self._cursor     = conn._sqlite.cursor()
+        self._dictionary = dictionary
+        self.rowcount    = -1
+        self.lastrowid   = None
+
+    def execute(self, query: str, params=()):
+        if _SET_MAX_EXECUTION_TIME.match(query):
+            self._conn.max_execution_time = int(params[0])
+            return
+        limit = self._conn.max_execution_time / 1000 if _SELECT.match(query) else 0
+        if limit and self._conn.latency >= limit:
+            time.sleep(limit)
+            raise Error(QUERY_TIMEOUT_MESSAGE, errno=3024)
+        if self._conn.latency:
+            time.sleep(self._conn.latency)
+        if limit:
+            deadline = time.monotonic() + limit - self._conn.latency
+            self._conn._sqlite.set_progress_handler(lambda: time.monotonic() > deadline, 1000)
+        try:
+            self._cursor.execute(translate(query), tuple(params or ()))
+        except sqlite3.OperationalError as e:
+            if limit and str(e) == "interrupted":
+                raise Error(QUERY_TIMEOUT_MESSAGE, errno=3024) from e
+            raise Error(str(e)) from e
+        except sqlite3.Error as e:
+            raise Error(str(e)) from e
+        finally:
+            if limit:
+                self._conn._sqlite.set_progress_handler(None, 0)
+        self.rowcount  = self._cursor.rowcount
+        self.lastrowid = self._cursor.lastrowid
+
+    def executemany(self, query: str, seq_params):
+        if self._conn.latency:
+            time.sleep(self._conn.latency)
+        try:
+            self._cursor.executemany(translate(query), [tuple(p) for p in seq_params])
+        except sqlite3.Error as e:
+            raise Error(str(e)) from e
+        self.rowcount  = self._cursor.rowcount
+        self.lastrowid = self._cursor.lastrowid
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return dict(zip([d[0] for d in self._cursor.description], row))
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchmany(self, size: int = 1):
+        rows = self._cursor.fetchmany(size)
+        if not self._dictionary:
+            return rows
+        names = [d[0] for d in self._cursor.description]
+        return [dict(zip(names, r)) for r in rows]
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        if not self._dictionary:
+            return rows
+        names = [d[0] for d in self._cursor.description]
+        return [dict(zip(names, r)) for r in rows]
+
+    def close(self):
+        self._cursor.close()
+
+
+class FakeConnection:
+    def __init__(self, path: str, latency: float):
+        self._sqlite = sqlite3.connect(path, timeout=30, check_same_thread=False,
+                                       isolation_level=None)   # autocommit
+        self._sqlite.create_function("match_against", -1, _match_against,
+                                     deterministic=True)
+        self._sqlite.create_function("UNIX_TIMESTAMP", 1, _unix_timestamp,
+                                     deterministic=True)
+        self._open   = True
+        self.latency = latency
+        self.max_execution_time = 0   # ms, SET SESSION max_execution_time
+
+    def cursor(self, dictionary: bool = False, **kwargs):
+        return FakeCursor(self, dictionary)
+
+    def start_transaction(self):
+        self._sqlite.execute("BEGIN IMMEDIATE")
+
+    def commit(self):
+        self._sqlite.commit()
+
+    def rollback(self):
+        self._sqlite.rollback()
+
+    def is_connected(self) -> bool:
+        return self._open
+
+    def close(self):
+        self._open = False
+        self._sqlite.close()
+
+
+class AsyncFakeCursor:
+    """aiomysql DictCursor over a FakeCursor."""
+
+    def __init__(self, cursor: FakeCursor):
+        self._cursor = cursor
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self._cursor.close()
+
+    async def execute(self, query: str, params=()):
+        await _in_thread(self._cursor.execute, query, params)
+
+    async def fetchone(self):
+        return self._cursor.fetchone()
+
+    async def fetchall(self):
+        return self._cursor.fetchall()
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+
+class AsyncFakeConnection:
+    """aiomysql Connection over a FakeConnection (begin / commit / rollback awaited)."""
+
+    def __init__(self, conn: FakeConnection):
+        self._conn = conn
+
+    def cursor(self) -> AsyncFakeCursor:
+        return AsyncFakeCursor(self._conn.cursor(dictionary=True))
+
+    async def begin(self):
+        await _in_thread(self._conn.start_transaction)
+
+    async def commit(self):
+        await _in_thread(self._conn.commit)
+
+    async def rollback(self):
+        await _in_thread(self._conn.rollback)
+
+    def close(self):
+        self._conn.close()
+
+
+async def _in_thread(fn, *args):
+    """Run a FakeConnection call on a worker thread; errors become PyMySQL's."""
+    from pymysql.err import OperationalError
+    try:
+        return await asyncio.to_thread(fn, *args)
+    except MySQLError as e:
+        raise OperationalError(e.errno or 0, e.msg) from e
+
+
+class FakeDatabase:
+    """
+    A SQLite file database plus a connect() factory with injectable latency.
+
+        fake = FakeDatabase("/tmp/bench.db", query_latency_ms=0.3)
+        utils.db.get_connection = fake.connect
+        utils.adb.connect       = fake.connect_async
+    """
+
+    def __init__(self, path: str, connect_latency_ms: float = 0.0,
+                 query_latency_ms: float = 0.0):
+        self.path            = path
+        self.connect_latency = connect_latency_ms / 1000
+        self.query_latency   = query_latency_ms / 1000
+
+    def create_schema(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        conn.commit()
+        conn.close()
+
+    def raw(self) -> sqlite3.Connection:
+        """Plain sqlite3 connection, for seeding."""
+        return sqlite3.connect(self.path, timeout=30)
+
+    def connect(self, *args, **kwargs) -> FakeConnection:
+        if self.connect_latency:
+            time.sleep(self.connect_latency)
+        return FakeConnection(self.path, self.query_latency)
+
+    async def connect_async(self, *args, **kwargs) -> AsyncFakeConnection:
+        return AsyncFakeConnection(await asyncio.to_thread(self.connect))
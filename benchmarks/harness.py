@@ -0,0 +1,375 @@
+"""
+benchmarks/harness.py
+─────────────────────
+End-to-end load benchmark: boots app.create_app() against the SQLite
+stand-in in benchmarks/fake_db.py, seeds a dataset, and drives a
+realistic request mix from several threads.
+
+Reports throughput and p50 / p95 / p99 latency per endpoint, and can
+compare the run against a JSON baseline.
+
+Run:
+    python -m benchmarks.harness                       # default mix, 10 s
+    python -m benchmarks.harness --scale 10 --threads 8 --latency-ms 0.3
+    python -m benchmarks.harness --check               # fail on regression
+    python -m benchmarks.harness --async-routes        # coroutine routes (utils.adb)
+    python -m benchmarks.harness --update-baseline     # rewrite baseline.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+import bcrypt
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+WORDS = ("wireless", "classic", "organic", "smart", "premium", "portable",
+         "vintage", "compact", "deluxe", "ultra", "eco", "pro", "mini", "max")
+NOUNS = ("phone", "laptop", "novel", "jeans", "cooker", "shoes", "lamp",
+         "backpack", "watch", "speaker", "mug", "blender", "jacket", "camera")
+
+# name → weight. Each scenario issues one or more requests.
+DEFAULT_MIX = {
+    "browse":   40,
+    "search":   15,
+    "detail":   15,
+    "add_cart": 15,
+    "checkout":  5,
+    "history":   5,
+    "admin":     5,
+}
+
+
+# ── Dataset ────────────────────────────────────────────────────────────────────
+
+def seed(fake, scale: int, rng: random.Random) -> dict:
+    """Populate the fake DB. Scale 1 = 1k products, 100 users, 500 orders."""
+    n_products = 1000 * scale
+    n_users    = 100 * scale
+    n_orders   = 500 * scale
+
+    conn = fake.raw()
+    cur  = conn.cursor()
+    cur.executemany("INSERT INTO categories (name, description) VALUES (?, ?)",
+                    [(f"Category {i}", f"Description {i}") for i in range(1, 21)])
+
+    # One cheap hash for everyone: only token-protected endpoints are driven
+    pw = bcrypt.hashpw(b"benchmark", bcrypt.gensalt(4)).decode()
+    cur.execute("INSERT INTO users (name, email, password, role) VALUES (?, ?, ?, 'admin')",
+                ("Bench Admin", "admin@bench.local", pw))
+    cur.executemany("INSERT INTO users (name, email, password) VALUES (?, ?, ?)",
+                    [(f"User {i}", f"user{i}@bench.local", pw) for i in range(n_users)])
+
+    products = []
+    for i in range(n_products):
+        name = f"{rng.choice(WORDS).title()} {rng.choice(NOUNS).title()} {i}"
+        desc = " ".join(rng.choice(WORDS + NOUNS) for _ in range(60))
+        products.append((name, desc, round(rng.uniform(5, 2000), 2), 1_000_000,
+                         rng.randint(1, 20), f"https://cdn.bench.local/{i}.jpg", f"BENCH-{i:06d}"))
+    cur.executemany(
+        """INSERT INTO products (name, description, price, stock, category_id, image_url, sku)
+           VALUES (?, ?, ?, ?, ?, ?, ?)""", products)
+
+    statuses = ("pending", "confirmed", "shipped", "delivered", "cancelled")
+    for _ in range(n_orders):
+        user_id = rng.randint(2, n_users + 1)
+        items   = [(rng.randint(1, n_products), rng.randint(1, 3), round(rng.uniform(5, 2000), 2))
+                   for _ in range(rng.randint(1, 4))]
+        total   = sum(q * p for _, q, p in items)
+        first   = products[items[0][0] - 1]
+        cur.execute(
+            """INSERT INTO orders (user_id, total_amount, status, shipping_address,
+                                   item_count, first_item_name, first_item_image)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (user_id, total, rng.choice(statuses), "1 Benchmark Street",
+             len(items), first[0], first[5]))
+        order_id = cur.lastrowid
+        cur.executemany(
+            """INSERT INTO order_items (order_id, product_id, category_id, quantity, unit_price)
+               VALUES (?, ?, ?, ?, ?)""",
+            [(order_id, pid, products[pid - 1][4], q, p) for pid, q, p in items])
+
+    cur.execute(
+        """INSERT INTO user_order_summary
+               (user_id, total_orders, pending_orders, confirmed_orders, shipped_orders,
+                delivered_orders, cancelled_orders, lifetime_spend)
+           SELECT user_id, COUNT(*),
+                  SUM(status = 'pending'), SUM(status = 'confirmed'), SUM(status = 'shipped'),
+                  SUM(status = 'delivered'), SUM(status = 'cancelled'),
+                  COALESCE(SUM(CASE WHEN status <> 'cancelled' THEN total_amount END), 0)
+           FROM orders GROUP BY user_id""")
+
+    conn.commit()
+    conn.close()
+    return {"products": n_products, "users": n_users, "orders": n_orders}
+
+
+# ── Request mix ────────────────────────────────────────────────────────────────
+
+class Worker:
+    """One client thread: picks scenarios by weight and times each request."""
+
+    def __init__(self, client, tokens: dict, dataset: dict, mix: dict, seed: int):
+        self.client    = client
+        self.tokens    = tokens
+        self.dataset   = dataset
+        self.rng       = random.Random(seed)
+        self.scenarios = list(mix)
+        self.weights   = [mix[s] for s in self.scenarios]
+        self.samples   = {}   # endpoint → [seconds]
+        self.errors    = {}   # endpoint → count
+
+    def _call(self, label: str, method: str, path: str, token: str = None, body=None):
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        started = time.perf_counter()
+        status  = self.client.request(method, path, headers, body)
+        elapsed = time.perf_counter() - started
+        self.samples.setdefault(label, []).append(elapsed)
+        if status >= 400:
+            self.errors[label] = self.errors.get(label, 0) + 1
+
+    def _user_token(self):
+        return self.tokens["users"][self.rng.randrange(len(self.tokens["users"]))]
+
+    def run_once(self):
+        scenario = self.rng.choices(self.scenarios, self.weights)[0]
+        getattr(self, f"scenario_{scenario}")()
+
+    def scenario_browse(self):
+        pages = max(1, self.dataset["products"] // 20)
+        sort  = self.rng.choice(("created_at", "price", "name"))
+        self._call("GET /products", "GET",
+                   f"/products/?page={self.rng.randint(1, min(pages, 50))}&per_page=20&sort_by={sort}")
+
+    def scenario_search(self):
+        self._call("GET /products?search", "GET",
+                   f"/products/?search={self.rng.choice(WORDS + NOUNS)[:4]}&per_page=20")
+
+    def scenario_detail(self):
+        self._call("GET /products/<id>", "GET",
+                   f"/products/{self.rng.randint(1, self.dataset['products'])}")
+
+    def scenario_add_cart(self):
+        self._call("POST /cart", "POST", "/cart/", self._user_token(),
+                   {"product_id": self.rng.randint(1, self.dataset["products"]),
+                    "quantity": self.rng.randint(1, 3)})
+
+    def scenario_checkout(self):
+        token = self._user_token()
+        for _ in range(self.rng.randint(1, 3)):
+            self._call("POST /cart", "POST", "/cart/", token,
+                       {"product_id": self.rng.randint(1, self.dataset["products"]),
+                        "quantity": 1})
+        self._call("POST /orders", "POST", "/orders/", token,
+                   {"shipping_address": "1 Benchmark Street", "payment_method": "COD"})
+
+    def scenario_history(self):
+        self._call("GET /orders", "GET", "/orders/?per_page=10", self._user_token())
+
+    def scenario_admin(self):
+        status = self.rng.choice(("", "&status=pending", "&status=shipped"))
+        self._call("GET /orders/admin", "GET",
+                   f"/orders/admin?per_page=20{status}", self.tokens["admin"])
+
+
+class InProcessClient:
+    """Drives the WSGI app directly through Flask's test client."""
+
+    def __init__(self, app):
+        self._client = app.test_client()
+
+    def request(self, method, path, headers, body) -> int:
+        return self._client.open(path, method=method, headers=headers, json=body).status_code
+
+
+# ── Reporting ──────────────────────────────────────────────────────────────────
+
+def percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def summarize(workers: list, elapsed: float) -> dict:
+    samples, errors = {}, {}
+    for w in workers:
+        for label, values in w.samples.items():
+            samples.setdefault(label, []).extend(values)
+        for label, n in w.errors.items():
+            errors[label] = errors.get(label, 0) + n
+
+    endpoints = {}
+    for label in sorted(samples):
+        values = sorted(samples[label])
+        endpoints[label] = {
+            "requests":   len(values),
+            "errors":     errors.get(label, 0),
+            "throughput": round(len(values) / elapsed, 2),
+            "p50_ms":     round(percentile(values, 50) * 1000, 3),
+            "p95_ms":     round(percentile(values, 95) * 1000, 3),
+            "p99_ms":     round(percentile(values, 99) * 1000, 3),
+        }
+    total = sum(e["requests"] for e in endpoints.values())
+    return {"elapsed_s": round(elapsed, 2),
+            "throughput": round(total / elapsed, 2),
+            "endpoints": endpoints}
+
+
+def print_report(result: dict):
+    print(f"\n{'endpoint':<24}{'req':>8}{'err':>6}{'req/s':>10}"
+          f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    print("─" * 78)
+    for label, e in result["endpoints"].items():
+        print(f"{label:<24}{e['requests']:>8}{e['errors']:>6}{e['throughput']:>10.1f}"
+              f"{e['p50_ms']:>10.2f}{e['p95_ms']:>10.2f}{e['p99_ms']:>10.2f}")
+    print("─" * 78)
+    print(f"{'total':<24}{'':>24}{result['throughput']:>10.1f}\n")
+
+
+def compare(result: dict, baseline: dict, threshold: float) -> list:
+    """Regressions beyond `threshold` (fraction) in p95 latency or throughput."""
+    problems = []
+    for label, base in baseline.get("endpoints", {}).items():
+        cur = result["endpoints"].get(label)
+        if cur is None:
+            problems.append(f"{label}: missing from this run")
+            continue
+        if base["p95_ms"] and cur["p95_ms"] > base["p95_ms"] * (1 + threshold):
+            problems.append(f"{label}: p95 {cur['p95_ms']:.2f} ms vs baseline {base['p95_ms']:.2f} ms")
+        if base["throughput"] and cur["throughput"] < base["throughput"] * (1 - threshold):
+            problems.append(f"{label}: {cur['throughput']:.1f} req/s vs baseline {base['throughput']:.1f} req/s")
+        if cur["errors"] > base.get("errors", 0):
+            problems.append(f"{label}: {cur['errors']} errors vs baseline {base.get('errors', 0)}")
+    return problems
+
+
+# ── Setup ──────────────────────────────────────────────────────────────────────
+
+def boot(args, workdir: str):
+    """Create + seed the fake DB, point utils.db / utils.adb at it, return (app, tokens, dataset)."""
+    from benchmarks.fake_db import FakeDatabase
+    import utils.adb
+    import utils.db
+    from config import config
+    from utils.jwt_handler import generate_access_token
+
+    # The limiter would throttle the load generator itself
+    config.RATE_LIMIT_ENABLED = False
+    config.MAX_IN_FLIGHT      = 10**6
+
+    fake = FakeDatabase(os.path.join(workdir, "bench.db"),
+                        connect_latency_ms=args.connect_latency_ms,
+                        query_latency_ms=args.latency_ms)
+    fake.create_schema()
+    dataset = seed(fake, args.scale, random.Random(args.seed))
+    utils.db.get_connection = fake.connect
+    utils.adb.connect       = fake.connect_async
+
+    from models.sales import SalesRollup
+    SalesRollup.rebuild()   # seed() writes orders directly
+
+    from app import create_app
+    app = create_app(async_routes=args.async_routes)
+
+    tokens = {
+        "admin": generate_access_token(1, "admin"),
+        "users": [generate_access_token(uid, "customer")
+                  for uid in range(2, dataset["users"] + 2)],
+    }
+    return app, tokens, dataset
+
+
+def run(args) -> dict:
+    with tempfile.TemporaryDirectory() as workdir:
+        app, tokens, dataset = boot(args, workdir)
+        mix = dict(DEFAULT_MIX)
+        if args.only:
+            mix = {k: v for k, v in mix.items() if k in args.only.split(",")}
+
+        workers = [Worker(InProcessClient(app), tokens, dataset, mix, args.seed + i)
+                   for i in range(args.threads)]
+
+        # Warm-up (imports, first-request setup, SQLite page cache)
+        for _ in range(args.warmup):
+            workers[0].run_once()
+        for w in workers:
+            w.samples.clear()
+            w.errors.clear()
+
+        deadline = time.perf_counter() + args.duration
+
+        def loop(worker):
+            while time.perf_counter() < deadline:
+                worker.run_once()
+
+        threads = [threading.Thread(target=loop, args=(w,)) for w in workers]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+    result = summarize(workers, elapsed)
+    result["config"] = {"scale": args.scale, "threads": args.threads,
+                        "duration_s": args.duration, "latency_ms": args.latency_ms,
+                        "connect_latency_ms": args.connect_latency_ms,
+                        "mix": mix, "dataset": dataset}
+    return result
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="E-commerce API load benchmark")
+    parser.add_argument("--scale",    type=int,   default=1,   help="dataset multiplier (1 = 1k products)")
+    parser.add_argument("--threads",  type=int,   default=4,   help="concurrent client threads")
+    parser.add_argument("--duration", type=float, default=10,  help="seconds to run")
+    parser.add_argument("--warmup",   type=int,   default=200, help="requests before measuring")
+    parser.add_argument("--latency-ms",         type=float, default=0.0, help="injected per-statement latency")
+    parser.add_argument("--connect-latency-ms", type=float, default=0.0, help="injected per-connect latency")
+    parser.add_argument("--seed",     type=int,   default=42)
+    parser.add_argument("--async-routes", action="store_true", help="serve the coroutine routes (utils.adb)")
+    parser.add_argument("--only",     help="comma-separated scenarios, e.g. browse,search")
+    parser.add_argument("--output",   help="write the JSON result here")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--check",    action="store_true", help="exit 1 on regression vs baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed regression fraction")
+    parser.add_argument("--update-baseline", action="store_true")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+
+    result = run(args)
+    print_report(result)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+
+    if args.check:
+        with open(args.baseline) as f:
+            problems = compare(result, json.load(f), args.threshold)
+        if problems:
+            print("Regressions vs baseline:")
+            for p in problems:
+                print(f"  ✗ {p}")
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} vs baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
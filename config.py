@@ -19,15 +19,144 @@ class Config:
     DB_PASSWORD = os.getenv("DB_PASSWORD", "")
     DB_NAME     = os.getenv("DB_NAME",     "ecommerce_db")
 
+    DB_POOL_SIZE            = int(os.getenv("DB_POOL_SIZE", "10"))   # idle connections kept per host
+    DB_PREPARED_STATEMENTS  = os.getenv("DB_PREPARED_STATEMENTS", "true").lower() == "true"
+    DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "64"))   # per connection
+
+    # Read replicas, "host:port,host:port" — empty = everything on DB_HOST
+    DB_REPLICAS = [r.strip() for r in os.getenv("DB_REPLICAS", "").split(",") if r.strip()]
+    DB_REPLICA_MAX_LAG        = int(os.getenv("DB_REPLICA_MAX_LAG", "5"))   # seconds
+    DB_REPLICA_CHECK_INTERVAL = 5    # seconds between background health checks
+    DB_REPLICA_RETRY_SECONDS  = 30   # how long a failed replica stays out of rotation
+
     # ── JWT ────────────────────────────────────────────────────
     JWT_SECRET_KEY     = os.getenv("JWT_SECRET_KEY", "change-this-jwt-key")
     JWT_ACCESS_EXPIRY  = timedelta(hours=1)
     JWT_REFRESH_EXPIRY = timedelta(days=7)
 
+    # Revocations made by other workers are picked up this often (seconds)
+    REVOCATION_SYNC_SECONDS = int(os.getenv("REVOCATION_SYNC_SECONDS", "5"))
+    # Rows logged this recently are re-read on every sync, in case a lower id commits later
+    REVOCATION_SYNC_MARGIN  = int(os.getenv("REVOCATION_SYNC_MARGIN", "30"))
+
+    # Per-process user cache (profile / role lookups by id)
+    USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+    USER_CACHE_TTL  = int(os.getenv("USER_CACHE_TTL", "60"))   # seconds
+
     # ── Pagination ─────────────────────────────────────────────
     DEFAULT_PAGE_SIZE = 10
     MAX_PAGE_SIZE     = 100
 
+    # ── Batch (POST /batch) ────────────────────────────────────
+    BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", "20"))
+
+    # ── Bulk import (POST /products/bulk) ──────────────────────
+    IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "1000"))   # rows per multi-row upsert
+    IMPORT_MAX_ERRORS = 1000   # row errors listed in import / stock sync reports (all are counted)
+
+    # ── Stock sync (POST /products/stock-sync) ─────────────────
+    STOCK_SYNC_BATCH_SIZE = int(os.getenv("STOCK_SYNC_BATCH_SIZE", "1000"))   # SKUs per transaction
+
+    # ── Bulk order status (PUT /orders/admin/status) ───────────
+    BULK_STATUS_MAX_ORDERS  = int(os.getenv("BULK_STATUS_MAX_ORDERS", "10000"))
+    ORDER_STATUS_BATCH_SIZE = 1000   # orders per transaction
+
+    # ── Exports (GET /products/export, /orders/admin/export) ───
+    EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "5000"))   # rows per response chunk
+
+    # ── Reporting ──────────────────────────────────────────────
+    REPORT_CHUNK_SIZE = int(os.getenv("REPORT_CHUNK_SIZE", "50000"))   # rows per streamed chunk
+
+    # Queued sales-rollup changes are applied this often (seconds), this many per transaction
+    SALES_ROLLUP_SECONDS = float(os.getenv("SALES_ROLLUP_SECONDS", "2"))
+    SALES_ROLLUP_BATCH   = int(os.getenv("SALES_ROLLUP_BATCH", "1000"))
+
+    # ── Recommendations (frequently bought together) ───────────
+    RELATED_ENABLED         = os.getenv("RELATED_ENABLED", "true").lower() == "true"
+    RELATED_TOP_K           = 20     # co-purchased products kept per product
+    RELATED_REBUILD_SECONDS = int(os.getenv("RELATED_REBUILD_SECONDS", "3600"))
+
+    # ── Response compression ───────────────────────────────────
+    # Encoding → level, in server preference order. zstd / br are used
+    # only when the zstandard / brotli packages are installed.
+    COMPRESSION_ENABLED         = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_LEVELS          = {"zstd": 3, "br": 4, "gzip": int(os.getenv("COMPRESSION_LEVEL", "6"))}
+    COMPRESSION_MIN_BYTES       = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+    COMPRESSION_CACHE_SIZE      = 512         # precompressed bodies kept per process
+    COMPRESSION_CACHE_MAX_BYTES = 1_048_576   # larger bodies are compressed every time
+
+    # ── Observability ──────────────────────────────────────────
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    METRICS_TOKEN   = os.getenv("METRICS_TOKEN", "")   # scrape bearer token; unset = loopback only
+
+    # Per-request query profiler (N+1 detection, slow query log, Server-Timing)
+    QUERY_PROFILING       = os.getenv("QUERY_PROFILING", "false").lower() == "true"
+    QUERY_PROFILE_HEADERS = True
+    N_PLUS_ONE_THRESHOLD  = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+    SLOW_QUERY_MS         = float(os.getenv("SLOW_QUERY_MS", "200"))
+    SLOW_QUERY_LOG        = os.getenv("SLOW_QUERY_LOG", "logs/slow_queries.log")
+
+    # Span tracing (OTLP/JSON lines written to TRACE_EXPORT_PATH)
+    TRACING_ENABLED    = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+    TRACE_SAMPLE_RATE  = float(os.getenv("TRACE_SAMPLE_RATE", "0.01"))
+    TRACE_EXPORT_PATH  = os.getenv("TRACE_EXPORT_PATH", "logs/traces.jsonl")
+    TRACE_SERVICE_NAME = os.getenv("TRACE_SERVICE_NAME", "ecommerce-api")
+
+    # ── Rate limiting ──────────────────────────────────────────
+    # Token bucket per client: (refill tokens / second, burst size).
+    # Keyed by blueprint name; None = routes outside any blueprint.
+    RATE_LIMIT_ENABLED   = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_BACKEND   = os.getenv("RATE_LIMIT_BACKEND", "memory")   # memory | redis
+    RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+    RATE_LIMIT_DEFAULT   = (20.0, 40)
+    RATE_LIMITS = {
+        "auth":     (2.0, 10),     # login / register are bcrypt-heavy
+        "products": (20.0, 40),
+        "cart":     (10.0, 20),
+        "orders":   (5.0, 10),
+        "batch":    (5.0, 10),     # sub-requests are also limited individually
+        None:       None,          # "/" and "/health" are never limited
+    }
+
+    # Global load shedding — requests beyond this many in flight get a 503
+    MAX_IN_FLIGHT = int(os.getenv("MAX_IN_FLIGHT", "64"))
+
+    # ── Request deadlines ──────────────────────────────────────
+    # Seconds a request may take, by endpoint or blueprint (None = no
+    # deadline). Queries are capped at the time left (MAX_EXECUTION_TIME)
+    # and the request fails with 504 once it is spent. Clients may send
+    # X-Request-Timeout: <seconds> instead, up to REQUEST_TIMEOUT_MAX.
+    REQUEST_TIMEOUT_DEFAULT = float(os.getenv("REQUEST_TIMEOUT_DEFAULT", "10"))
+    REQUEST_TIMEOUT_MAX     = float(os.getenv("REQUEST_TIMEOUT_MAX", "60"))
+    REQUEST_TIMEOUT_HEADER  = "X-Request-Timeout"
+    REQUEST_TIMEOUTS = {
+        "products":                        5.0,
+        "cart":                            5.0,
+        "orders":                          10.0,
+        "batch":                           15.0,
+        "products.export_products":        None,   # streamed; bounded by the client
+        "products.import_products":        None,
+        "products.sync_stock":             None,
+        "orders.admin_export_orders":      None,
+        "orders.admin_bulk_update_status": 120.0,
+        "orders.admin_item_report":        60.0,
+    }
+
+    # ── Production server (python server.py) ───────────────────
+    # Caches, rate-limit buckets and MAX_IN_FLIGHT are per worker.
+    WEB_BIND             = os.getenv("WEB_BIND", "0.0.0.0:5000")
+    WEB_WORKERS          = int(os.getenv("WEB_WORKERS", str(2 * (os.cpu_count() or 1) + 1)))
+    WEB_THREADS          = int(os.getenv("WEB_THREADS", "4"))                 # per worker
+    WEB_MAX_REQUESTS     = int(os.getenv("WEB_MAX_REQUESTS", "10000"))        # then recycle, 0 = never
+    WEB_MAX_RSS_MB       = int(os.getenv("WEB_MAX_RSS_MB", "512"))            # then recycle, 0 = no limit
+    WEB_TIMEOUT          = int(os.getenv("WEB_TIMEOUT", "60"))                # stuck worker → killed
+    WEB_GRACEFUL_TIMEOUT = int(os.getenv("WEB_GRACEFUL_TIMEOUT", "30"))       # SIGTERM drain
+
+    # ── Async routes (routes/async_routes.py, asgi.py) ─────────
+    # Serve the catalogue, cart and checkout endpoints as coroutines on
+    # an aiomysql pool (utils/adb.py). asgi.py always turns this on.
+    ASYNC_ROUTES = os.getenv("ASYNC_ROUTES", "false").lower() == "true"
+
 
 class DevelopmentConfig(Config):
     DEBUG = True
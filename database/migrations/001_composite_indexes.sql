@@ -0,0 +1,30 @@
+-- ============================================
+--   MIGRATION 001 — composite indexes for the hot queries
+--   Verify with: python -m tools.query_plans
+-- ============================================
+
+USE ecommerce_db;
+
+-- ─────────────────────────────────────────
+-- PRODUCTS — listing = is_active [+ category_id] ORDER BY <ALLOWED_SORT>
+-- (price ranges ride on the *_price indexes)
+-- ─────────────────────────────────────────
+ALTER TABLE products
+    ADD INDEX idx_active_created          (is_active, created_at),
+    ADD INDEX idx_active_price            (is_active, price),
+    ADD INDEX idx_active_name             (is_active, name),
+    ADD INDEX idx_active_stock            (is_active, stock),
+    ADD INDEX idx_active_category_created (is_active, category_id, created_at),
+    ADD INDEX idx_active_category_price   (is_active, category_id, price),
+    ADD INDEX idx_active_category_name    (is_active, category_id, name),
+    ADD INDEX idx_active_category_stock   (is_active, category_id, stock),
+    DROP INDEX idx_active;                -- prefix of every index above
+
+-- ─────────────────────────────────────────
+-- ORDERS — history by user / admin list by status, newest first
+-- ─────────────────────────────────────────
+ALTER TABLE orders
+    ADD INDEX idx_user_created   (user_id, created_at),
+    ADD INDEX idx_status_created (status, created_at),
+    DROP INDEX idx_user_orders,           -- prefix of idx_user_created (still backs the FK)
+    DROP INDEX idx_order_status;          -- prefix of idx_status_created
@@ -0,0 +1,56 @@
+-- ============================================
+--   MIGRATION 002 — denormalized order summaries
+--   orders.item_count / first_item_*  → order history without item lookups
+--   user_order_summary                → totals without COUNT(*) per page
+--   Both are maintained by Order.create_from_cart / Order.update_status.
+-- ============================================
+
+USE ecommerce_db;
+
+-- ─────────────────────────────────────────
+-- ORDERS — per-order preview
+-- ─────────────────────────────────────────
+ALTER TABLE orders
+    ADD COLUMN item_count       INT          NOT NULL DEFAULT 0 AFTER payment_method,
+    ADD COLUMN first_item_name  VARCHAR(200)                    AFTER item_count,
+    ADD COLUMN first_item_image VARCHAR(500)                    AFTER first_item_name;
+
+UPDATE orders o
+JOIN (SELECT order_id, COUNT(*) AS item_count, MIN(id) AS first_id
+      FROM order_items GROUP BY order_id) agg ON agg.order_id = o.id
+JOIN order_items oi ON oi.id = agg.first_id
+JOIN products p     ON p.id  = oi.product_id
+SET o.item_count       = agg.item_count,
+    o.first_item_name  = p.name,
+    o.first_item_image = p.image_url;
+
+-- ─────────────────────────────────────────
+-- USER ORDER SUMMARY — one row per customer
+-- ─────────────────────────────────────────
+CREATE TABLE IF NOT EXISTS user_order_summary (
+    user_id          INT PRIMARY KEY,
+    total_orders     INT            NOT NULL DEFAULT 0,
+    pending_orders   INT            NOT NULL DEFAULT 0,
+    confirmed_orders INT            NOT NULL DEFAULT 0,
+    shipped_orders   INT            NOT NULL DEFAULT 0,
+    delivered_orders INT            NOT NULL DEFAULT 0,
+    cancelled_orders INT            NOT NULL DEFAULT 0,
+    lifetime_spend   DECIMAL(12,2)  NOT NULL DEFAULT 0,   -- excludes cancelled orders
+    updated_at       TIMESTAMP      DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+INSERT INTO user_order_summary
+    (user_id, total_orders, pending_orders, confirmed_orders, shipped_orders,
+     delivered_orders, cancelled_orders, lifetime_spend)
+SELECT user_id,
+       COUNT(*),
+       SUM(status = 'pending'),
+       SUM(status = 'confirmed'),
+       SUM(status = 'shipped'),
+       SUM(status = 'delivered'),
+       SUM(status = 'cancelled'),
+       COALESCE(SUM(CASE WHEN status <> 'cancelled' THEN total_amount END), 0)
+FROM orders
+GROUP BY user_id;
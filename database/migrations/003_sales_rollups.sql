@@ -0,0 +1,30 @@
+-- ============================================
+--   MIGRATION 003 — sales rollups for GET /orders/admin/stats
+--   Backfill afterwards with: python -m tools.rebuild_rollups
+-- ============================================
+
+USE ecommerce_db;
+
+-- ─────────────────────────────────────────
+-- SALES ROLLUPS (maintained by models/sales.py)
+-- ─────────────────────────────────────────
+CREATE TABLE IF NOT EXISTS sales_daily (
+    day          DATE           NOT NULL,
+    status       ENUM('pending','confirmed','shipped','delivered','cancelled') NOT NULL,
+    order_count  INT            NOT NULL DEFAULT 0,
+    units        INT            NOT NULL DEFAULT 0,
+    revenue      DECIMAL(14,2)  NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (day, status)
+);
+
+CREATE TABLE IF NOT EXISTS sales_daily_category (
+    day          DATE           NOT NULL,
+    category_id  INT            NOT NULL,   -- 0 = uncategorized
+    status       ENUM('pending','confirmed','shipped','delivered','cancelled') NOT NULL,
+    order_count  INT            NOT NULL DEFAULT 0,
+    units        INT            NOT NULL DEFAULT 0,
+    revenue      DECIMAL(14,2)  NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (day, category_id, status)
+);
@@ -0,0 +1,20 @@
+-- ============================================
+--   MIGRATION 004 — token revocation log for logout / refresh rotation
+-- ============================================
+
+USE ecommerce_db;
+
+-- ─────────────────────────────────────────
+-- TOKEN REVOCATIONS (append-only log, see services/token_service.py)
+-- ─────────────────────────────────────────
+CREATE TABLE IF NOT EXISTS token_revocations (
+    id          BIGINT AUTO_INCREMENT PRIMARY KEY,    -- workers sync with id > last seen
+    jti         CHAR(32)       NULL UNIQUE,           -- one token (logout / refresh rotation)
+    user_id     INT            NOT NULL,
+    not_before  BIGINT         NULL,                  -- or every token of user_id issued earlier
+    expires_at  BIGINT         NOT NULL,              -- epoch seconds; row is moot afterwards
+    created_at  TIMESTAMP      DEFAULT CURRENT_TIMESTAMP,
+
+    INDEX idx_user_not_before (user_id, not_before),
+    INDEX idx_expires (expires_at)
+);
@@ -0,0 +1,10 @@
+-- ============================================
+--   MIGRATION 005 — product SKUs for POST /products/bulk (upsert by SKU)
+-- ============================================
+
+USE ecommerce_db;
+
+-- NULL for products created without one; MySQL allows any number of NULLs
+-- in a UNIQUE index.
+ALTER TABLE products
+    ADD COLUMN sku VARCHAR(64) NULL UNIQUE AFTER id;
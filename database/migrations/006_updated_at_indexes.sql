@@ -0,0 +1,14 @@
+-- ============================================
+--   MIGRATION 006 — incremental exports (?updated_since=)
+--   GET /products/export and GET /orders/admin/export read changed rows
+--   in (updated_at, id) order; InnoDB appends the primary key to every
+--   secondary index, so idx_updated serves both the range and the order.
+-- ============================================
+
+USE ecommerce_db;
+
+ALTER TABLE products
+    ADD INDEX idx_updated (updated_at);
+
+ALTER TABLE orders
+    ADD INDEX idx_updated (updated_at);
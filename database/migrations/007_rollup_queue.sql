@@ -0,0 +1,23 @@
+-- ============================================
+--   MIGRATION 007 — sales rollups off the checkout transaction
+--   Checkout and status changes append to sales_rollup_queue; a background
+--   thread folds the queue into sales_daily / sales_daily_category.
+--   order_items keeps the product's category at purchase time, so a later
+--   cancellation reverses revenue out of the category it was added to.
+-- ============================================
+
+USE ecommerce_db;
+
+ALTER TABLE order_items
+    ADD COLUMN category_id INT NULL AFTER product_id;   -- NULL = uncategorized
+
+UPDATE order_items oi
+JOIN products p ON p.id = oi.product_id
+SET oi.category_id = p.category_id;
+
+CREATE TABLE IF NOT EXISTS sales_rollup_queue (
+    id          BIGINT AUTO_INCREMENT PRIMARY KEY,
+    order_id    INT            NOT NULL,
+    old_status  ENUM('pending','confirmed','shipped','delivered','cancelled') NULL,   -- NULL = new order
+    new_status  ENUM('pending','confirmed','shipped','delivered','cancelled') NOT NULL
+);
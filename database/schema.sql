@@ -36,6 +36,7 @@ CREATE TABLE IF NOT EXISTS categories (
 -- ─────────────────────────────────────────
 CREATE TABLE IF NOT EXISTS products (
     id           INT AUTO_INCREMENT PRIMARY KEY,
+    sku          VARCHAR(64)    NULL UNIQUE,   -- bulk import upserts by it
     name         VARCHAR(200)   NOT NULL,
     description  TEXT,
     price        DECIMAL(10,2)  NOT NULL,
@@ -51,8 +52,18 @@ CREATE TABLE IF NOT EXISTS products (
     -- Optimized indexes for frequent queries
     INDEX idx_category    (category_id),
     INDEX idx_price       (price),
-    INDEX idx_active      (is_active),
     INDEX idx_name        (name),
+
+    -- Listing: is_active [+ category_id] ORDER BY <sort column>
+    INDEX idx_active_created          (is_active, created_at),
+    INDEX idx_active_price            (is_active, price),
+    INDEX idx_active_name             (is_active, name),
+    INDEX idx_active_stock            (is_active, stock),
+    INDEX idx_active_category_created (is_active, category_id, created_at),
+    INDEX idx_active_category_price   (is_active, category_id, price),
+    INDEX idx_active_category_name    (is_active, category_id, name),
+    INDEX idx_active_category_stock   (is_active, category_id, stock),
+    INDEX idx_updated                 (updated_at),   -- incremental export
     FULLTEXT INDEX idx_search (name, description)   -- Full-text search
 );
 
@@ -84,14 +95,18 @@ CREATE TABLE IF NOT EXISTS orders (
                     DEFAULT 'pending',
     shipping_address TEXT          NOT NULL,
     payment_method  VARCHAR(50)    DEFAULT 'COD',
+    item_count      INT            NOT NULL DEFAULT 0,   -- denormalized for order history
+    first_item_name  VARCHAR(200),
+    first_item_image VARCHAR(500),
     created_at      TIMESTAMP      DEFAULT CURRENT_TIMESTAMP,
     updated_at      TIMESTAMP      DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
 
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
 
-    INDEX idx_user_orders  (user_id),
-    INDEX idx_order_status (status),
-    INDEX idx_created_at   (created_at)
+    INDEX idx_user_created   (user_id, created_at),
+    INDEX idx_status_created (status, created_at),
+    INDEX idx_created_at     (created_at),
+    INDEX idx_updated        (updated_at)       -- incremental export
 );
 
 -- ─────────────────────────────────────────
@@ -101,6 +116,7 @@ CREATE TABLE IF NOT EXISTS order_items (
     id          INT AUTO_INCREMENT PRIMARY KEY,
     order_id    INT            NOT NULL,
     product_id  INT            NOT NULL,
+    category_id INT            NULL,       -- product's category at time of purchase (NULL = uncategorized)
     quantity    INT            NOT NULL,
     unit_price  DECIMAL(10,2)  NOT NULL,   -- price at time of purchase (snapshot)
 
@@ -110,6 +126,70 @@ CREATE TABLE IF NOT EXISTS order_items (
     INDEX idx_order_items (order_id)
 );
 
+-- ─────────────────────────────────────────
+-- USER ORDER SUMMARY TABLE (maintained by the Order model)
+-- ─────────────────────────────────────────
+CREATE TABLE IF NOT EXISTS user_order_summary (
+    user_id          INT PRIMARY KEY,
+    total_orders     INT            NOT NULL DEFAULT 0,
+    pending_orders   INT            NOT NULL DEFAULT 0,
+    confirmed_orders INT            NOT NULL DEFAULT 0,
+    shipped_orders   INT            NOT NULL DEFAULT 0,
+    delivered_orders INT            NOT NULL DEFAULT 0,
+    cancelled_orders INT            NOT NULL DEFAULT 0,
+    lifetime_spend   DECIMAL(12,2)  NOT NULL DEFAULT 0,   -- excludes cancelled orders
+    updated_at       TIMESTAMP      DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+-- ─────────────────────────────────────────
+-- SALES ROLLUPS (maintained by models/sales.py)
+-- ─────────────────────────────────────────
+CREATE TABLE IF NOT EXISTS sales_daily (
+    day          DATE           NOT NULL,
+    status       ENUM('pending','confirmed','shipped','delivered','cancelled') NOT NULL,
+    order_count  INT            NOT NULL DEFAULT 0,
+    units        INT            NOT NULL DEFAULT 0,
+    revenue      DECIMAL(14,2)  NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (day, status)
+);
+
+CREATE TABLE IF NOT EXISTS sales_daily_category (
+    day          DATE           NOT NULL,
+    category_id  INT            NOT NULL,   -- 0 = uncategorized
+    status       ENUM('pending','confirmed','shipped','delivered','cancelled') NOT NULL,
+    order_count  INT            NOT NULL DEFAULT 0,
+    units        INT            NOT NULL DEFAULT 0,
+    revenue      DECIMAL(14,2)  NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (day, category_id, status)
+);
+
+-- Rollup changes waiting to be applied (appended in the order's transaction)
+CREATE TABLE IF NOT EXISTS sales_rollup_queue (
+    id          BIGINT AUTO_INCREMENT PRIMARY KEY,
+    order_id    INT            NOT NULL,
+    old_status  ENUM('pending','confirmed','shipped','delivered','cancelled') NULL,   -- NULL = new order
+    new_status  ENUM('pending','confirmed','shipped','delivered','cancelled') NOT NULL
+);
+
+-- ─────────────────────────────────────────
+-- TOKEN REVOCATIONS (append-only log, see services/token_service.py)
+-- ─────────────────────────────────────────
+CREATE TABLE IF NOT EXISTS token_revocations (
+    id          BIGINT AUTO_INCREMENT PRIMARY KEY,    -- workers sync with id > last settled
+    jti         CHAR(32)       NULL UNIQUE,           -- one token (logout / refresh rotation)
+    user_id     INT            NOT NULL,
+    not_before  BIGINT         NULL,                  -- or every token of user_id issued earlier
+    expires_at  BIGINT         NOT NULL,              -- epoch seconds; row is moot afterwards
+    created_at  TIMESTAMP      DEFAULT CURRENT_TIMESTAMP,
+
+    INDEX idx_user_not_before (user_id, not_before),
+    INDEX idx_expires (expires_at)
+);
+
 -- ─────────────────────────────────────────
 -- SEED DATA
 -- ─────────────────────────────────────────
@@ -4,26 +4,42 @@ models/cart.py
 Cart model — manages a user's shopping cart.
 """
 
+from utils import adb
 from utils.db import execute_query
+from utils.tracing import traced
 
 
 class Cart:
     """Represents the shopping cart layer."""
 
+    # Items with their product's current price and stock
+    _ITEMS = """
+        SELECT c.id, c.quantity, c.added_at,
+               p.id AS product_id, p.name, p.price,
+               p.image_url, p.stock, p.category_id,
+               (c.quantity * p.price) AS subtotal
+        FROM cart c
+        JOIN products p ON c.product_id = p.id
+        WHERE c.user_id = %s"""
+
+    # Add, or increment the quantity (one upsert on unique_cart_item)
+    _ADD = """
+        INSERT INTO cart (user_id, product_id, quantity) VALUES (%s, %s, %s)
+        ON DUPLICATE KEY UPDATE quantity = quantity + VALUES(quantity)"""
+
     @staticmethod
+    @traced()
     def get_user_cart(user_id: int) -> dict:
         """Return all cart items + running total for a user."""
-        rows = execute_query(
-            """SELECT c.id, c.quantity, c.added_at,
-                      p.id AS product_id, p.name, p.price,
-                      p.image_url, p.stock,
-                      (c.quantity * p.price) AS subtotal
-               FROM cart c
-               JOIN products p ON c.product_id = p.id
-               WHERE c.user_id = %s""",
-            (user_id,), fetch="all"
-        )
+        return Cart._from_rows(execute_query(Cart._ITEMS, (user_id,), fetch="all"))
+
+    @staticmethod
+    @traced()
+    async def get_user_cart_async(user_id: int) -> dict:
+        return Cart._from_rows(await adb.execute_query(Cart._ITEMS, (user_id,), fetch="all"))
 
+    @staticmethod
+    def _from_rows(rows: list) -> dict:
         items = []
         total = 0.0
         for r in (rows or []):
@@ -35,6 +51,7 @@ class Cart:
                 "quantity":     r["quantity"],
                 "subtotal":     float(r["subtotal"]),
                 "image_url":    r["image_url"],
+                "category_id":  r["category_id"],
                 "in_stock":     r["stock"] >= r["quantity"],
             }
             items.append(item)
@@ -43,24 +60,18 @@ class Cart:
         return {"items": items, "total": round(total, 2), "item_count": len(items)}
 
     @staticmethod
+    @traced()
     def add_item(user_id: int, product_id: int, quantity: int = 1):
-        """Add item or increment quantity if already in cart."""
-        existing = execute_query(
-            "SELECT id, quantity FROM cart WHERE user_id=%s AND product_id=%s",
-            (user_id, product_id), fetch="one"
-        )
-        if existing:
-            execute_query(
-                "UPDATE cart SET quantity = quantity + %s WHERE user_id=%s AND product_id=%s",
-                (quantity, user_id, product_id)
-            )
-        else:
-            execute_query(
-                "INSERT INTO cart (user_id, product_id, quantity) VALUES (%s, %s, %s)",
-                (user_id, product_id, quantity)
-            )
+        """Add item or increment quantity if already in cart (one upsert on unique_cart_item)."""
+        execute_query(Cart._ADD, (user_id, product_id, quantity))
 
     @staticmethod
+    @traced()
+    async def add_item_async(user_id: int, product_id: int, quantity: int = 1):
+        await adb.execute_query(Cart._ADD, (user_id, product_id, quantity))
+
+    @staticmethod
+    @traced()
     def update_quantity(user_id: int, product_id: int, quantity: int):
         """Set an exact quantity. Pass 0 to remove."""
         if quantity <= 0:
@@ -72,6 +83,7 @@ class Cart:
             )
 
     @staticmethod
+    @traced()
     def remove_item(user_id: int, product_id: int):
         execute_query(
             "DELETE FROM cart WHERE user_id=%s AND product_id=%s",
@@ -79,10 +91,17 @@ class Cart:
         )
 
     @staticmethod
+    @traced()
     def clear(user_id: int):
         execute_query("DELETE FROM cart WHERE user_id=%s", (user_id,))
 
     @staticmethod
+    @traced()
+    async def clear_async(user_id: int):
+        await adb.execute_query("DELETE FROM cart WHERE user_id=%s", (user_id,))
+
+    @staticmethod
+    @traced()
     def item_count(user_id: int) -> int:
         row = execute_query(
             "SELECT SUM(quantity) AS total FROM cart WHERE user_id=%s",
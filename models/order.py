@@ -2,18 +2,86 @@
 models/order.py
 ───────────────
 Order model — manages order lifecycle.
+
+Order history is served from denormalized data kept in step with every
+write, inside the same transaction:
+  • orders.item_count / first_item_name / first_item_image — list preview
+  • user_order_summary — per-user totals, counts by status, lifetime spend
+  • sales rollups (models/sales.py) — admin analytics
+
+Reads select only the columns behind the requested fields (FIELDS,
+utils/fields.py); find_by_id skips the order_items query unless
+"items" is requested.
 """
 
-from utils.db import execute_query, execute_transaction
+from models.sales import SalesRollup
+from utils import adb
+from utils.db import execute_query, stream_query, transaction
+from utils.fields import select_list, project
+from utils.tracing import traced
+
+
+def _amount(value) -> float:
+    return float(value) if value else 0.0
+
+
+def _text(value):
+    return str(value) if value else None
 
 
 class Order:
     """Represents a placed order."""
 
-    VALID_STATUSES = {"pending", "confirmed", "shipped", "delivered", "cancelled"}
+    STATUS_ORDER   = ("pending", "confirmed", "shipped", "delivered", "cancelled")
+    VALID_STATUSES = set(STATUS_ORDER)
+
+    # Forward moves allowed by the bulk status update (fulfilment flow)
+    TRANSITIONS = {
+        "pending":   {"confirmed", "cancelled"},
+        "confirmed": {"shipped", "cancelled"},
+        "shipped":   {"delivered"},
+        "delivered": set(),
+        "cancelled": set(),
+    }
+
+    # fields= name → (columns it needs, value from a row); items come from order_items
+    FIELDS = {
+        "id":               (("o.id",),               lambda r: r["id"]),
+        "user_id":          (("o.user_id",),          lambda r: r["user_id"]),
+        "total_amount":     (("o.total_amount",),     lambda r: _amount(r["total_amount"])),
+        "status":           (("o.status",),           lambda r: r["status"]),
+        "shipping_address": (("o.shipping_address",), lambda r: r["shipping_address"]),
+        "payment_method":   (("o.payment_method",),   lambda r: r["payment_method"]),
+        "item_count":       (("o.item_count",),       lambda r: r["item_count"]),
+        "first_item":       (("o.first_item_name", "o.first_item_image"),
+                             lambda r: {"name": r["first_item_name"],
+                                        "image_url": r["first_item_image"]}),
+        "items":            ((),                      lambda r: r.get("items") or []),
+        "created_at":       (("o.created_at",),       lambda r: _text(r["created_at"])),
+        "updated_at":       (("o.updated_at",),       lambda r: _text(r["updated_at"])),
+    }
+
+    # History / admin lists never carry items; the admin list adds the customer
+    LIST_FIELDS  = {k: v for k, v in FIELDS.items() if k != "items"}
+    ADMIN_FIELDS = {
+        **LIST_FIELDS,
+        "customer_name":  (("u.name AS customer_name",),   lambda r: r["customer_name"]),
+        "customer_email": (("u.email AS customer_email",), lambda r: r["customer_email"]),
+    }
+    ADMIN_DEFAULT = ("id", "user_id", "customer_name", "customer_email", "total_amount",
+                     "status", "payment_method", "item_count", "created_at")
+
+    # Columns of stream_export() rows, in order
+    EXPORT_COLUMNS = ("id", "user_id", "status", "total_amount", "payment_method",
+                      "item_count", "shipping_address", "created_at", "updated_at")
+
+    __slots__ = ("id", "user_id", "total_amount", "status", "shipping_address",
+                 "payment_method", "item_count", "first_item_name", "first_item_image",
+                 "created_at", "updated_at", "items")
 
     def __init__(self, id=None, user_id=None, total_amount=None,
                  status=None, shipping_address=None, payment_method=None,
+                 item_count=0, first_item_name=None, first_item_image=None,
                  created_at=None, updated_at=None, items=None):
         self.id               = id
         self.user_id          = user_id
@@ -21,11 +89,16 @@ class Order:
         self.status           = status
         self.shipping_address = shipping_address
         self.payment_method   = payment_method
+        self.item_count       = item_count
+        self.first_item_name  = first_item_name
+        self.first_item_image = first_item_image
         self.created_at       = created_at
         self.updated_at       = updated_at
         self.items            = items or []
 
-    def to_dict(self) -> dict:
+    def to_dict(self, fields: tuple = None) -> dict:
+        if fields:
+            return project({k: getattr(self, k) for k in self.__slots__}, fields, self.FIELDS)
         return {
             "id":               self.id,
             "user_id":          self.user_id,
@@ -33,95 +106,150 @@ class Order:
             "status":           self.status,
             "shipping_address": self.shipping_address,
             "payment_method":   self.payment_method,
+            "item_count":       self.item_count,
+            "first_item":       {"name": self.first_item_name, "image_url": self.first_item_image},
             "items":            self.items,
             "created_at":       str(self.created_at) if self.created_at else None,
             "updated_at":       str(self.updated_at) if self.updated_at else None,
         }
 
+    @staticmethod
+    def row_to_dict(r: dict, items: list = None, fields: tuple = None) -> dict:
+        """Map an orders row straight to the to_dict() shape (no Order instance)."""
+        if fields:
+            return project(r if items is None else {**r, "items": items}, fields, Order.FIELDS)
+        total      = r["total_amount"]
+        created_at = r["created_at"]
+        updated_at = r["updated_at"]
+        return {
+            "id":               r["id"],
+            "user_id":          r["user_id"],
+            "total_amount":     float(total) if total else 0.0,
+            "status":           r["status"],
+            "shipping_address": r["shipping_address"],
+            "payment_method":   r["payment_method"],
+            "item_count":       r["item_count"],
+            "first_item":       {"name": r["first_item_name"], "image_url": r["first_item_image"]},
+            "items":            items or [],
+            "created_at":       str(created_at) if created_at else None,
+            "updated_at":       str(updated_at) if updated_at else None,
+        }
+
     # ── DB operations ──────────────────────────────────────────
 
     @classmethod
-    def create_from_cart(cls, user_id: int, cart_items: list,
+    @traced()
+    def create_from_cart(cls, tx, user_id: int, cart_items: list,
                          shipping_address: str, payment_method: str = "COD"):
         """
-        Atomically:
-          1. Insert order
-          2. Insert order_items
-          3. Decrement product stock
+        Inside `tx` (the caller locks and decrements the stock):
+          1. Insert order (with its list preview)
+          2. Insert order_items (one multi-row INSERT), with each
+             product's category as of now
+          3. Bump the user's order summary and queue the sales rollup change
         """
+        order, total = cls._order_insert(user_id, cart_items, shipping_address, payment_method)
+        order_id     = tx.execute(*order)["lastrowid"]
+        tx.execute(*cls._items_insert(order_id, cart_items))
+        tx.execute(*cls._summary_upsert(user_id, total))
+        SalesRollup.record(tx, order_id, "pending")
+        return order_id
+
+    @classmethod
+    @traced()
+    async def create_from_cart_async(cls, tx, user_id: int, cart_items: list,
+                                     shipping_address: str, payment_method: str = "COD"):
+        """create_from_cart() inside a utils.adb transaction."""
+        order, total = cls._order_insert(user_id, cart_items, shipping_address, payment_method)
+        order_id     = (await tx.execute(*order))["lastrowid"]
+        await tx.execute(*cls._items_insert(order_id, cart_items))
+        await tx.execute(*cls._summary_upsert(user_id, total))
+        await SalesRollup.record_async(tx, order_id, "pending")
+        return order_id
+
+    @staticmethod
+    def _order_insert(user_id, cart_items, shipping_address, payment_method) -> tuple:
+        """((query, params) for the orders row, order total)."""
         total = sum(item["price"] * item["quantity"] for item in cart_items)
+        first = cart_items[0]
+        return ("""INSERT INTO orders (user_id, total_amount, shipping_address, payment_method,
+                                   item_count, first_item_name, first_item_image)
+               VALUES (%s, %s, %s, %s, %s, %s, %s)""",
+                (user_id, total, shipping_address, payment_method,
+                 len(cart_items), first["name"], first.get("image_url"))), total
 
-        queries = [
-            (
-                """INSERT INTO orders (user_id, total_amount, shipping_address, payment_method)
-                   VALUES (%s, %s, %s, %s)""",
-                (user_id, total, shipping_address, payment_method)
-            )
-        ]
+    @staticmethod
+    def _items_insert(order_id: int, cart_items: list) -> tuple:
+        values = ", ".join(["(%s, %s, %s, %s, %s)"] * len(cart_items))
+        return (f"""INSERT INTO order_items (order_id, product_id, category_id, quantity, unit_price)
+                VALUES {values}""",
+                tuple(v for item in cart_items
+                      for v in (order_id, item["product_id"], item.get("category_id"),
+                                item["quantity"], item["price"])))
 
-        # We need the order_id — use two-phase approach
-        import mysql.connector
-        from config import config
-        from utils.db import get_connection
-
-        conn   = get_connection()
-        cursor = conn.cursor(dictionary=True)
-        try:
-            # Insert order
-            cursor.execute(
-                """INSERT INTO orders (user_id, total_amount, shipping_address, payment_method)
-                   VALUES (%s, %s, %s, %s)""",
-                (user_id, total, shipping_address, payment_method)
-            )
-            order_id = cursor.lastrowid
-
-            # Insert order items + decrement stock
-            for item in cart_items:
-                cursor.execute(
-                    """INSERT INTO order_items (order_id, product_id, quantity, unit_price)
-                       VALUES (%s, %s, %s, %s)""",
-                    (order_id, item["product_id"], item["quantity"], item["price"])
-                )
-                cursor.execute(
-                    "UPDATE products SET stock = stock - %s WHERE id = %s",
-                    (item["quantity"], item["product_id"])
-                )
+    @staticmethod
+    def _summary_upsert(user_id: int, total: float) -> tuple:
+        return ("""INSERT INTO user_order_summary
+                   (user_id, total_orders, pending_orders, lifetime_spend)
+               VALUES (%s, 1, 1, %s)
+               ON DUPLICATE KEY UPDATE
+                   total_orders   = total_orders + 1,
+                   pending_orders = pending_orders + 1,
+                   lifetime_spend = lifetime_spend + VALUES(lifetime_spend)""",
+                (user_id, total))
+
+    # Items of one order, with the product's current name and image
+    _ITEMS = """
+        SELECT oi.product_id, oi.quantity, oi.unit_price, p.name, p.image_url
+        FROM order_items oi
+        JOIN products p ON oi.product_id = p.id
+        WHERE oi.order_id = %s"""
 
-            conn.commit()
-            return order_id
+    @classmethod
+    @traced()
+    def find_by_id(cls, order_id: int, user_id: int = None, fields: tuple = None):
+        """Fetch order + its items. Optionally scope to a user / narrow to `fields`."""
+        row = execute_query(*cls._by_id(order_id, user_id, fields), fetch="one")
+        if not row:
+            return None
 
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            cursor.close()
-            conn.close()
+        order = cls(**row)
+        if fields and "items" not in fields:
+            return order
+        order.items = cls._items(execute_query(cls._ITEMS, (order_id,), fetch="all"))
+        return order
 
     @classmethod
-    def find_by_id(cls, order_id: int, user_id: int = None):
-        """Fetch order + its items. Optionally scope to a user."""
+    @traced()
+    async def find_by_id_async(cls, order_id: int, user_id: int = None, fields: tuple = None):
+        """find_by_id(), with the order row and its items read concurrently."""
+        query = cls._by_id(order_id, user_id, fields)
+        if fields and "items" not in fields:
+            row, items = await adb.execute_query(*query, fetch="one"), None
+        else:
+            row, items = await adb.gather(adb.execute_query(*query, fetch="one"),
+                                          adb.execute_query(cls._ITEMS, (order_id,), fetch="all"))
+        if not row:
+            return None
+
+        order = cls(**row)
+        if items is not None:
+            order.items = cls._items(items)
+        return order
+
+    @classmethod
+    def _by_id(cls, order_id: int, user_id: int, fields: tuple) -> tuple:
         condition = "WHERE o.id = %s"
         params    = [order_id]
         if user_id:
             condition += " AND o.user_id = %s"
             params.append(user_id)
+        return (f"SELECT {select_list(fields, cls.LIST_FIELDS)} FROM orders o {condition}",
+                tuple(params))
 
-        row = execute_query(
-            f"SELECT * FROM orders o {condition}", tuple(params), fetch="one"
-        )
-        if not row:
-            return None
-
-        items = execute_query(
-            """SELECT oi.*, p.name, p.image_url
-               FROM order_items oi
-               JOIN products p ON oi.product_id = p.id
-               WHERE oi.order_id = %s""",
-            (order_id,), fetch="all"
-        )
-
-        order = cls(**{k: v for k, v in row.items()})
-        order.items = [
+    @staticmethod
+    def _items(rows: list) -> list:
+        return [
             {
                 "product_id": i["product_id"],
                 "name":       i["name"],
@@ -130,25 +258,24 @@ class Order:
                 "subtotal":   float(i["unit_price"]) * i["quantity"],
                 "image_url":  i["image_url"],
             }
-            for i in (items or [])
+            for i in (rows or [])
         ]
-        return order
 
     @classmethod
-    def get_user_orders(cls, user_id: int, page: int = 1, per_page: int = 10):
+    @traced()
+    def get_user_orders(cls, user_id: int, page: int = 1, per_page: int = 10,
+                        fields: tuple = None):
+        """Order history page: one index range read plus the summary row."""
         offset = (page - 1) * per_page
-        count  = execute_query(
-            "SELECT COUNT(*) AS total FROM orders WHERE user_id=%s", (user_id,), fetch="one"
-        )
-        total = count["total"] if count else 0
+        total  = cls.get_summary(user_id)["total_orders"]
 
         rows = execute_query(
-            """SELECT * FROM orders WHERE user_id=%s
-               ORDER BY created_at DESC LIMIT %s OFFSET %s""",
+            f"""SELECT {select_list(fields, cls.LIST_FIELDS)} FROM orders o WHERE o.user_id=%s
+                ORDER BY o.created_at DESC LIMIT %s OFFSET %s""",
             (user_id, per_page, offset), fetch="all"
-        )
+        ) if total else []
 
-        orders     = [cls(**r).to_dict() for r in (rows or [])]
+        orders     = [cls.row_to_dict(r, fields=fields) for r in (rows or [])]
         pagination = {
             "total":    total,
             "page":     page,
@@ -158,8 +285,25 @@ class Order:
         return orders, pagination
 
     @classmethod
-    def get_all_orders(cls, page: int = 1, per_page: int = 10, status: str = None):
-        """Admin: fetch all orders with optional status filter."""
+    @traced()
+    def get_summary(cls, user_id: int) -> dict:
+        """Totals, counts by status and lifetime spend (cancelled orders excluded)."""
+        counts = ", ".join(f"{s}_orders" for s in cls.STATUS_ORDER)
+        row    = execute_query(
+            f"SELECT total_orders, {counts}, lifetime_spend "
+            f"FROM user_order_summary WHERE user_id=%s", (user_id,), fetch="one"
+        ) or {}
+        return {
+            "total_orders":   row.get("total_orders", 0),
+            "by_status":      {s: row.get(f"{s}_orders", 0) for s in cls.STATUS_ORDER},
+            "lifetime_spend": float(row.get("lifetime_spend") or 0),
+        }
+
+    @classmethod
+    @traced()
+    def get_all_orders(cls, page: int = 1, per_page: int = 10, status: str = None,
+                       fields: tuple = ADMIN_DEFAULT):
+        """Admin: rows with the columns behind `fields`, optional status filter."""
         offset     = (page - 1) * per_page
         conditions = []
         params     = []
@@ -175,9 +319,11 @@ class Order:
         )
         total = count["total"] if count else 0
 
+        columns = select_list(fields, cls.ADMIN_FIELDS)
+        join    = "JOIN users u ON o.user_id = u.id" if "u." in columns else ""
         rows = execute_query(
-            f"""SELECT o.*, u.name AS customer_name, u.email AS customer_email
-                FROM orders o JOIN users u ON o.user_id = u.id
+            f"""SELECT {columns}
+                FROM orders o {join}
                 {where}
                 ORDER BY o.created_at DESC LIMIT %s OFFSET %s""",
             tuple(params) + (per_page, offset), fetch="all"
@@ -192,10 +338,143 @@ class Order:
         return (rows or []), pagination
 
     @classmethod
+    @traced()
     def update_status(cls, order_id: int, status: str) -> bool:
+        """Change status and move the order between summary counters atomically."""
         if status not in cls.VALID_STATUSES:
             return False
-        execute_query(
-            "UPDATE orders SET status=%s WHERE id=%s", (status, order_id)
-        )
+
+        with transaction() as tx:
+            row = tx.execute(
+                "SELECT user_id, status, total_amount FROM orders WHERE id=%s FOR UPDATE",
+                (order_id,), fetch="one"
+            )
+            if not row:
+                return False
+            old = row["status"]
+            if old == status:
+                return True
+
+            tx.execute(
+                "UPDATE orders SET status=%s WHERE id=%s", (status, order_id)
+            )
+
+            # Cancelling removes the order from lifetime spend; un-cancelling restores it
+            spend = 0
+            if status == "cancelled":
+                spend = -row["total_amount"]
+            elif old == "cancelled":
+                spend = row["total_amount"]
+
+            # Column names come from VALID_STATUSES, never from the request
+            tx.execute(
+                f"""UPDATE user_order_summary
+                    SET {old}_orders    = {old}_orders - 1,
+                        {status}_orders = {status}_orders + 1,
+                        lifetime_spend  = lifetime_spend + %s
+                    WHERE user_id=%s""",
+                (spend, row["user_id"])
+            )
+            SalesRollup.move(tx, order_id, old, status)
         return True
+
+    @classmethod
+    @traced()
+    def update_statuses(cls, targets: dict) -> dict:
+        """
+        Bulk update_status for {order_id: new status}, in one transaction:
+        the orders are locked with one read, and each move allowed by
+        TRANSITIONS is applied set-based — one UPDATE per new status, and
+        summary / rollup adjustments per (old, new) pair. Returns
+        {order_id: status before} for the orders found.
+        """
+        ids = list(targets)
+        with transaction() as tx:
+            rows = tx.execute(
+                f"""SELECT id, user_id, status, total_amount FROM orders
+                    WHERE id IN ({", ".join(["%s"] * len(ids))}) FOR UPDATE""",
+                tuple(ids), fetch="all"
+            ) or []
+
+            moves = {}   # (old, new) → rows
+            for row in rows:
+                new = targets[row["id"]]
+                if new in cls.TRANSITIONS.get(row["status"], ()):
+                    moves.setdefault((row["status"], new), []).append(row)
+
+            by_status = {}
+            for (_, new), moved in moves.items():
+                by_status.setdefault(new, []).extend(r["id"] for r in moved)
+            for new, order_ids in by_status.items():
+                tx.execute(
+                    f"UPDATE orders SET status=%s WHERE id IN ({', '.join(['%s'] * len(order_ids))})",
+                    (new, *order_ids)
+                )
+
+            for (old, new), moved in moves.items():
+                # Same spend rule as update_status: cancelling leaves lifetime spend
+                users = {}
+                for r in moved:
+                    count, spend = users.get(r["user_id"], (0, 0))
+                    users[r["user_id"]] = (count + 1, spend - r["total_amount"] if new == "cancelled" else spend)
+                # Column names come from TRANSITIONS, never from the request
+                tx.execute(
+                    f"""INSERT INTO user_order_summary (user_id, {old}_orders, {new}_orders, lifetime_spend)
+                        VALUES {", ".join(["(%s, %s, %s, %s)"] * len(users))}
+                        ON DUPLICATE KEY UPDATE
+                            {old}_orders   = {old}_orders + VALUES({old}_orders),
+                            {new}_orders   = {new}_orders + VALUES({new}_orders),
+                            lifetime_spend = lifetime_spend + VALUES(lifetime_spend)""",
+                    tuple(v for user_id, (count, spend) in users.items()
+                          for v in (user_id, -count, count, spend))
+                )
+                SalesRollup.move_many(tx, [r["id"] for r in moved], old, new)
+
+        return {r["id"]: r["status"] for r in rows}
+
+    @staticmethod
+    def stream_items(start, end, chunk_size: int = 50_000):
+        """
+        Line items of non-cancelled orders placed in [start, end), streamed
+        as tuple chunks for reporting:
+          (order_id, product_id, category_id, quantity, unit_price, current_price)
+        category_id is the one at purchase (0 = uncategorized), as in the
+        sales rollups; prices come back as floats.
+        """
+        return stream_query(
+            """SELECT oi.order_id, oi.product_id, COALESCE(oi.category_id, 0), oi.quantity,
+                      CAST(oi.unit_price AS DOUBLE), CAST(p.price AS DOUBLE)
+               FROM orders o
+               JOIN order_items oi ON oi.order_id = o.id
+               JOIN products p     ON p.id = oi.product_id
+               WHERE o.created_at >= %s AND o.created_at < %s
+                 AND o.status <> 'cancelled'""",
+            (start, end), chunk_size
+        )
+
+    @staticmethod
+    def stream_lines(chunk_size: int = 100_000):
+        """(order_id, product_id) for every order line, ordered by order, as tuple chunks."""
+        return stream_query(
+            "SELECT order_id, product_id FROM order_items ORDER BY order_id",
+            (), chunk_size
+        )
+
+    @staticmethod
+    def stream_export(updated_since=None, chunk_size: int = 10_000):
+        """
+        Every order as tuple chunks in EXPORT_COLUMNS order — by id, or by
+        (updated_at, id) when limited to rows changed at or after
+        `updated_since`.
+        """
+        where, order, params = "", "id", ()
+        if updated_since is not None:
+            where, order, params = "WHERE updated_at >= %s", "updated_at, id", (updated_since,)
+        return stream_query(
+            f"""SELECT id, user_id, status, CAST(total_amount AS DOUBLE), payment_method,
+                       item_count, shipping_address, created_at, updated_at
+                FROM orders
+                {where}
+                ORDER BY {order}""",
+            params, chunk_size
+        )
@@ -2,20 +2,65 @@
 models/product.py
 ─────────────────
 Product model — OOP representation with DB operations and pagination.
+
+Reads select only the columns behind the requested fields (FIELDS,
+utils/fields.py); the categories join is skipped unless category_name
+is asked for.
 """
 
-from utils.db import execute_query
+from utils import adb
+from utils.db import execute_query, stream_query
 from config import config
+from utils.fields import select_list, project
+from utils.tracing import traced
+
+
+def _price(value) -> float:
+    return float(value) if value else 0.0
+
+
+def _text(value):
+    return str(value) if value else None
 
 
 class Product:
     """Represents a product in the catalogue."""
 
+    # Whitelist of sortable columns for get_all() (prevents SQL injection)
+    ALLOWED_SORT = ("created_at", "price", "name", "stock")
+
+    # Columns of stream_export() rows, in order
+    EXPORT_COLUMNS = ("id", "sku", "name", "description", "price", "stock", "category_id",
+                      "category_name", "image_url", "is_active", "created_at", "updated_at")
+
+    # Columns written by upsert_many() (bulk import), sku first
+    IMPORT_COLUMNS = ("sku", "name", "description", "price", "stock", "category_id", "image_url")
+
+    # fields= name → (columns it needs, value from a row)
+    FIELDS = {
+        "id":            (("p.id",),                     lambda r: r["id"]),
+        "sku":           (("p.sku",),                    lambda r: r["sku"]),
+        "name":          (("p.name",),                   lambda r: r["name"]),
+        "description":   (("p.description",),            lambda r: r["description"]),
+        "price":         (("p.price",),                  lambda r: _price(r["price"])),
+        "stock":         (("p.stock",),                  lambda r: r["stock"]),
+        "category_id":   (("p.category_id",),            lambda r: r["category_id"]),
+        "category_name": (("c.name AS category_name",),  lambda r: r.get("category_name")),
+        "image_url":     (("p.image_url",),              lambda r: r["image_url"]),
+        "is_active":     (("p.is_active",),              lambda r: r["is_active"]),
+        "in_stock":      (("p.stock",),                  lambda r: r["stock"] > 0),
+        "created_at":    (("p.created_at",),             lambda r: _text(r["created_at"])),
+    }
+
+    __slots__ = ("id", "sku", "name", "description", "price", "stock", "category_id",
+                 "category_name", "image_url", "is_active", "created_at", "updated_at")
+
     def __init__(self, id=None, name=None, description=None,
                  price=None, stock=None, category_id=None,
                  image_url=None, is_active=True, created_at=None,
-                 updated_at=None, category_name=None):
+                 updated_at=None, category_name=None, sku=None):
         self.id            = id
+        self.sku           = sku
         self.name          = name
         self.description   = description
         self.price         = float(price) if price else 0.0
@@ -27,9 +72,12 @@ class Product:
         self.created_at    = created_at
         self.updated_at    = updated_at
 
-    def to_dict(self) -> dict:
+    def to_dict(self, fields: tuple = None) -> dict:
+        if fields:
+            return project({k: getattr(self, k) for k in self.__slots__}, fields, self.FIELDS)
         return {
             "id":            self.id,
+            "sku":           self.sku,
             "name":          self.name,
             "description":   self.description,
             "price":         self.price,
@@ -42,31 +90,114 @@ class Product:
             "created_at":    str(self.created_at) if self.created_at else None,
         }
 
+    @classmethod
+    def _select(cls, fields: tuple) -> str:
+        """SELECT … FROM for the fields, joining categories only when needed."""
+        columns = select_list(fields, cls.FIELDS)
+        join    = ("LEFT JOIN categories c ON p.category_id = c.id"
+                   if "category_name" in columns else "")
+        return f"SELECT {columns} FROM products p {join}"
+
+    @staticmethod
+    def row_to_dict(r: dict, fields: tuple = None) -> dict:
+        """Map a products row straight to the to_dict() shape (no Product instance)."""
+        if fields:
+            return project(r, fields, Product.FIELDS)
+        price      = r["price"]
+        created_at = r["created_at"]
+        return {
+            "id":            r["id"],
+            "sku":           r["sku"],
+            "name":          r["name"],
+            "description":   r["description"],
+            "price":         float(price) if price else 0.0,
+            "stock":         r["stock"],
+            "category_id":   r["category_id"],
+            "category_name": r.get("category_name"),
+            "image_url":     r["image_url"],
+            "is_active":     r["is_active"],
+            "in_stock":      r["stock"] > 0,
+            "created_at":    str(created_at) if created_at else None,
+        }
+
     # ── CRUD ───────────────────────────────────────────────────
 
     @classmethod
-    def find_by_id(cls, product_id: int):
-        row = execute_query(
-            """SELECT p.*, c.name AS category_name
-               FROM products p
-               LEFT JOIN categories c ON p.category_id = c.id
-               WHERE p.id = %s AND p.is_active = TRUE""",
-            (product_id,), fetch="one"
-        )
+    @traced()
+    def find_by_id(cls, product_id: int, fields: tuple = None, active_only: bool = True):
+        row = execute_query(*cls._by_id(product_id, fields, active_only), fetch="one")
         return cls(**row) if row else None
 
     @classmethod
+    @traced()
+    async def find_by_id_async(cls, product_id: int, fields: tuple = None):
+        row = await adb.execute_query(*cls._by_id(product_id, fields), fetch="one")
+        return cls(**row) if row else None
+
+    @classmethod
+    def _by_id(cls, product_id: int, fields: tuple, active_only: bool = True) -> tuple:
+        active = " AND p.is_active = TRUE" if active_only else ""
+        return (f"{cls._select(fields)} WHERE p.id = %s{active}", (product_id,))
+
+    @classmethod
+    @traced()
+    def find_many(cls, product_ids: list, fields: tuple = None) -> list:
+        """Active products among `product_ids` (one IN query, any order)."""
+        if not product_ids:
+            return []
+        rows = execute_query(*cls._by_ids(product_ids, fields), fetch="all")
+        return [cls.row_to_dict(r, fields) for r in (rows or [])]
+
+    @classmethod
+    @traced()
+    async def find_many_async(cls, product_ids: list, fields: tuple = None) -> list:
+        if not product_ids:
+            return []
+        rows = await adb.execute_query(*cls._by_ids(product_ids, fields), fetch="all")
+        return [cls.row_to_dict(r, fields) for r in (rows or [])]
+
+    @classmethod
+    def _by_ids(cls, product_ids: list, fields: tuple) -> tuple:
+        placeholders = ", ".join(["%s"] * len(product_ids))
+        return (f"{cls._select(fields)} WHERE p.id IN ({placeholders}) AND p.is_active = TRUE",
+                tuple(product_ids))
+
+    @classmethod
+    @traced()
     def get_all(cls, page: int = 1, per_page: int = None,
                 category_id: int = None, search: str = None,
                 min_price: float = None, max_price: float = None,
-                sort_by: str = "created_at", order: str = "DESC"):
-        """Paginated product listing with filters."""
+                sort_by: str = "created_at", order: str = "DESC", fields: tuple = None):
+        """Paginated product listing with filters (`fields`: sparse fieldset)."""
+        count, listing, page, per_page = cls._listing(
+            page, per_page, category_id, search, min_price, max_price, sort_by, order, fields
+        )
+        count_row = execute_query(*count, fetch="one")
+        rows      = execute_query(*listing, fetch="all")
+        return cls._page(count_row, rows, page, per_page, fields)
+
+    @classmethod
+    @traced()
+    async def get_all_async(cls, page: int = 1, per_page: int = None,
+                            category_id: int = None, search: str = None,
+                            min_price: float = None, max_price: float = None,
+                            sort_by: str = "created_at", order: str = "DESC", fields: tuple = None):
+        """get_all(), with the count and the page read concurrently."""
+        count, listing, page, per_page = cls._listing(
+            page, per_page, category_id, search, min_price, max_price, sort_by, order, fields
+        )
+        count_row, rows = await adb.gather(adb.execute_query(*count, fetch="one"),
+                                           adb.execute_query(*listing, fetch="all"))
+        return cls._page(count_row, rows, page, per_page, fields)
+
+    @classmethod
+    def _listing(cls, page, per_page, category_id, search, min_price, max_price,
+                 sort_by, order, fields) -> tuple:
+        """(count (query, params), page (query, params), page, per_page) for get_all()."""
         per_page = per_page or config.DEFAULT_PAGE_SIZE
         offset   = (page - 1) * per_page
 
-        # Whitelist sortable columns to prevent SQL injection
-        ALLOWED_SORT = {"price", "name", "created_at", "stock"}
-        if sort_by not in ALLOWED_SORT:
+        if sort_by not in cls.ALLOWED_SORT:
             sort_by = "created_at"
         order = "ASC" if order.upper() == "ASC" else "DESC"
 
@@ -88,25 +219,17 @@ class Product:
 
         where = "WHERE " + " AND ".join(conditions)
 
-        # Count
-        count_row = execute_query(
-            f"SELECT COUNT(*) AS total FROM products p {where}",
-            tuple(params), fetch="one"
-        )
-        total = count_row["total"] if count_row else 0
-
-        # Fetch page
-        rows = execute_query(
-            f"""SELECT p.*, c.name AS category_name
-                FROM products p
-                LEFT JOIN categories c ON p.category_id = c.id
+        count   = (f"SELECT COUNT(*) AS total FROM products p {where}", tuple(params))
+        listing = (f"""{cls._select(fields)}
                 {where}
                 ORDER BY p.{sort_by} {order}
-                LIMIT %s OFFSET %s""",
-            tuple(params) + (per_page, offset), fetch="all"
-        )
+                LIMIT %s OFFSET %s""", tuple(params) + (per_page, offset))
+        return count, listing, page, per_page
 
-        products = [cls(**r).to_dict() for r in (rows or [])]
+    @classmethod
+    def _page(cls, count_row, rows, page: int, per_page: int, fields: tuple) -> tuple:
+        total    = count_row["total"] if count_row else 0
+        products = [cls.row_to_dict(r, fields) for r in (rows or [])]
 
         pagination = {
             "total":    total,
@@ -117,17 +240,35 @@ class Product:
         return products, pagination
 
     @classmethod
-    def create(cls, name, description, price, stock, category_id, image_url=None):
+    @traced()
+    def create(cls, name, description, price, stock, category_id, image_url=None, sku=None):
         result = execute_query(
-            """INSERT INTO products (name, description, price, stock, category_id, image_url)
-               VALUES (%s, %s, %s, %s, %s, %s)""",
-            (name, description, price, stock, category_id, image_url)
+            """INSERT INTO products (sku, name, description, price, stock, category_id, image_url)
+               VALUES (%s, %s, %s, %s, %s, %s, %s)""",
+            (sku, name, description, price, stock, category_id, image_url)
         )
         return result["lastrowid"]
 
     @classmethod
+    @traced()
+    def upsert_many(cls, rows: list):
+        """
+        Write rows — tuples in IMPORT_COLUMNS order — with one multi-row
+        INSERT (autocommitted on its own). A row whose sku already exists
+        updates that product instead; rows without a sku are always new.
+        """
+        columns = ", ".join(cls.IMPORT_COLUMNS)
+        values  = ", ".join([f"({', '.join(['%s'] * len(cls.IMPORT_COLUMNS))})"] * len(rows))
+        updates = ", ".join(f"{c} = VALUES({c})" for c in cls.IMPORT_COLUMNS[1:])
+        execute_query(
+            f"INSERT INTO products ({columns}) VALUES {values} ON DUPLICATE KEY UPDATE {updates}",
+            tuple(v for row in rows for v in row)
+        )
+
+    @classmethod
+    @traced()
     def update(cls, product_id, **fields):
-        allowed = {"name", "description", "price", "stock", "category_id",
+        allowed = {"sku", "name", "description", "price", "stock", "category_id",
                    "image_url", "is_active"}
         updates = {k: v for k, v in fields.items() if k in allowed}
         if not updates:
@@ -140,12 +281,120 @@ class Product:
         return True
 
     @classmethod
+    @traced()
     def decrement_stock(cls, product_id: int, qty: int):
         execute_query(
             "UPDATE products SET stock = stock - %s WHERE id = %s AND stock >= %s",
             (qty, product_id, qty)
         )
 
+    @staticmethod
+    def lock_stock(tx, skus: list) -> dict:
+        """{sku: (id, stock)} for the given SKUs (any active state), row-locked until `tx` ends."""
+        placeholders = ", ".join(["%s"] * len(skus))
+        ids = tx.execute(
+            f"SELECT id FROM products WHERE sku IN ({placeholders})",
+            tuple(skus), fetch="all"
+        )
+        if not ids:
+            return {}
+        # Locked through PRIMARY in id order, like checkout: a lock taken while
+        # scanning the sku index would come in sku order and could deadlock with it
+        rows   = tx.execute(*Product._lock_by_id([r["id"] for r in ids], active_only=False),
+                            fetch="all")
+        wanted = set(skus)
+        return {r["sku"]: (r["id"], r["stock"]) for r in (rows or []) if r["sku"] in wanted}
+
+    @staticmethod
+    def lock_stock_by_id(tx, product_ids: list) -> dict:
+        """{id: stock} for the given active products, row-locked until `tx` ends."""
+        rows = tx.execute(*Product._lock_by_id(product_ids), fetch="all")
+        return {r["id"]: r["stock"] for r in (rows or [])}
+
+    @staticmethod
+    async def lock_stock_by_id_async(tx, product_ids: list) -> dict:
+        rows = await tx.execute(*Product._lock_by_id(product_ids), fetch="all")
+        return {r["id"]: r["stock"] for r in (rows or [])}
+
+    @staticmethod
+    def _lock_by_id(product_ids: list, active_only: bool = True) -> tuple:
+        placeholders = ", ".join(["%s"] * len(product_ids))
+        active       = " AND is_active = TRUE" if active_only else ""
+        return (f"""SELECT id, sku, stock FROM products
+                WHERE id IN ({placeholders}){active}
+                ORDER BY id FOR UPDATE""", tuple(product_ids))
+
+    @staticmethod
+    def set_stock(tx, stock_by_id: dict):
+        """Set the stock of several products with one UPDATE."""
+        tx.execute(*Product._set_stock(stock_by_id))
+
+    @staticmethod
+    async def set_stock_async(tx, stock_by_id: dict):
+        await tx.execute(*Product._set_stock(stock_by_id))
+
+    @staticmethod
+    def _set_stock(stock_by_id: dict) -> tuple:
+        cases = " ".join(["WHEN %s THEN %s"] * len(stock_by_id))
+        ids   = ", ".join(["%s"] * len(stock_by_id))
+        return (f"UPDATE products SET stock = CASE id {cases} END WHERE id IN ({ids})",
+                tuple(v for pair in stock_by_id.items() for v in pair) + tuple(stock_by_id))
+
+    @classmethod
+    @traced()
+    def names_by_id(cls, product_ids: list) -> dict:
+        """{id: name} for the given products (any active state)."""
+        if not product_ids:
+            return {}
+        placeholders = ", ".join(["%s"] * len(product_ids))
+        rows = execute_query(
+            f"SELECT id, name FROM products WHERE id IN ({placeholders})",
+            tuple(product_ids), fetch="all"
+        )
+        return {r["id"]: r["name"] for r in (rows or [])}
+
+    @staticmethod
+    def stream_cards(chunk_size: int = 50_000):
+        """(id, name, price, image_url) of every active product, as tuple chunks."""
+        return stream_query(
+            """SELECT id, name, CAST(price AS DOUBLE), image_url
+               FROM products WHERE is_active = TRUE""",
+            (), chunk_size
+        )
+
+    @staticmethod
+    def cards_by_sku(skus: list) -> list:
+        """[{id, name, price, image_url}] of the active products with the given SKUs."""
+        placeholders = ", ".join(["%s"] * len(skus))
+        return execute_query(
+            f"""SELECT id, name, CAST(price AS DOUBLE) AS price, image_url
+                FROM products WHERE sku IN ({placeholders}) AND is_active = TRUE""",
+            tuple(skus), fetch="all"
+        ) or []
+
+    @staticmethod
+    def stream_export(updated_since=None, chunk_size: int = 10_000):
+        """
+        Every product, inactive ones included, as tuple chunks in
+        EXPORT_COLUMNS order — by id, or by (updated_at, id) when limited
+        to rows changed at or after `updated_since`.
+        """
+        where, order, params = "", "p.id", ()
+        if updated_since is not None:
+            where, order, params = "WHERE p.updated_at >= %s", "p.updated_at, p.id", (updated_since,)
+        return stream_query(
+            f"""SELECT p.id, p.sku, p.name, p.description, CAST(p.price AS DOUBLE), p.stock,
+                       p.category_id, c.name, p.image_url, p.is_active, p.created_at, p.updated_at
+                FROM products p
+                LEFT JOIN categories c ON p.category_id = c.id
+                {where}
+                ORDER BY {order}""",
+            params, chunk_size
+        )
+
     @classmethod
+    @traced()
     def get_categories(cls):
-        return execute_query("SELECT * FROM categories ORDER BY name", fetch="all")
+        return execute_query(
+            "SELECT id, name, description, created_at FROM categories ORDER BY name", fetch="all"
+        )
@@ -0,0 +1,204 @@
+"""
+models/sales.py
+───────────────
+Sales rollups — pre-aggregated revenue / orders / units for analytics.
+
+  sales_daily           day × status                (order-level totals)
+  sales_daily_category  day × category × status     (category_id 0 = uncategorized)
+
+Rows are keyed by the day the order was placed. Writing them inside the
+order's own transaction would hold the lock on the day's 'pending' row —
+which every checkout of the day updates — until the checkout commits.
+Instead Order.create_from_cart and Order.update_status only append to
+sales_rollup_queue (an insert, no shared row), and apply_pending(),
+run in the background by OrderService.start(), folds the queue into
+the rollups a batch at a time: a new order is added under its status, a
+status change moves it from the old bucket to the new one, so a
+cancellation reverses its revenue out of every non-cancelled total.
+Categories come from order_items.category_id, the category at purchase
+time, so a reversal hits the same rows the order was added to.
+
+The rollups therefore trail the orders by up to SALES_ROLLUP_SECONDS.
+rebuild() recomputes both tables from orders / order_items.
+"""
+
+from config import config
+from utils.db import execute_query, transaction
+from utils.tracing import traced
+
+
+class SalesRollup:
+    """Queued maintenance and queries for the sales rollup tables."""
+
+    # sign × the order's figures, upserted into its (day, status) bucket
+    _ORDER_DELTA = """
+        INSERT INTO sales_daily (day, status, order_count, units, revenue)
+        SELECT DATE(o.created_at), %s, %s, %s * SUM(oi.quantity), %s * o.total_amount
+        FROM orders o
+        JOIN order_items oi ON oi.order_id = o.id
+        WHERE o.id IN ({ids})
+        GROUP BY o.id
+        ON DUPLICATE KEY UPDATE
+            order_count = order_count + VALUES(order_count),
+            units       = units       + VALUES(units),
+            revenue     = revenue     + VALUES(revenue)"""
+
+    _CATEGORY_DELTA = """
+        INSERT INTO sales_daily_category (day, category_id, status, order_count, units, revenue)
+        SELECT DATE(o.created_at), COALESCE(oi.category_id, 0), %s, %s * COUNT(DISTINCT o.id),
+               %s * SUM(oi.quantity), %s * SUM(oi.quantity * oi.unit_price)
+        FROM orders o
+        JOIN order_items oi ON oi.order_id = o.id
+        WHERE o.id IN ({ids})
+        GROUP BY DATE(o.created_at), COALESCE(oi.category_id, 0)
+        ON DUPLICATE KEY UPDATE
+            order_count = order_count + VALUES(order_count),
+            units       = units       + VALUES(units),
+            revenue     = revenue     + VALUES(revenue)"""
+
+    _REBUILD = (
+        "DELETE FROM sales_rollup_queue",
+        "DELETE FROM sales_daily",
+        "DELETE FROM sales_daily_category",
+        """INSERT INTO sales_daily (day, status, order_count, units, revenue)
+           SELECT DATE(o.created_at), o.status, COUNT(*), SUM(i.units), SUM(o.total_amount)
+           FROM orders o
+           JOIN (SELECT order_id, SUM(quantity) AS units
+                 FROM order_items GROUP BY order_id) i ON i.order_id = o.id
+           GROUP BY DATE(o.created_at), o.status""",
+        """INSERT INTO sales_daily_category (day, category_id, status, order_count, units, revenue)
+           SELECT DATE(o.created_at), COALESCE(oi.category_id, 0), o.status,
+                  COUNT(DISTINCT o.id), SUM(oi.quantity), SUM(oi.quantity * oi.unit_price)
+           FROM orders o
+           JOIN order_items oi ON oi.order_id = o.id
+           GROUP BY DATE(o.created_at), COALESCE(oi.category_id, 0), o.status""",
+    )
+
+    # ── Queueing (inside the order's transaction) ──────────────
+
+    @staticmethod
+    @traced()
+    def record(tx, order_id: int, status: str):
+        """Queue a new order for its `status` bucket."""
+        SalesRollup._queue(tx, [order_id], None, status)
+
+    @staticmethod
+    @traced()
+    async def record_async(tx, order_id: int, status: str):
+        """record() inside a utils.adb transaction."""
+        await tx.execute(*SalesRollup._queue_insert([order_id], None, status))
+
+    @staticmethod
+    @traced()
+    def move(tx, order_id: int, old_status: str, new_status: str):
+        """Queue a status transition: out of the old bucket, into the new one."""
+        SalesRollup._queue(tx, [order_id], old_status, new_status)
+
+    @staticmethod
+    @traced()
+    def move_many(tx, order_ids: list, old_status: str, new_status: str):
+        """move() for several orders sharing the same old and new status, one INSERT."""
+        SalesRollup._queue(tx, order_ids, old_status, new_status)
+
+    @staticmethod
+    def _queue(tx, order_ids: list, old_status, new_status: str):
+        tx.execute(*SalesRollup._queue_insert(order_ids, old_status, new_status))
+
+    @staticmethod
+    def _queue_insert(order_ids: list, old_status, new_status: str) -> tuple:
+        return (f"""INSERT INTO sales_rollup_queue (order_id, old_status, new_status)
+                VALUES {", ".join(["(%s, %s, %s)"] * len(order_ids))}""",
+                tuple(v for order_id in order_ids for v in (order_id, old_status, new_status)))
+
+    # ── Applying the queue ─────────────────────────────────────
+
+    @staticmethod
+    def _apply(tx, order_ids: list, status: str, sign: int):
+        """Add (sign=1) or remove (sign=-1) distinct orders from their `status` bucket."""
+        ids    = ", ".join(["%s"] * len(order_ids))
+        params = (status, sign, sign, sign, *order_ids)
+        tx.execute(SalesRollup._ORDER_DELTA.format(ids=ids),    params)
+        tx.execute(SalesRollup._CATEGORY_DELTA.format(ids=ids), params)
+
+    @staticmethod
+    @traced()
+    def apply_pending(limit: int = None) -> int:
+        """
+        Fold up to `limit` queued changes, oldest first, into the rollups
+        and delete them, in one transaction. The queue rows are locked
+        while that runs, so concurrent callers (one per worker) never
+        apply a change twice. Returns the number applied.
+        """
+        with transaction() as tx:
+            rows = tx.execute(
+                """SELECT id, order_id, old_status, new_status FROM sales_rollup_queue
+                   ORDER BY id LIMIT %s FOR UPDATE""",
+                (limit or config.SALES_ROLLUP_BATCH,), fetch="all"
+            ) or []
+            if not rows:
+                return 0
+
+            # One pass per (old, new) pair; an order repeated within a pair
+            # waits for the next pass, since IN (…) would count it once
+            pending = [(r["old_status"], r["new_status"], r["order_id"]) for r in rows]
+            while pending:
+                moves, later = {}, []   # (old, new) → {order_id: None}
+                for old, new, order_id in pending:
+                    ids = moves.setdefault((old, new), {})
+                    if order_id in ids:
+                        later.append((old, new, order_id))
+                    else:
+                        ids[order_id] = None
+                for (old, new), ids in moves.items():
+                    if old is not None:
+                        SalesRollup._apply(tx, list(ids), old, -1)
+                    SalesRollup._apply(tx, list(ids), new, 1)
+                pending = later
+
+            tx.execute(
+                f"DELETE FROM sales_rollup_queue WHERE id IN ({', '.join(['%s'] * len(rows))})",
+                tuple(r["id"] for r in rows)
+            )
+        return len(rows)
+
+    @staticmethod
+    @traced()
+    def rebuild():
+        """
+        Recompute both rollup tables from scratch (backfill / repair). The
+        queue is emptied in the same transaction: the recomputed totals
+        already reflect every order's current status.
+        """
+        with transaction() as tx:
+            for query in SalesRollup._REBUILD:
+                tx.execute(query)
+
+    # ── Queries (rollups only) ─────────────────────────────────
+
+    @staticmethod
+    @traced()
+    def daily(start, end) -> list:
+        return execute_query(
+            """SELECT day, status, order_count, units, revenue
+               FROM sales_daily
+               WHERE day BETWEEN %s AND %s
+               ORDER BY day""",
+            (start, end), fetch="all"
+        ) or []
+
+    @staticmethod
+    @traced()
+    def by_category(start, end) -> list:
+        """Non-cancelled totals per category over the range, best sellers first."""
+        return execute_query(
+            """SELECT s.category_id, c.name AS category_name,
+                      SUM(s.order_count) AS order_count,
+                      SUM(s.units)       AS units,
+                      SUM(s.revenue)     AS revenue
+               FROM sales_daily_category s
+               LEFT JOIN categories c ON c.id = s.category_id
+               WHERE s.day BETWEEN %s AND %s AND s.status <> 'cancelled'
+               GROUP BY s.category_id, c.name
+               ORDER BY revenue DESC""",
+            (start, end), fetch="all"
+        ) or []
@@ -0,0 +1,80 @@
+"""
+models/token.py
+───────────────
+Token revocation log — one row per revoked token (jti) or per
+"every token of this user issued before not_before" cutoff.
+
+Rows are only appended; workers pick up each other's revocations by
+reading ids above the last one they have seen. A row is moot once
+expires_at (epoch seconds) has passed, because every token it could
+match has expired by then.
+"""
+
+from utils.db import execute_query
+from utils.tracing import traced
+
+
+class TokenRevocation:
+    """DB operations on the token_revocations table."""
+
+    @staticmethod
+    @traced()
+    def revoke(jti: str, user_id: int, expires_at: int) -> bool:
+        """Revoke one token. False if it was already revoked (e.g. a reused refresh token)."""
+        result = execute_query(
+            """INSERT IGNORE INTO token_revocations (jti, user_id, expires_at)
+               VALUES (%s, %s, %s)""",
+            (jti, user_id, expires_at)
+        )
+        return result["affected_rows"] == 1
+
+    @staticmethod
+    @traced()
+    def revoke_all(user_id: int, not_before: int, expires_at: int):
+        """Revoke every token of the user issued before `not_before`."""
+        execute_query(
+            """INSERT INTO token_revocations (user_id, not_before, expires_at)
+               VALUES (%s, %s, %s)""",
+            (user_id, not_before, expires_at)
+        )
+
+    @staticmethod
+    @traced()
+    def not_before(user_id: int) -> int:
+        """Latest cutoff for the user (0 = none)."""
+        row = execute_query(
+            """SELECT MAX(not_before) AS not_before
+               FROM token_revocations
+               WHERE user_id = %s AND not_before IS NOT NULL""",
+            (user_id,), fetch="one"
+        )
+        return int(row["not_before"] or 0) if row else 0
+
+    @staticmethod
+    @traced()
+    def clock() -> int:
+        """The database's epoch second — the clock created_at is stamped with."""
+        row = execute_query("SELECT UNIX_TIMESTAMP() AS now", fetch="one")
+        return int(row["now"])
+
+    @staticmethod
+    @traced()
+    def since(last_id: int, now: int) -> list:
+        """Unexpired revocations with id > last_id, oldest first (created: epoch s)."""
+        return execute_query(
+            """SELECT id, jti, user_id, not_before, expires_at,
+                      UNIX_TIMESTAMP(created_at) AS created
+               FROM token_revocations
+               WHERE id > %s AND expires_at > %s
+               ORDER BY id""",
+            (last_id, now), fetch="all"
+        ) or []
+
+    @staticmethod
+    @traced()
+    def purge(now: int) -> int:
+        """Delete rows that can no longer match a live token."""
+        result = execute_query(
+            "DELETE FROM token_revocations WHERE expires_at <= %s", (now,)
+        )
+        return result["affected_rows"]
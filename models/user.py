@@ -2,15 +2,29 @@
 models/user.py
 ──────────────
 User model — OOP representation with class-level DB operations.
+
+Reads name their columns; the bcrypt hash is only selected when a
+password is about to be verified (with_password=True). cached() serves
+the hash-free user from a per-process TTL cache, invalidated by
+update_profile / change_password (other workers: after USER_CACHE_TTL).
 """
 
 import bcrypt
+from config import config
+from utils.cache import TTLCache
 from utils.db import execute_query
+from utils.tracing import traced
 
 
 class User:
     """Represents a user account in the system."""
 
+    __slots__ = ("id", "name", "email", "password", "role", "created_at", "updated_at")
+
+    COLUMNS = "id, name, email, role, created_at, updated_at"   # everything but the hash
+
+    _cache = TTLCache(config.USER_CACHE_SIZE, config.USER_CACHE_TTL)
+
     def __init__(self, id=None, name=None, email=None,
                  password=None, role="customer",
                  created_at=None, updated_at=None):
@@ -37,30 +51,56 @@ class User:
     # ── Password helpers ───────────────────────────────────────
 
     @staticmethod
+    @traced()
     def hash_password(plain: str) -> str:
         return bcrypt.hashpw(plain.encode(), bcrypt.gensalt()).decode()
 
     @staticmethod
+    @traced()
     def verify_password(plain: str, hashed: str) -> bool:
         return bcrypt.checkpw(plain.encode(), hashed.encode())
 
     # ── DB operations ──────────────────────────────────────────
 
     @classmethod
-    def find_by_email(cls, email: str):
+    def _columns(cls, with_password: bool) -> str:
+        return cls.COLUMNS + ", password" if with_password else cls.COLUMNS
+
+    @classmethod
+    @traced()
+    def find_by_email(cls, email: str, with_password: bool = False):
         row = execute_query(
-            "SELECT * FROM users WHERE email = %s", (email,), fetch="one"
+            f"SELECT {cls._columns(with_password)} FROM users WHERE email = %s",
+            (email,), fetch="one"
         )
         return cls(**row) if row else None
 
     @classmethod
-    def find_by_id(cls, user_id: int):
+    @traced()
+    def find_by_id(cls, user_id: int, with_password: bool = False):
         row = execute_query(
-            "SELECT * FROM users WHERE id = %s", (user_id,), fetch="one"
+            f"SELECT {cls._columns(with_password)} FROM users WHERE id = %s",
+            (user_id,), fetch="one"
         )
         return cls(**row) if row else None
 
     @classmethod
+    @traced()
+    def cached(cls, user_id: int):
+        """find_by_id (no hash) through the user cache. Treat the result as read-only."""
+        user = cls._cache.get(user_id)
+        if user is None:
+            user = cls.find_by_id(user_id)
+            if user:
+                cls._cache.set(user_id, user)
+        return user
+
+    @classmethod
+    def invalidate(cls, user_id: int):
+        cls._cache.pop(user_id)
+
+    @classmethod
+    @traced()
     def create(cls, name: str, email: str, plain_password: str, role: str = "customer"):
         hashed = cls.hash_password(plain_password)
         result = execute_query(
@@ -70,12 +110,14 @@ class User:
         return result["lastrowid"]
 
     @classmethod
+    @traced()
     def email_exists(cls, email: str) -> bool:
         row = execute_query(
             "SELECT id FROM users WHERE email = %s", (email,), fetch="one"
         )
         return row is not None
 
+    @traced()
     def update_profile(self, name: str = None):
         if name:
             self.name = name
@@ -83,10 +125,13 @@ class User:
                 "UPDATE users SET name = %s WHERE id = %s",
                 (self.name, self.id)
             )
+            User.invalidate(self.id)
 
+    @traced()
     def change_password(self, new_plain: str):
         self.password = self.hash_password(new_plain)
         execute_query(
             "UPDATE users SET password = %s WHERE id = %s",
             (self.password, self.id)
         )
+        User.invalidate(self.id)
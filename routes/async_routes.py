@@ -0,0 +1,158 @@
+"""
+routes/async_routes.py
+──────────────────────
+Coroutine versions of the catalogue, cart and checkout endpoints, on
+utils.adb (aiomysql) instead of utils.db:
+
+  GET  /products        – list (count and page read concurrently) / ?ids= multi-get
+  GET  /products/<id>   – single product
+  GET  /cart            – the user's cart
+  POST /cart            – add to cart
+  POST /orders          – place order (stock pre-checked concurrently)
+  GET  /orders/<id>     – single order (row and items read concurrently)
+
+init_async_routes(app) swaps them in under the same endpoints, so URL
+rules, request hooks, timeouts and metrics labels are unchanged; every
+other endpoint stays synchronous. They run on utils.adb's shared loop
+(see init_async) — Flask's hooks still run on the worker thread, which
+waits while the view awaits the database.
+
+Enabled by ASYNC_ROUTES / create_app(async_routes=True); asgi.py turns
+it on. Parameters, responses and error mapping match the sync views.
+"""
+
+from flask import request
+from services.product_service import ProductService
+from services.cart_service    import CartService
+from services.order_service   import OrderService
+from utils                    import adb
+from utils.jwt_handler        import token_required
+from utils.fields             import FieldsError
+from utils.response           import success, error
+
+
+# ── Products ───────────────────────────────────────────────────
+
+async def get_products():
+    """Public — paginated product catalogue with optional filters, or ?ids= multi-get."""
+    try:
+        if request.args.get("ids") is not None:
+            products, missing = await ProductService.get_products_by_ids_async(
+                request.args["ids"], request.args.get("fields")
+            )
+            return success("Products fetched", products, meta={"missing": missing})
+
+        page        = int(request.args.get("page", 1))
+        per_page    = int(request.args.get("per_page", 10))
+        category_id = request.args.get("category_id", type=int)
+        search      = request.args.get("search", "")
+        min_price   = request.args.get("min_price", type=float)
+        max_price   = request.args.get("max_price", type=float)
+        sort_by     = request.args.get("sort_by", "created_at")
+        order       = request.args.get("order", "DESC")
+        fields      = request.args.get("fields")
+
+        products, pagination = await ProductService.get_products_async(
+            page=page, per_page=per_page,
+            category_id=category_id, search=search or None,
+            min_price=min_price, max_price=max_price,
+            sort_by=sort_by, order=order, fields=fields
+        )
+        return success("Products fetched", products, pagination=pagination)
+    except ValueError as e:
+        return error(str(e), 400)
+    except Exception as e:
+        return error(f"Failed to fetch products: {e}", 500)
+
+
+async def get_product(product_id):
+    """Public — single product details."""
+    try:
+        product = await ProductService.get_product_async(product_id, request.args.get("fields"))
+        return success("Product fetched", product)
+    except FieldsError as e:
+        return error(str(e), 400)
+    except ValueError as e:
+        return error(str(e), 404)
+    except Exception as e:
+        return error(str(e), 500)
+
+
+# ── Cart ───────────────────────────────────────────────────────
+
+@token_required
+async def get_cart(current_user):
+    """Get the logged-in user's cart."""
+    try:
+        cart = await CartService.get_cart_async(current_user["id"])
+        return success("Cart fetched", cart)
+    except Exception as e:
+        return error(str(e), 500)
+
+
+@token_required
+async def add_to_cart(current_user):
+    """Add a product to cart (or increment quantity)."""
+    data = request.get_json() or {}
+    try:
+        cart = await CartService.add_to_cart_async(
+            user_id    = current_user["id"],
+            product_id = int(data.get("product_id", 0)),
+            quantity   = int(data.get("quantity", 1))
+        )
+        return success("Item added to cart", cart, status=201)
+    except ValueError as e:
+        return error(str(e), 400)
+    except Exception as e:
+        return error(str(e), 500)
+
+
+# ── Orders ─────────────────────────────────────────────────────
+
+@token_required
+async def place_order(current_user):
+    """Place an order from the current cart."""
+    data = request.get_json() or {}
+    try:
+        order = await OrderService.place_order_async(
+            user_id          = current_user["id"],
+            shipping_address = data.get("shipping_address", ""),
+            payment_method   = data.get("payment_method", "COD")
+        )
+        return success("Order placed successfully", order, status=201)
+    except ValueError as e:
+        return error(str(e), 400)
+    except Exception as e:
+        return error(f"Failed to place order: {e}", 500)
+
+
+@token_required
+async def get_order(current_user, order_id):
+    """Get details of a specific order (must belong to user)."""
+    try:
+        order = await OrderService.get_order_async(order_id, current_user["id"],
+                                                   request.args.get("fields"))
+        return success("Order fetched", order)
+    except FieldsError as e:
+        return error(str(e), 400)
+    except ValueError as e:
+        return error(str(e), 404)
+    except Exception as e:
+        return error(str(e), 500)
+
+
+# endpoint → coroutine view
+ASYNC_VIEWS = {
+    "products.get_products": get_products,
+    "products.get_product":  get_product,
+    "cart.get_cart":         get_cart,
+    "cart.add_to_cart":      add_to_cart,
+    "orders.place_order":    place_order,
+    "orders.get_order":      get_order,
+}
+
+
+def init_async_routes(app):
+    """Serve ASYNC_VIEWS' endpoints with the coroutine views. Call once from create_app()."""
+    adb.init_async(app)
+    app.view_functions.update(ASYNC_VIEWS)
@@ -5,6 +5,7 @@ Authentication endpoints:
   POST /auth/register
   POST /auth/login
   POST /auth/refresh
+  POST /auth/logout
   GET  /auth/profile
   PUT  /auth/profile
   PUT  /auth/change-password
@@ -12,7 +13,7 @@ Authentication endpoints:
 
 from flask import Blueprint, request
 from services.auth_service  import AuthService
-from utils.jwt_handler      import token_required
+from utils.jwt_handler      import token_required, current_token
 from utils.response         import success, error
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/auth")
@@ -53,13 +54,27 @@ def login():
 
 @auth_bp.route("/refresh", methods=["POST"])
 def refresh():
-    """Get a new access token using a refresh token."""
+    """Exchange a refresh token for a new access + refresh token pair."""
     data = request.get_json() or {}
     try:
         result = AuthService.refresh_tokens(data.get("refresh_token", ""))
         return success("Token refreshed", result)
     except ValueError as e:
         return error(str(e), 401)
+    except Exception as e:
+        return error(f"Token refresh failed: {e}", 500)
+
+
+@auth_bp.route("/logout", methods=["POST"])
+@token_required
+def logout(current_user):
+    """Revoke the access token (and the refresh token, if sent)."""
+    data = request.get_json(silent=True) or {}
+    try:
+        AuthService.logout(current_token(), data.get("refresh_token"))
+        return success("Logged out")
+    except Exception as e:
+        return error(f"Logout failed: {e}", 500)
 
 
 @auth_bp.route("/profile", methods=["GET"])
@@ -91,11 +106,11 @@ def change_password(current_user):
     """Change password."""
     data = request.get_json() or {}
     try:
-        AuthService.change_password(
+        tokens = AuthService.change_password(
             user_id          = current_user["id"],
             current_password = data.get("current_password", ""),
             new_password     = data.get("new_password", "")
         )
-        return success("Password changed successfully")
+        return success("Password changed successfully", tokens)
     except ValueError as e:
         return error(str(e), 400)
@@ -0,0 +1,103 @@
+"""
+routes/batch_routes.py
+──────────────────────
+Batch endpoint:
+  POST /batch – run several API calls in one HTTP round trip
+
+Body:
+  {"requests": [{"method": "GET",  "path": "/products/5"},
+                {"method": "POST", "path": "/cart/", "body": {"product_id": 5}}]}
+
+Response data: one {"status", "body"} per request, in order.
+
+Each sub-request is dispatched in-process through the regular
+blueprints, with the batch's Authorization header, so it gets the same
+auth, validation and rate limiting as a direct call. They run one after
+another on this worker thread; the connection pool hands the same idle
+connection back each time, so a batch uses one DB connection.
+
+Read-your-writes holds across the batch: once a sub-request writes, the
+reads of every later sub-request go to the primary, not a replica.
+"""
+
+import contextvars
+
+from flask import Blueprint, request, current_app
+from werkzeug.test import EnvironBuilder
+
+from config import config
+from utils import db
+from utils.response import success, error
+
+batch_bp = Blueprint("batch", __name__)
+
+METHODS = {"GET", "POST", "PUT", "DELETE"}
+
+# environ key marking an in-process sub-request; app.py's routing reset skips those
+SUB_REQUEST = "ecommerce.batch_sub_request"
+
+
+def _validate(specs) -> list:
+    if not isinstance(specs, list) or not specs:
+        raise ValueError("'requests' must be a non-empty list")
+    if len(specs) > config.BATCH_MAX_REQUESTS:
+        raise ValueError(f"At most {config.BATCH_MAX_REQUESTS} requests per batch")
+    for i, spec in enumerate(specs):
+        if not isinstance(spec, dict):
+            raise ValueError(f"requests[{i}] must be an object")
+        method, path = str(spec.get("method", "GET")).upper(), spec.get("path")
+        if method not in METHODS:
+            raise ValueError(f"requests[{i}]: method must be one of {', '.join(sorted(METHODS))}")
+        if not isinstance(path, str) or not path.startswith("/"):
+            raise ValueError(f"requests[{i}]: path must start with '/'")
+        if path.split("?")[0].rstrip("/") == "/batch":
+            raise ValueError(f"requests[{i}]: batches cannot be nested")
+    return specs
+
+
+def _dispatch(app, spec: dict, auth: str) -> dict:
+    """Run one sub-request through the app; returns {"status", "body"}."""
+    path, _, query = spec["path"].partition("?")
+    environ = EnvironBuilder(
+        path=path, query_string=query,
+        method=str(spec.get("method", "GET")).upper(),
+        headers={"Authorization": auth} if auth else {},
+        json=spec.get("body"),
+        environ_base={"REMOTE_ADDR": request.remote_addr, SUB_REQUEST: True},
+    ).get_environ()
+
+    # A fresh app context (own `g`) per sub-request, so the outer
+    # request's hook state — metrics timer, rate-limit slot, JWT memo —
+    # is left alone.
+    with app.app_context(), app.request_context(environ):
+        try:
+            response = app.full_dispatch_request()
+        except Exception as e:
+            response = app.make_response(app.handle_exception(e))
+        body = response.get_json(silent=True)
+        return {"status": response.status_code,
+                "body":   body if body is not None else response.get_data(as_text=True)}
+
+
+@batch_bp.route("/batch", methods=["POST"])
+def batch():
+    """Execute sub-requests in order; each one succeeds or fails on its own."""
+    data = request.get_json(silent=True) or {}
+    try:
+        specs = _validate(data.get("requests"))
+    except ValueError as e:
+        return error(str(e), 400)
+
+    app  = current_app._get_current_object()
+    auth = request.headers.get("Authorization")
+    # Context variables (profiler records, DB routing, trace span) are
+    # copied, so a sub-request cannot clobber the outer request's. DB
+    # routing is the exception: a write sticks the rest of the batch to
+    # the primary, and each later copy starts from that.
+    responses = []
+    for spec in specs:
+        ctx = contextvars.copy_context()
+        responses.append(ctx.run(_dispatch, app, spec, auth))
+        if ctx.run(db.on_primary):
+            db.stick_to_primary()
+    return success("Batch executed", responses)
@@ -2,19 +2,27 @@
 routes/order_routes.py
 ──────────────────────
 Order endpoints:
-  POST /orders                    – place order from cart
-  GET  /orders                    – my orders
-  GET  /orders/<id>               – single order
-  PUT  /orders/<id>/cancel        – cancel order
-
-  GET  /orders/admin              – all orders [admin]
-  PUT  /orders/admin/<id>/status  – update status [admin]
+  POST /orders                     – place order from cart
+  GET  /orders                     – my orders (?fields=)
+  GET  /orders/summary             – my order totals
+  GET  /orders/<id>                – single order (?fields=)
+  PUT  /orders/<id>/cancel         – cancel order
+
+  GET  /orders/admin               – all orders (?status=&fields=) [admin]
+  GET  /orders/admin/stats         – sales analytics (?from=&to=) [admin]
+  GET  /orders/admin/reports/items – item report (?from=&to=&top=) [admin]
+  GET  /orders/admin/export        – streamed NDJSON / CSV dump (?format=&updated_since=) [admin]
+  PUT  /orders/admin/status        – bulk status update ({"orders": [{"id", "status"}]}) [admin]
+  PUT  /orders/admin/<id>/status   – update status [admin]
 """
 
-from flask import Blueprint, request
-from services.order_service import OrderService
-from utils.jwt_handler      import token_required, admin_required
-from utils.response         import success, error
+from flask import Blueprint, Response, request, stream_with_context
+from services.order_service  import OrderService
+from services.export_service import ExportService
+from services.report_service import ReportService
+from utils.fields             import FieldsError
+from utils.jwt_handler        import token_required, admin_required
+from utils.response           import success, error
 
 orders_bp = Blueprint("orders", __name__, url_prefix="/orders")
 
@@ -45,9 +53,22 @@ def get_my_orders(current_user):
     per_page = int(request.args.get("per_page", 10))
     try:
         orders, pagination = OrderService.get_user_orders(
-            current_user["id"], page, per_page
+            current_user["id"], page, per_page, request.args.get("fields")
         )
         return success("Orders fetched", orders, pagination=pagination)
+    except FieldsError as e:
+        return error(str(e), 400)
+    except Exception as e:
+        return error(str(e), 500)
+
+
+@orders_bp.route("/summary", methods=["GET"])
+@token_required
+def get_my_summary(current_user):
+    """Order count, counts by status and lifetime spend for the logged-in user."""
+    try:
+        summary = OrderService.get_order_summary(current_user["id"])
+        return success("Order summary fetched", summary)
     except Exception as e:
         return error(str(e), 500)
 
@@ -57,8 +78,10 @@ def get_my_orders(current_user):
 def get_order(current_user, order_id):
     """Get details of a specific order (must belong to user)."""
     try:
-        order = OrderService.get_order(order_id, current_user["id"])
+        order = OrderService.get_order(order_id, current_user["id"], request.args.get("fields"))
         return success("Order fetched", order)
+    except FieldsError as e:
+        return error(str(e), 400)
     except ValueError as e:
         return error(str(e), 404)
     except Exception as e:
@@ -88,8 +111,72 @@ def admin_get_orders(current_user):
     per_page = int(request.args.get("per_page", 10))
     status   = request.args.get("status")
     try:
-        orders, pagination = OrderService.get_all_orders(page, per_page, status)
+        orders, pagination = OrderService.get_all_orders(
+            page, per_page, status, request.args.get("fields")
+        )
         return success("All orders fetched", orders, pagination=pagination)
+    except FieldsError as e:
+        return error(str(e), 400)
+    except Exception as e:
+        return error(str(e), 500)
+
+
+@orders_bp.route("/admin/stats", methods=["GET"])
+@admin_required
+def admin_sales_stats(current_user):
+    """Admin — revenue, orders and units by day / status / category."""
+    try:
+        stats = OrderService.get_sales_stats(request.args.get("from"), request.args.get("to"))
+        return success("Sales stats fetched", stats)
+    except ValueError as e:
+        return error(str(e), 400)
+    except Exception as e:
+        return error(str(e), 500)
+
+
+@orders_bp.route("/admin/reports/items", methods=["GET"])
+@admin_required
+def admin_item_report(current_user):
+    """Admin — top sellers, revenue per category, basket size, price drift."""
+    try:
+        report = ReportService.item_report(
+            request.args.get("from"), request.args.get("to"),
+            top=int(request.args.get("top", 10))
+        )
+        return success("Item report generated", report)
+    except ValueError as e:
+        return error(str(e), 400)
+    except Exception as e:
+        return error(str(e), 500)
+
+
+@orders_bp.route("/admin/export", methods=["GET"])
+@admin_required
+def admin_export_orders(current_user):
+    """Admin — every order (or those changed since ?updated_since=), streamed."""
+    fmt = request.args.get("format", "ndjson")
+    try:
+        body, mimetype = ExportService.orders(fmt, request.args.get("updated_since"))
+    except ValueError as e:
+        return error(str(e), 400)
+    except Exception as e:
+        return error(str(e), 500)
+    return Response(stream_with_context(body), mimetype=mimetype,
+                    headers={"Content-Disposition": f'attachment; filename="orders.{fmt}"'})
+
+
+@orders_bp.route("/admin/status", methods=["PUT"])
+@admin_required
+def admin_bulk_update_status(current_user):
+    """Admin — move many orders along the fulfilment flow; one result per order."""
+    data = request.get_json() or {}
+    if not isinstance(data, dict):
+        return error("Request body must be a JSON object with an 'orders' list", 400)
+    try:
+        report = OrderService.bulk_update_status(data.get("orders"))
+        return success("Order statuses updated", report)
+    except ValueError as e:
+        return error(str(e), 400)
     except Exception as e:
         return error(str(e), 500)
 
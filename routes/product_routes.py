@@ -2,17 +2,26 @@
 routes/product_routes.py
 ────────────────────────
 Product endpoints:
-  GET    /products             – list with filters & pagination
-  GET    /products/<id>        – single product
-  GET    /products/categories  – all categories
-  POST   /products             – create  [admin]
-  PUT    /products/<id>        – update  [admin]
-  DELETE /products/<id>        – soft-delete [admin]
+  GET    /products              – list with filters & pagination (?fields=)
+  GET    /products?ids=3,1,2    – multi-get in the given order (?fields=)
+  GET    /products/<id>         – single product (?fields=)
+  GET    /products/<id>/related – frequently bought together
+  GET    /products/categories   – all categories
+  GET    /products/export       – streamed NDJSON / CSV dump (?format=&updated_since=) [admin]
+  POST   /products              – create  [admin]
+  POST   /products/bulk         – streamed NDJSON / CSV import, upsert by sku [admin]
+  POST   /products/stock-sync   – apply a warehouse stock delta file [admin]
+  PUT    /products/<id>         – update  [admin]
+  DELETE /products/<id>         – soft-delete [admin]
 """
 
-from flask import Blueprint, request
+from flask import Blueprint, Response, request, stream_with_context
 from services.product_service import ProductService
+from services.import_service  import ImportService
+from services.export_service  import ExportService
+from services.stock_service   import StockService
 from utils.jwt_handler        import token_required, admin_required
+from utils.fields             import FieldsError
 from utils.response           import success, error
 
 products_bp = Blueprint("products", __name__, url_prefix="/products")
@@ -20,8 +29,14 @@ products_bp = Blueprint("products", __name__, url_prefix="/products")
 
 @products_bp.route("/", methods=["GET"])
 def get_products():
-    """Public — paginated product catalogue with optional filters."""
+    """Public — paginated product catalogue with optional filters, or ?ids= multi-get."""
     try:
+        if request.args.get("ids") is not None:
+            products, missing = ProductService.get_products_by_ids(
+                request.args["ids"], request.args.get("fields")
+            )
+            return success("Products fetched", products, meta={"missing": missing})
+
         page        = int(request.args.get("page", 1))
         per_page    = int(request.args.get("per_page", 10))
         category_id = request.args.get("category_id", type=int)
@@ -30,14 +45,17 @@ def get_products():
         max_price   = request.args.get("max_price", type=float)
         sort_by     = request.args.get("sort_by", "created_at")
         order       = request.args.get("order", "DESC")
+        fields      = request.args.get("fields")
 
         products, pagination = ProductService.get_products(
             page=page, per_page=per_page,
             category_id=category_id, search=search or None,
             min_price=min_price, max_price=max_price,
-            sort_by=sort_by, order=order
+            sort_by=sort_by, order=order, fields=fields
         )
         return success("Products fetched", products, pagination=pagination)
+    except ValueError as e:
+        return error(str(e), 400)
     except Exception as e:
         return error(f"Failed to fetch products: {e}", 500)
 
@@ -52,18 +70,46 @@ def get_categories():
         return error(str(e), 500)
 
 
+@products_bp.route("/export", methods=["GET"])
+@admin_required
+def export_products(current_user):
+    """Admin — every product (or those changed since ?updated_since=), streamed."""
+    fmt = request.args.get("format", "ndjson")
+    try:
+        body, mimetype = ExportService.products(fmt, request.args.get("updated_since"))
+    except ValueError as e:
+        return error(str(e), 400)
+    except Exception as e:
+        return error(str(e), 500)
+    return Response(stream_with_context(body), mimetype=mimetype,
+                    headers={"Content-Disposition": f'attachment; filename="products.{fmt}"'})
+
+
 @products_bp.route("/<int:product_id>", methods=["GET"])
 def get_product(product_id):
     """Public — single product details."""
     try:
-        product = ProductService.get_product(product_id)
+        product = ProductService.get_product(product_id, request.args.get("fields"))
         return success("Product fetched", product)
+    except FieldsError as e:
+        return error(str(e), 400)
     except ValueError as e:
         return error(str(e), 404)
     except Exception as e:
         return error(str(e), 500)
 
 
+@products_bp.route("/<int:product_id>/related", methods=["GET"])
+def get_related(product_id):
+    """Public — products most often bought together with this one."""
+    try:
+        limit   = request.args.get("limit", 10, type=int)
+        related = ProductService.get_related(product_id, limit)
+        return success("Related products fetched", related)
+    except Exception as e:
+        return error(str(e), 500)
+
+
 @products_bp.route("/", methods=["POST"])
 @admin_required
 def create_product(current_user):
@@ -76,7 +122,8 @@ def create_product(current_user):
             price       = data.get("price"),
             stock       = data.get("stock", 0),
             category_id = data.get("category_id"),
-            image_url   = data.get("image_url")
+            image_url   = data.get("image_url"),
+            sku         = data.get("sku")
         )
         return success("Product created", product, status=201)
     except ValueError as e:
@@ -85,6 +132,32 @@ def create_product(current_user):
         return error(str(e), 500)
 
 
+@products_bp.route("/bulk", methods=["POST"])
+@admin_required
+def import_products(current_user):
+    """Admin — import a catalogue file streamed as the request body."""
+    try:
+        report = ImportService.import_products(request.stream, request.mimetype)
+        return success("Import finished", report)
+    except ValueError as e:
+        return error(str(e), 400)
+    except Exception as e:
+        return error(str(e), 500)
+
+
+@products_bp.route("/stock-sync", methods=["POST"])
+@admin_required
+def sync_stock(current_user):
+    """Admin — apply a `sku,stock` / `sku,+n` delta file sent as the request body."""
+    try:
+        report = StockService.sync_stream(request.stream)
+        return success("Stock sync finished", report)
+    except ValueError as e:
+        return error(str(e), 400)
+    except Exception as e:
+        return error(str(e), 500)
+
+
 @products_bp.route("/<int:product_id>", methods=["PUT"])
 @admin_required
 def update_product(current_user, product_id):
@@ -0,0 +1,133 @@
+"""
+server.py
+─────────
+Production entry point — a preforking gunicorn server around create_app().
+
+  • The app is built once, in the parent (preload), and what every
+    worker would otherwise load on its own — the revocation list and the
+    co-purchase index — is loaded there too, before fork; workers share
+    those pages copy-on-write. The parent then closes its connections.
+  • WEB_WORKERS processes of WEB_THREADS threads each are forked. Every
+    worker starts its own background threads and opens its DB pool
+    before it accepts a connection.
+  • A worker is replaced, after finishing the requests it has, once it
+    has served WEB_MAX_REQUESTS (plus up to 10% jitter, so they do not
+    all restart together) or its RSS exceeds WEB_MAX_RSS_MB.
+  • SIGTERM drains: workers stop accepting, finish in-flight requests
+    for up to WEB_GRACEFUL_TIMEOUT seconds, then exit.
+
+Caches, rate-limit buckets (unless RATE_LIMIT_BACKEND=redis),
+MAX_IN_FLIGHT and the /metrics counts are per worker.
+
+Run:
+    python server.py
+    WEB_WORKERS=8 WEB_THREADS=8 WEB_BIND=127.0.0.1:8000 python server.py
+"""
+
+import logging
+import os
+
+from gunicorn.app.base import BaseApplication
+
+from app import create_app, start_background_tasks
+from config import config
+from services.recommendation_service import related_index
+from services.token_service import TokenService
+from utils import db
+
+log = logging.getLogger("gunicorn.error")
+
+PAGE_MB = os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def rss_mb() -> float:
+    """Resident set size of this process (0 where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * PAGE_MB
+    except OSError:
+        return 0.0
+
+
+# ── Warm-up ────────────────────────────────────────────────────
+
+def warm_shared():
+    """Load the in-memory indexes in the parent, so workers start with them."""
+    try:
+        TokenService.sync()
+        if config.RELATED_ENABLED:
+            related_index.rebuild()
+    except Exception as e:
+        log.warning("Warm-up before fork failed, workers will load on their own: %s", e)
+    db.close_pools()   # connections must not be shared across fork()
+
+
+def warm_pools():
+    """Open as many pooled connections as the worker has threads (primary and replicas)."""
+    size  = min(config.WEB_THREADS, config.DB_POOL_SIZE)
+    pools = [db.get_pool()] + [db.get_pool(r.host, r.port) for r in db.replicas]
+    for pool in pools:
+        try:
+            conns = [pool.acquire() for _ in range(size)]
+        except Exception as e:
+            log.warning("Could not warm the pool for %s:%s: %s", pool.host, pool.port, e)
+            continue
+        for conn in conns:
+            conn.release()
+
+
+# ── Server hooks ───────────────────────────────────────────────
+
+def post_fork(server, worker):
+    start_background_tasks()
+    warm_pools()
+
+
+def post_request(worker, req, environ, resp):
+    if config.WEB_MAX_RSS_MB and worker.alive and rss_mb() > config.WEB_MAX_RSS_MB:
+        log.info("Worker %s over WEB_MAX_RSS_MB (%.0f MB), recycling", worker.pid, rss_mb())
+        worker.alive = False
+
+
+def worker_exit(server, worker):
+    db.close_pools()
+
+
+# ── Application ────────────────────────────────────────────────
+
+class Server(BaseApplication):
+    """gunicorn application that serves create_app() with the WEB_* settings."""
+
+    def __init__(self, options: dict = None):
+        self.options = {**self.default_options(), **(options or {})}
+        super().__init__()
+
+    @staticmethod
+    def default_options() -> dict:
+        return {
+            "bind":                config.WEB_BIND,
+            "workers":             config.WEB_WORKERS,
+            "worker_class":        "gthread",
+            "threads":             config.WEB_THREADS,
+            "preload_app":         True,
+            "max_requests":        config.WEB_MAX_REQUESTS,
+            "max_requests_jitter": config.WEB_MAX_REQUESTS // 10,
+            "timeout":             config.WEB_TIMEOUT,
+            "graceful_timeout":    config.WEB_GRACEFUL_TIMEOUT,
+            "post_fork":           post_fork,
+            "post_request":        post_request,
+            "worker_exit":         worker_exit,
+        }
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        app = create_app(background=False)
+        warm_shared()
+        return app
+
+
+if __name__ == "__main__":
+    Server().run()
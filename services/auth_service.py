@@ -1,11 +1,14 @@
 """
 services/auth_service.py
 ────────────────────────
-Authentication business logic — registration, login, token refresh.
+Authentication business logic — registration, login, token refresh,
+logout.
 """
 
 from models.user import User
+from services.token_service import TokenService
 from utils.jwt_handler import generate_access_token, generate_refresh_token, decode_token
+from utils.tracing import traced
 import jwt
 
 
@@ -13,6 +16,7 @@ class AuthService:
     """Handles all authentication-related business logic."""
 
     @staticmethod
+    @traced()
     def register(name: str, email: str, password: str) -> dict:
         """Register a new customer account."""
 
@@ -27,7 +31,7 @@ class AuthService:
             raise ValueError("Email is already registered")
 
         user_id = User.create(name, email.lower().strip(), password)
-        user    = User.find_by_id(user_id)
+        user    = User.cached(user_id)
 
         return {
             "user":          user.to_dict(),
@@ -37,12 +41,13 @@ class AuthService:
         }
 
     @staticmethod
+    @traced()
     def login(email: str, password: str) -> dict:
         """Validate credentials and return tokens."""
         if not email or not password:
             raise ValueError("Email and password are required")
 
-        user = User.find_by_email(email.lower().strip())
+        user = User.find_by_email(email.lower().strip(), with_password=True)
         if not user:
             raise ValueError("Invalid email or password")
         if not User.verify_password(password, user.password):
@@ -56,20 +61,30 @@ class AuthService:
         }
 
     @staticmethod
+    @traced()
     def refresh_tokens(refresh_token: str) -> dict:
-        """Issue new access token using a valid refresh token."""
+        """
+        Rotate a refresh token: the presented one is revoked and a new
+        access + refresh pair is issued. A refresh token can be used once.
+        """
         try:
             payload = decode_token(refresh_token)
             if payload.get("type") != "refresh":
                 raise ValueError("Not a refresh token")
 
-            user = User.find_by_id(payload["sub"])
+            if not TokenService.revoke(payload):
+                raise ValueError("Refresh token has already been used or revoked")
+            if TokenService.revoked_by_cutoff(payload):
+                raise ValueError("Refresh token has been revoked, please login again")
+
+            user = User.cached(payload["sub"])
             if not user:
                 raise ValueError("User not found")
 
             return {
-                "access_token": generate_access_token(user.id, user.role),
-                "token_type":   "Bearer"
+                "access_token":  generate_access_token(user.id, user.role),
+                "refresh_token": generate_refresh_token(user.id),
+                "token_type":    "Bearer"
             }
         except jwt.ExpiredSignatureError:
             raise ValueError("Refresh token has expired, please login again")
@@ -77,13 +92,29 @@ class AuthService:
             raise ValueError("Invalid refresh token")
 
     @staticmethod
+    @traced()
+    def logout(access_payload: dict, refresh_token: str = None):
+        """Revoke the caller's access token and, if given, its refresh token."""
+        TokenService.revoke(access_payload)
+        if not refresh_token:
+            return
+        try:
+            payload = decode_token(refresh_token)
+        except jwt.InvalidTokenError:
+            return   # expired or garbage: nothing left to revoke
+        if payload.get("type") == "refresh" and payload["sub"] == access_payload["sub"]:
+            TokenService.revoke(payload)
+
+    @staticmethod
+    @traced()
     def get_profile(user_id: int) -> dict:
-        user = User.find_by_id(user_id)
+        user = User.cached(user_id)
         if not user:
             raise ValueError("User not found")
         return user.to_dict()
 
     @staticmethod
+    @traced()
     def update_profile(user_id: int, name: str) -> dict:
         user = User.find_by_id(user_id)
         if not user:
@@ -92,8 +123,10 @@ class AuthService:
         return user.to_dict()
 
     @staticmethod
-    def change_password(user_id: int, current_password: str, new_password: str):
-        user = User.find_by_id(user_id)
+    @traced()
+    def change_password(user_id: int, current_password: str, new_password: str) -> dict:
+        """Change the password, sign out every session and return fresh tokens."""
+        user = User.find_by_id(user_id, with_password=True)
         if not user:
             raise ValueError("User not found")
         if not User.verify_password(current_password, user.password):
@@ -101,3 +134,10 @@ class AuthService:
         if len(new_password) < 6:
             raise ValueError("New password must be at least 6 characters")
         user.change_password(new_password)
+        TokenService.revoke_all(user_id)
+
+        return {
+            "access_token":  generate_access_token(user.id, user.role),
+            "refresh_token": generate_refresh_token(user.id),
+            "token_type":    "Bearer"
+        }
@@ -6,30 +6,51 @@ Cart business logic — add, update, remove, clear.
 
 from models.cart    import Cart
 from models.product import Product
+from utils.tracing  import traced
 
 
 class CartService:
     """Manages shopping cart operations."""
 
     @staticmethod
+    @traced()
     def get_cart(user_id: int) -> dict:
         return Cart.get_user_cart(user_id)
 
     @staticmethod
+    @traced()
+    async def get_cart_async(user_id: int) -> dict:
+        return await Cart.get_user_cart_async(user_id)
+
+    @staticmethod
+    @traced()
     def add_to_cart(user_id: int, product_id: int, quantity: int = 1) -> dict:
         if quantity < 1:
             raise ValueError("Quantity must be at least 1")
 
-        product = Product.find_by_id(product_id)
+        CartService._check_available(Product.find_by_id(product_id), quantity)
+        Cart.add_item(user_id, product_id, quantity)
+        return Cart.get_user_cart(user_id)
+
+    @staticmethod
+    @traced()
+    async def add_to_cart_async(user_id: int, product_id: int, quantity: int = 1) -> dict:
+        if quantity < 1:
+            raise ValueError("Quantity must be at least 1")
+
+        CartService._check_available(await Product.find_by_id_async(product_id), quantity)
+        await Cart.add_item_async(user_id, product_id, quantity)
+        return await Cart.get_user_cart_async(user_id)
+
+    @staticmethod
+    def _check_available(product, quantity: int):
         if not product:
             raise ValueError("Product not found or unavailable")
         if product.stock < quantity:
             raise ValueError(f"Only {product.stock} units available in stock")
 
-        Cart.add_item(user_id, product_id, quantity)
-        return Cart.get_user_cart(user_id)
-
     @staticmethod
+    @traced()
     def update_item(user_id: int, product_id: int, quantity: int) -> dict:
         product = Product.find_by_id(product_id)
         if not product:
@@ -41,10 +62,12 @@ class CartService:
         return Cart.get_user_cart(user_id)
 
     @staticmethod
+    @traced()
     def remove_from_cart(user_id: int, product_id: int) -> dict:
         Cart.remove_item(user_id, product_id)
         return Cart.get_user_cart(user_id)
 
     @staticmethod
+    @traced()
     def clear_cart(user_id: int):
         Cart.clear(user_id)
@@ -0,0 +1,163 @@
+"""
+services/import_service.py
+──────────────────────────
+Bulk product import — POST /products/bulk.
+
+The request body (NDJSON, one product object per line, or CSV with a
+header row) is read line by line as it arrives. Each row is validated
+with ProductService.clean_product — the rules POST /products applies —
+and valid rows are written IMPORT_CHUNK_SIZE at a time with one
+multi-row upsert (Product.upsert_many), each committed on its own. Only
+the current chunk and the first IMPORT_MAX_ERRORS errors are held in
+memory, however large the file.
+
+Rows with a `sku` update the product that already has it; rows without
+one are always inserted. After each chunk the related-product cards of
+its SKUs are refreshed, so /products/<id>/related does not keep serving
+the old names and prices until the next index rebuild.
+"""
+
+import csv
+import json
+
+from config import config
+from models.product import Product
+from services.product_service import ProductService
+from services.recommendation_service import RecommendationService
+from utils.tracing import traced
+
+FORMATS = {
+    "application/x-ndjson": "ndjson",
+    "application/jsonl":    "ndjson",
+    "text/csv":             "csv",
+}
+
+BAD_UTF8 = "\ufffd"   # what undecodable bytes are replaced with
+
+
+# ── Parsing ────────────────────────────────────────────────────
+
+def _lines(stream):
+    """Decoded lines of a binary stream, read one at a time."""
+    for raw in iter(stream.readline, b""):
+        yield raw.decode("utf-8-sig", "replace")
+
+
+def _ndjson_records(stream):
+    """(line number, dict or error message) per non-blank line."""
+    for line_no, line in enumerate(_lines(stream), 1):
+        if not line.strip():
+            continue
+        if BAD_UTF8 in line:
+            yield line_no, "Line is not valid UTF-8"
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_no, "Invalid JSON"
+            continue
+        yield line_no, record if isinstance(record, dict) else "Expected a JSON object"
+
+
+def _csv_records(stream):
+    """(line number, dict or error message) per CSV row after the header."""
+    reader = csv.DictReader(_lines(stream))
+    if reader.fieldnames is None:
+        return
+    missing = [c for c in ("name", "price") if c not in reader.fieldnames]
+    if missing:
+        raise ValueError(f"CSV header must include: {', '.join(missing)}")
+    for record in reader:
+        if any(BAD_UTF8 in v for v in record.values() if isinstance(v, str)):
+            yield reader.line_num, "Line is not valid UTF-8"
+        else:
+            yield reader.line_num, record
+
+
+_PARSERS = {"ndjson": _ndjson_records, "csv": _csv_records}
+
+
+# ── Import ─────────────────────────────────────────────────────
+
+class ImportService:
+    """Streaming catalogue import."""
+
+    @staticmethod
+    def _row(record: dict, categories: set) -> tuple:
+        """Validated column values (Product.IMPORT_COLUMNS order); empty CSV cells count as missing."""
+        def get(key):
+            value = record.get(key)
+            return None if value == "" else value
+
+        stock   = get("stock")
+        product = ProductService.clean_product(
+            name=get("name"), description=get("description"), price=get("price"),
+            stock=0 if stock is None else stock, category_id=get("category_id"),
+            image_url=get("image_url"), sku=get("sku"),
+        )
+        if product["category_id"] is not None and product["category_id"] not in categories:
+            raise ValueError(f"Unknown category_id {product['category_id']}")
+        return tuple(product[c] for c in Product.IMPORT_COLUMNS)
+
+    @staticmethod
+    def _fail(report: dict, line_no: int, message: str):
+        report["failed"] += 1
+        if len(report["errors"]) < config.IMPORT_MAX_ERRORS:
+            report["errors"].append({"line": line_no, "error": message})
+
+    @staticmethod
+    def _write(chunk: list, lines: list, report: dict):
+        """
+        Upsert one chunk; if the database rejects it, retry row by row to
+        pin down the bad ones. Then refresh the written products' cards.
+        """
+        try:
+            Product.upsert_many(chunk)
+            report["imported"] += len(chunk)
+            written = chunk
+        except Exception:
+            written = []
+            for row, line_no in zip(chunk, lines):
+                try:
+                    Product.upsert_many([row])
+                    report["imported"] += 1
+                    written.append(row)
+                except Exception as e:
+                    ImportService._fail(report, line_no, str(e))
+        # Rows without a sku are new products: no co-purchases, so no card to refresh
+        RecommendationService.products_upserted([row[0] for row in written if row[0]])
+
+    @staticmethod
+    @traced()
+    def import_products(stream, mimetype: str) -> dict:
+        """
+        Import every row of `stream` (a binary file-like, e.g.
+        request.stream). Returns {"rows", "imported", "failed", "errors":
+        [{"line", "error"}]}; raises ValueError for an unsupported
+        format or a CSV header without name / price.
+        """
+        fmt = FORMATS.get(mimetype)
+        if fmt is None:
+            raise ValueError(f"Content-Type must be one of: {', '.join(FORMATS)}")
+
+        categories = {c["id"] for c in ProductService.get_categories()}
+        report     = {"rows": 0, "imported": 0, "failed": 0, "errors": []}
+        chunk, lines = [], []
+
+        for line_no, record in _PARSERS[fmt](stream):
+            report["rows"] += 1
+            try:
+                if isinstance(record, str):
+                    raise ValueError(record)
+                chunk.append(ImportService._row(record, categories))
+                lines.append(line_no)
+            except ValueError as e:
+                ImportService._fail(report, line_no, str(e))
+                continue
+            if len(chunk) >= config.IMPORT_CHUNK_SIZE:
+                ImportService._write(chunk, lines, report)
+                chunk, lines = [], []
+
+        if chunk:
+            ImportService._write(chunk, lines, report)
+        return report
@@ -4,20 +4,58 @@ services/order_service.py
 Order business logic — place order, track, admin management.
 """
 
+import logging
+import threading
+import time
+
+from config import config
 from models.order   import Order
 from models.cart    import Cart
 from models.product import Product
+from models.sales   import SalesRollup
+from services.recommendation_service import RecommendationService
+from services.report_service import ReportService
+from utils          import adb
+from utils.db       import transaction
+from utils.fields   import parse_fields, project
+from utils.tracing  import traced
+
+log = logging.getLogger("ecommerce.orders")
 
 
 class OrderService:
     """Handles order placement and lifecycle management."""
 
+    _rollup_thread = None
+
+    @staticmethod
+    def start():
+        """Apply queued sales-rollup changes every SALES_ROLLUP_SECONDS in the background."""
+        if OrderService._rollup_thread:
+            return
+
+        def loop():
+            while True:
+                time.sleep(config.SALES_ROLLUP_SECONDS)
+                try:
+                    # Catch up on a backlog before sleeping again
+                    while SalesRollup.apply_pending() == config.SALES_ROLLUP_BATCH:
+                        pass
+                except Exception as e:
+                    log.warning("sales rollup update failed: %s", e)
+
+        OrderService._rollup_thread = threading.Thread(target=loop, name="sales-rollups", daemon=True)
+        OrderService._rollup_thread.start()
+
     @staticmethod
+    @traced()
     def place_order(user_id: int, shipping_address: str,
                     payment_method: str = "COD") -> dict:
         """
-        Convert the user's cart into a confirmed order.
-        Validates stock, creates order atomically, clears cart.
+        Convert the user's cart into a confirmed order. In one transaction
+        the cart's products are locked with a single SELECT … FOR UPDATE,
+        checked for availability and stock, and decremented with a single
+        UPDATE, so concurrent orders cannot oversell.
         """
         if not shipping_address or not shipping_address.strip():
             raise ValueError("Shipping address is required")
@@ -26,42 +64,114 @@ class OrderService:
         if not cart["items"]:
             raise ValueError("Your cart is empty")
 
-        # Validate stock for every item before placing
-        for item in cart["items"]:
-            product = Product.find_by_id(item["product_id"])
-            if not product:
-                raise ValueError(f"Product '{item['name']}' is no longer available")
-            if product.stock < item["quantity"]:
-                raise ValueError(
-                    f"Insufficient stock for '{item['name']}'. "
-                    f"Available: {product.stock}, requested: {item['quantity']}"
-                )
+        with transaction() as tx:
+            stock = Product.lock_stock_by_id(tx, [item["product_id"] for item in cart["items"]])
+            OrderService._check_stock(cart["items"], stock)
 
-        order_id = Order.create_from_cart(
-            user_id          = user_id,
-            cart_items       = cart["items"],
-            shipping_address = shipping_address.strip(),
-            payment_method   = payment_method
-        )
+            order_id = Order.create_from_cart(
+                tx,
+                user_id          = user_id,
+                cart_items       = cart["items"],
+                shipping_address = shipping_address.strip(),
+                payment_method   = payment_method
+            )
+            Product.set_stock(tx, {item["product_id"]: stock[item["product_id"]] - item["quantity"]
+                                   for item in cart["items"]})
 
         # Clear cart after successful order
         Cart.clear(user_id)
+        RecommendationService.record_order(cart["items"])
 
         return Order.find_by_id(order_id).to_dict()
 
     @staticmethod
-    def get_order(order_id: int, user_id: int = None) -> dict:
+    @traced()
+    async def place_order_async(user_id: int, shipping_address: str,
+                                payment_method: str = "COD") -> dict:
+        """
+        place_order() on utils.adb. Before the transaction each cart line's
+        stock is read concurrently (no locks; a replica when configured),
+        so a cart that cannot be filled is refused after one round trip
+        without locking rows on the primary. The locked re-check inside
+        the transaction still decides; a transaction is one connection,
+        so its statements run in turn. Clearing the cart and reading the
+        new order back run concurrently.
+        """
+        if not shipping_address or not shipping_address.strip():
+            raise ValueError("Shipping address is required")
+
+        cart = await Cart.get_user_cart_async(user_id)
+        if not cart["items"]:
+            raise ValueError("Your cart is empty")
+
+        ids      = [item["product_id"] for item in cart["items"]]
+        products = await adb.gather(*(Product.find_by_id_async(i, ("stock",)) for i in ids))
+        OrderService._check_stock(cart["items"], {i: p.stock for i, p in zip(ids, products) if p})
+
+        async with adb.transaction() as tx:
+            stock = await Product.lock_stock_by_id_async(tx, ids)
+            OrderService._check_stock(cart["items"], stock)
+
+            order_id = await Order.create_from_cart_async(
+                tx,
+                user_id          = user_id,
+                cart_items       = cart["items"],
+                shipping_address = shipping_address.strip(),
+                payment_method   = payment_method
+            )
+            await Product.set_stock_async(tx, {i: stock[i] - item["quantity"]
+                                               for i, item in zip(ids, cart["items"])})
+
+        _, order = await adb.gather(Cart.clear_async(user_id), Order.find_by_id_async(order_id))
+        RecommendationService.record_order(cart["items"])
+
+        return order.to_dict()
+
+    @staticmethod
+    def _check_stock(items: list, stock: dict):
+        """Raise ValueError unless every cart item is available in its quantity ({id: stock})."""
+        for item in items:
+            available = stock.get(item["product_id"])
+            if available is None:
+                raise ValueError(f"Product '{item['name']}' is no longer available")
+            if available < item["quantity"]:
+                raise ValueError(
+                    f"Insufficient stock for '{item['name']}'. "
+                    f"Available: {available}, requested: {item['quantity']}"
+                )
+
+    @staticmethod
+    @traced()
+    def get_order(order_id: int, user_id: int = None, fields: str = None) -> dict:
         """Fetch an order. Pass user_id to scope to that customer."""
-        order = Order.find_by_id(order_id, user_id)
+        fields = parse_fields(fields, Order.FIELDS)
+        order  = Order.find_by_id(order_id, user_id, fields)
         if not order:
             raise ValueError("Order not found")
-        return order.to_dict()
+        return order.to_dict(fields)
+
+    @staticmethod
+    @traced()
+    async def get_order_async(order_id: int, user_id: int = None, fields: str = None) -> dict:
+        fields = parse_fields(fields, Order.FIELDS)
+        order  = await Order.find_by_id_async(order_id, user_id, fields)
+        if not order:
+            raise ValueError("Order not found")
+        return order.to_dict(fields)
+
+    @staticmethod
+    @traced()
+    def get_user_orders(user_id: int, page: int = 1, per_page: int = 10, fields: str = None):
+        return Order.get_user_orders(user_id, page, per_page,
+                                     parse_fields(fields, Order.LIST_FIELDS))
 
     @staticmethod
-    def get_user_orders(user_id: int, page: int = 1, per_page: int = 10):
-        return Order.get_user_orders(user_id, page, per_page)
+    @traced()
+    def get_order_summary(user_id: int) -> dict:
+        return Order.get_summary(user_id)
 
     @staticmethod
+    @traced()
     def cancel_order(order_id: int, user_id: int) -> dict:
         order = Order.find_by_id(order_id, user_id)
         if not order:
@@ -75,27 +185,121 @@ class OrderService:
     # ── Admin ──────────────────────────────────────────────────
 
     @staticmethod
-    def get_all_orders(page: int = 1, per_page: int = 10, status: str = None):
-        rows, pagination = Order.get_all_orders(page, per_page, status)
-        orders = [
-            {
-                "id":               r["id"],
-                "user_id":          r["user_id"],
-                "customer_name":    r.get("customer_name"),
-                "customer_email":   r.get("customer_email"),
-                "total_amount":     float(r["total_amount"]),
-                "status":           r["status"],
-                "payment_method":   r["payment_method"],
-                "created_at":       str(r["created_at"]),
-            }
-            for r in rows
-        ]
-        return orders, pagination
+    @traced()
+    def get_all_orders(page: int = 1, per_page: int = 10, status: str = None,
+                       fields: str = None):
+        fields = parse_fields(fields, Order.ADMIN_FIELDS) or Order.ADMIN_DEFAULT
+        rows, pagination = Order.get_all_orders(page, per_page, status, fields)
+        return [project(r, fields, Order.ADMIN_FIELDS) for r in rows], pagination
 
     @staticmethod
+    @traced()
     def update_order_status(order_id: int, status: str) -> dict:
         if status not in Order.VALID_STATUSES:
             raise ValueError(f"Invalid status. Must be one of: {', '.join(Order.VALID_STATUSES)}")
         if not Order.update_status(order_id, status):
             raise ValueError("Order not found")
         return Order.find_by_id(order_id).to_dict()
+
+    @staticmethod
+    @traced()
+    def bulk_update_status(updates) -> dict:
+        """
+        [{"id", "status"}, …] → {"updated", "unchanged", "failed", "results"}
+        with one result per order, in request order: {"id", "status",
+        "previous"} or {"id", "error"}. Only the moves in Order.TRANSITIONS
+        are allowed; orders are applied ORDER_STATUS_BATCH_SIZE per transaction.
+        """
+        if not isinstance(updates, list) or not updates:
+            raise ValueError("'orders' must be a non-empty list")
+        if len(updates) > config.BULK_STATUS_MAX_ORDERS:
+            raise ValueError(f"At most {config.BULK_STATUS_MAX_ORDERS} orders per request")
+
+        checked, targets = [], {}   # checked: (id, status, error) in request order
+        for item in updates:
+            order_id = item.get("id") if isinstance(item, dict) else None
+            status   = item.get("status") if isinstance(item, dict) else None
+            if not isinstance(order_id, int) or isinstance(order_id, bool):
+                checked.append((order_id, status, 'Expected {"id": <int>, "status": <status>}'))
+            elif status not in Order.VALID_STATUSES:
+                checked.append((order_id, status, f"Invalid status '{status}'"))
+            elif order_id in targets:
+                checked.append((order_id, status, "Duplicate order id"))
+            else:
+                targets[order_id] = status
+                checked.append((order_id, status, None))
+
+        previous, ids = {}, list(targets)
+        for i in range(0, len(ids), config.ORDER_STATUS_BATCH_SIZE):
+            batch = ids[i:i + config.ORDER_STATUS_BATCH_SIZE]
+            previous.update(Order.update_statuses({order_id: targets[order_id] for order_id in batch}))
+
+        counts, results = {"updated": 0, "unchanged": 0, "failed": 0}, []
+        for order_id, status, problem in checked:
+            old = previous.get(order_id)
+            if problem is None and old is None:
+                problem = "Order not found"
+            elif problem is None and old != status and status not in Order.TRANSITIONS[old]:
+                problem = f"Cannot change status from '{old}' to '{status}'"
+
+            if problem:
+                counts["failed"] += 1
+                results.append({"id": order_id, "error": problem})
+            else:
+                counts["unchanged" if old == status else "updated"] += 1
+                results.append({"id": order_id, "status": status, "previous": old})
+        return {**counts, "results": results}
+
+    @staticmethod
+    @traced()
+    def get_sales_stats(date_from: str = None, date_to: str = None) -> dict:
+        """
+        Revenue / orders / units for [date_from, date_to] (ISO dates,
+        default the last 30 days), read from the sales rollups only — up
+        to SALES_ROLLUP_SECONDS behind the orders. Cancelled orders are
+        reported separately and excluded from totals.
+        """
+        start, end = ReportService.date_range(date_from, date_to)
+
+        def bucket():
+            return {"orders": 0, "units": 0, "revenue": 0.0}
+
+        by_status = {s: bucket() for s in Order.STATUS_ORDER}
+        by_day    = {}
+        for r in SalesRollup.daily(start, end):
+            figures = (int(r["order_count"]), int(r["units"]), float(r["revenue"]))
+            targets = [by_status[r["status"]]]
+            if r["status"] != "cancelled":
+                targets.append(by_day.setdefault(str(r["day"]), bucket()))
+            for target in targets:
+                target["orders"]  += figures[0]
+                target["units"]   += figures[1]
+                target["revenue"] += figures[2]
+
+        totals = bucket()
+        for day in by_day.values():
+            for key in totals:
+                totals[key] += day[key]
+        totals["avg_order_value"] = totals["revenue"] / totals["orders"] if totals["orders"] else 0.0
+
+        for figures in [totals, *by_status.values(), *by_day.values()]:
+            figures["revenue"] = round(figures["revenue"], 2)
+        totals["avg_order_value"] = round(totals["avg_order_value"], 2)
+
+        return {
+            "from":        str(start),
+            "to":          str(end),
+            "totals":      totals,
+            "by_status":   by_status,
+            "by_day":      [{"day": d, **figures} for d, figures in sorted(by_day.items())],
+            "by_category": [
+                {
+                    "category_id":   r["category_id"] or None,
+                    "category_name": r["category_name"] or "Uncategorized",
+                    "orders":        int(r["order_count"]),
+                    "units":         int(r["units"]),
+                    "revenue":       round(float(r["revenue"]), 2),
+                }
+                for r in SalesRollup.by_category(start, end)
+            ],
+        }
@@ -4,16 +4,21 @@ services/product_service.py
 Product business logic — catalogue, search, admin CRUD.
 """
 
+from config import config
 from models.product import Product
+from services.recommendation_service import RecommendationService
+from utils.fields import parse_fields
+from utils.tracing import traced
 
 
 class ProductService:
     """All product-related business operations."""
 
     @staticmethod
+    @traced()
     def get_products(page=1, per_page=10, category_id=None,
                      search=None, min_price=None, max_price=None,
-                     sort_by="created_at", order="DESC"):
+                     sort_by="created_at", order="DESC", fields=None):
 
         if page < 1:
             page = 1
@@ -24,18 +29,86 @@ class ProductService:
             page=page, per_page=per_page,
             category_id=category_id, search=search,
             min_price=min_price, max_price=max_price,
-            sort_by=sort_by, order=order
+            sort_by=sort_by, order=order,
+            fields=parse_fields(fields, Product.FIELDS)
         )
         return products, pagination
 
     @staticmethod
-    def get_product(product_id: int) -> dict:
-        product = Product.find_by_id(product_id)
+    @traced()
+    async def get_products_async(page=1, per_page=10, category_id=None,
+                                 search=None, min_price=None, max_price=None,
+                                 sort_by="created_at", order="DESC", fields=None):
+        return await Product.get_all_async(
+            page=max(page, 1), per_page=min(per_page, 100),
+            category_id=category_id, search=search,
+            min_price=min_price, max_price=max_price,
+            sort_by=sort_by, order=order,
+            fields=parse_fields(fields, Product.FIELDS)
+        )
+
+    @staticmethod
+    @traced()
+    def get_products_by_ids(ids: str, fields: str = None) -> tuple:
+        """
+        "3,1,2" → (products in that order, ids not found / inactive).
+        Duplicates are dropped; at most MAX_PAGE_SIZE ids.
+        """
+        wanted = ProductService._parse_ids(ids)
+        found  = Product.find_many(wanted, parse_fields(fields, Product.FIELDS))
+        return ProductService._in_order(wanted, found)
+
+    @staticmethod
+    @traced()
+    async def get_products_by_ids_async(ids: str, fields: str = None) -> tuple:
+        wanted = ProductService._parse_ids(ids)
+        found  = await Product.find_many_async(wanted, parse_fields(fields, Product.FIELDS))
+        return ProductService._in_order(wanted, found)
+
+    @staticmethod
+    def _parse_ids(ids: str) -> list:
+        try:
+            wanted = list(dict.fromkeys(int(i) for i in ids.split(",") if i.strip()))
+        except ValueError:
+            raise ValueError("ids must be a comma-separated list of integers")
+        if not wanted:
+            raise ValueError("ids must not be empty")
+        if len(wanted) > config.MAX_PAGE_SIZE:
+            raise ValueError(f"At most {config.MAX_PAGE_SIZE} ids per request")
+        return wanted
+
+    @staticmethod
+    def _in_order(wanted: list, products: list) -> tuple:
+        found = {p["id"]: p for p in products}
+        return ([found[i] for i in wanted if i in found],
+                [i for i in wanted if i not in found])
+
+    @staticmethod
+    @traced()
+    def get_product(product_id: int, fields: str = None) -> dict:
+        fields  = parse_fields(fields, Product.FIELDS)
+        product = Product.find_by_id(product_id, fields)
+        if not product:
+            raise ValueError("Product not found")
+        return product.to_dict(fields)
+
+    @staticmethod
+    @traced()
+    async def get_product_async(product_id: int, fields: str = None) -> dict:
+        fields  = parse_fields(fields, Product.FIELDS)
+        product = await Product.find_by_id_async(product_id, fields)
         if not product:
             raise ValueError("Product not found")
-        return product.to_dict()
+        return product.to_dict(fields)
 
     @staticmethod
+    @traced()
+    def get_related(product_id: int, limit: int = 10) -> list:
+        """Frequently bought together — served from the in-memory index."""
+        return RecommendationService.related_products(product_id, limit)
+
+    @staticmethod
+    @traced()
     def get_categories() -> list:
         rows = Product.get_categories()
         return rows or []
@@ -43,37 +116,73 @@ class ProductService:
     # ── Admin operations ───────────────────────────────────────
 
     @staticmethod
-    def create_product(name, description, price, stock, category_id, image_url=None):
-        if not name or not name.strip():
+    def clean_product(name, description, price, stock, category_id,
+                      image_url=None, sku=None) -> dict:
+        """
+        Validate one product's values (create_product and bulk import share
+        these rules); returns them normalised, or raises ValueError.
+        """
+        name = str(name).strip() if name is not None else ""
+        if not name:
             raise ValueError("Product name is required")
-        if price is None or float(price) < 0:
+        if len(name) > 200:
+            raise ValueError("Product name must be at most 200 characters")
+        try:
+            price = float(price)
+        except (TypeError, ValueError):
+            price = -1.0
+        if not price >= 0:   # NaN fails too
             raise ValueError("Price must be a non-negative number")
-        if stock is None or int(stock) < 0:
+        try:
+            stock = int(stock)
+        except (TypeError, ValueError):
+            stock = -1
+        if stock < 0:
             raise ValueError("Stock must be a non-negative integer")
+        if category_id is not None:
+            try:
+                category_id = int(category_id)
+            except (TypeError, ValueError):
+                raise ValueError("category_id must be an integer")
+        sku = str(sku).strip() or None if sku is not None else None
+        if sku and len(sku) > 64:
+            raise ValueError("SKU must be at most 64 characters")
+        if image_url and len(image_url) > 500:
+            raise ValueError("image_url must be at most 500 characters")
 
-        product_id = Product.create(
-            name=name.strip(),
-            description=description,
-            price=float(price),
-            stock=int(stock),
-            category_id=category_id,
-            image_url=image_url
-        )
+        return {"sku": sku, "name": name, "description": description, "price": price,
+                "stock": stock, "category_id": category_id, "image_url": image_url}
+
+    @staticmethod
+    @traced()
+    def create_product(name, description, price, stock, category_id, image_url=None, sku=None):
+        product_id = Product.create(**ProductService.clean_product(
+            name, description, price, stock, category_id, image_url, sku
+        ))
         return Product.find_by_id(product_id).to_dict()
 
     @staticmethod
+    @traced()
     def update_product(product_id: int, **fields):
         product = Product.find_by_id(product_id)
         if not product:
             raise ValueError("Product not found")
 
         Product.update(product_id, **fields)
-        return Product.find_by_id(product_id).to_dict()
+        # Not filtered on is_active: the update may have deactivated it
+        product = Product.find_by_id(product_id, active_only=False).to_dict()
+        if product["is_active"]:
+            RecommendationService.product_updated(product)
+        else:
+            RecommendationService.product_removed(product_id)
+        return product
 
     @staticmethod
+    @traced()
     def delete_product(product_id: int):
         """Soft delete — set is_active = False."""
         product = Product.find_by_id(product_id)
         if not product:
             raise ValueError("Product not found")
         Product.update(product_id, is_active=False)
+        RecommendationService.product_removed(product_id)
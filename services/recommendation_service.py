@@ -0,0 +1,295 @@
+"""
+services/recommendation_service.py
+──────────────────────────────────
+"Frequently bought together" — GET /products/<id>/related.
+
+CoPurchaseIndex keeps, per product, its top RELATED_TOP_K co-purchased
+products in CSR form (offsets / neighbours / counts NumPy arrays) plus a
+card (name, price, image) per active product, so lookups need no DB.
+
+  • rebuild()      streams order_items ordered by order, generates every
+                   order's product pairs vectorised, counts them with
+                   np.unique and keeps the top k per product.
+  • record_order() adds a new order's pairs to an in-memory delta that
+                   is merged into lookups until the next rebuild.
+
+Each process holds its own index. A background thread rebuilds it every
+RELATED_REBUILD_SECONDS, so orders placed through other workers show up
+after at most one interval.
+"""
+
+import logging
+import threading
+import time
+
+import numpy as np
+
+from config import config
+from models.order   import Order
+from models.product import Product
+from utils.tracing  import traced
+
+log = logging.getLogger("ecommerce.recommendations")
+
+LINE_DTYPE = np.dtype([("order_id", np.int64), ("product_id", np.int64)])
+_LOW_BITS  = np.int64(0xFFFFFFFF)
+
+
+# ── Vectorised building blocks ─────────────────────────────────────────────────
+
+def order_pairs(order_id: np.ndarray, product_id: np.ndarray) -> np.ndarray:
+    """
+    Every pair of distinct products bought in the same order, encoded as
+    (low_id << 32 | high_id). Rows of one order must be contiguous.
+    """
+    keys  = []
+    shift = 1
+    while shift < len(order_id):
+        # Rows `shift` apart in the same order; none → no order is that large
+        same = order_id[shift:] == order_id[:-shift]
+        if not same.any():
+            break
+        a, b      = product_id[:-shift][same], product_id[shift:][same]
+        low, high = np.minimum(a, b), np.maximum(a, b)
+        distinct  = low != high
+        keys.append((low[distinct] << 32) | high[distinct])
+        shift += 1
+    return np.concatenate(keys) if keys else np.zeros(0, dtype=np.int64)
+
+
+class PairCounter:
+    """Running key → count totals, compacted with np.unique as chunks arrive."""
+
+    COMPACT_AT = 8_000_000   # pending keys before folding them into the totals
+
+    def __init__(self):
+        self.keys     = np.zeros(0, dtype=np.int64)
+        self.counts   = np.zeros(0, dtype=np.int64)
+        self._pending = []
+        self._size    = 0
+
+    def add(self, keys: np.ndarray):
+        self._pending.append(keys)
+        self._size += len(keys)
+        if self._size >= self.COMPACT_AT:
+            self.compact()
+
+    def compact(self):
+        if not self._pending:
+            return
+        new, new_counts = np.unique(np.concatenate(self._pending), return_counts=True)
+        merged, inverse = np.unique(np.concatenate([self.keys, new]), return_inverse=True)
+        weights         = np.concatenate([self.counts, new_counts])
+        self.keys   = merged
+        self.counts = np.bincount(inverse, weights=weights).astype(np.int64)
+        self._pending, self._size = [], 0
+
+
+def _top_k(src: np.ndarray, dst: np.ndarray, count: np.ndarray, k: int) -> tuple:
+    """Keep the k highest-count rows per src (ties → lower dst), sorted by src."""
+    order = np.lexsort((dst, -count, src))
+    src, dst, count = src[order], dst[order], count[order]
+    starts = np.flatnonzero(np.r_[True, src[1:] != src[:-1]])
+    rank   = np.arange(len(src)) - np.repeat(starts, np.diff(np.r_[starts, len(src)]))
+    keep   = rank < k
+    return src[keep], dst[keep], count[keep]
+
+
+def top_k_csr(keys: np.ndarray, counts: np.ndarray, k: int) -> tuple:
+    """
+    Pair counts → (offsets, neighbours, counts) with each product's top k
+    co-purchases at neighbours[offsets[id]:offsets[id + 1]].
+    """
+    if not len(keys):
+        return np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32)
+
+    low    = (keys >> 32).astype(np.int32)
+    high   = (keys & _LOW_BITS).astype(np.int32)
+    counts = counts.astype(np.int32)
+
+    # A product's top k lies within the union of both directions' top k
+    a = _top_k(low, high, counts, k)
+    b = _top_k(high, low, counts, k)
+    src, dst, count = _top_k(np.concatenate([a[0], b[0]]), np.concatenate([a[1], b[1]]),
+                             np.concatenate([a[2], b[2]]), k)
+
+    offsets = np.zeros(int(src.max()) + 2, dtype=np.int64)
+    offsets[1:] = np.cumsum(np.bincount(src, minlength=len(offsets) - 1))
+    return offsets, dst, count
+
+
+# ── Index ──────────────────────────────────────────────────────────────────────
+
+class CoPurchaseIndex:
+    """Immutable top-k snapshot + mutable delta of orders since the last rebuild."""
+
+    def __init__(self, k: int):
+        self.k           = k
+        self.built_at    = None
+        self._snapshot   = (np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int32),
+                            np.zeros(0, dtype=np.int32), {})
+        self._delta      = {}     # product → {product: extra co-purchases}
+        self._delta_next = None   # collects orders placed while a rebuild runs
+        self._lock       = threading.Lock()
+        self._thread     = None
+
+    # ── Reads ─────────────────────────────────────────────────────────────────
+
+    def related(self, product_id: int, limit: int) -> list:
+        offsets, neighbours, counts, cards = self._snapshot
+
+        scores = {}
+        if 0 <= product_id < len(offsets) - 1:
+            lo, hi = offsets[product_id], offsets[product_id + 1]
+            scores = dict(zip(neighbours[lo:hi].tolist(), counts[lo:hi].tolist()))
+        with self._lock:
+            delta = self._delta.get(product_id)
+            delta = dict(delta) if delta else None
+        if delta:
+            for other, n in delta.items():
+                scores[other] = scores.get(other, 0) + n
+
+        related = []
+        for other, score in sorted(scores.items(), key=lambda kv: (-kv[1], kv[0])):
+            card = cards.get(other)
+            if card is None:   # inactive / deleted
+                continue
+            name, price, image_url = card
+            related.append({
+                "product_id": other,
+                "name":       name,
+                "price":      float(price),
+                "image_url":  image_url,
+                "score":      score,
+            })
+            if len(related) == limit:
+                break
+        return related
+
+    # ── Incremental updates ───────────────────────────────────────────────────
+
+    def record_order(self, items: list):
+        """Count a newly placed order (cart items: product_id, name, price, image_url)."""
+        cards = self._snapshot[3]
+        for item in items:
+            cards[item["product_id"]] = (item["name"], item["price"], item.get("image_url"))
+
+        ids = sorted({item["product_id"] for item in items})
+        if len(ids) < 2:
+            return
+        with self._lock:
+            for delta in (self._delta, self._delta_next):
+                if delta is None:
+                    continue
+                for a in ids:
+                    row = delta.setdefault(a, {})
+                    for b in ids:
+                        if b != a:
+                            row[b] = row.get(b, 0) + 1
+
+    def set_card(self, product: dict):
+        self._snapshot[3][product["id"]] = (product["name"], product["price"], product["image_url"])
+
+    def drop_card(self, product_id: int):
+        self._snapshot[3].pop(product_id, None)
+
+    # ── Rebuild ───────────────────────────────────────────────────────────────
+
+    def rebuild(self, lines=None, cards=None):
+        """
+        Recompute the snapshot. `lines` / `cards` default to streaming
+        order_items and active products from the database.
+        """
+        started = time.perf_counter()
+        with self._lock:
+            self._delta_next = {}
+        try:
+            counter = PairCounter()
+            carry   = np.zeros(0, dtype=LINE_DTYPE)
+            for chunk in (lines if lines is not None else Order.stream_lines()):
+                batch = np.fromiter(chunk, dtype=LINE_DTYPE, count=len(chunk))
+                if len(carry):
+                    batch = np.concatenate([carry, batch])
+                # The last order may continue in the next chunk
+                cut          = np.searchsorted(batch["order_id"], batch["order_id"][-1])
+                carry, batch = batch[cut:], batch[:cut]
+                counter.add(order_pairs(batch["order_id"], batch["product_id"]))
+            counter.add(order_pairs(carry["order_id"], carry["product_id"]))
+            counter.compact()
+            offsets, neighbours, counts = top_k_csr(counter.keys, counter.counts, self.k)
+
+            card_map = {}
+            for chunk in (cards if cards is not None else Product.stream_cards()):
+                card_map.update((row[0], row[1:]) for row in chunk)
+        except BaseException:
+            with self._lock:
+                self._delta_next = None
+            raise
+
+        with self._lock:
+            self._snapshot = (offsets, neighbours, counts, card_map)
+            self._delta, self._delta_next = self._delta_next, None
+        self.built_at = time.time()
+        log.info("co-purchase index rebuilt: %d pairs, %d products in %.1fs",
+                 len(counter.keys), len(offsets) - 1, time.perf_counter() - started)
+
+    def start_background_refresh(self, interval: float):
+        if self._thread:
+            return
+
+        def loop():
+            if self.built_at:   # built before fork by a preloading parent (server.py)
+                time.sleep(max(0.0, interval - (time.time() - self.built_at)))
+            while True:
+                try:
+                    self.rebuild()
+                except Exception as e:
+                    log.warning("co-purchase index rebuild failed: %s", e)
+                time.sleep(interval)
+
+        self._thread = threading.Thread(target=loop, name="related-rebuild", daemon=True)
+        self._thread.start()
+
+
+related_index = CoPurchaseIndex(config.RELATED_TOP_K)
+
+
+# ── Service ────────────────────────────────────────────────────────────────────
+
+class RecommendationService:
+    """Thin service facade over the process-wide co-purchase index."""
+
+    @staticmethod
+    def start():
+        """Build the index in the background and keep it fresh."""
+        if config.RELATED_ENABLED:
+            related_index.start_background_refresh(config.RELATED_REBUILD_SECONDS)
+
+    @staticmethod
+    @traced()
+    def related_products(product_id: int, limit: int = 10) -> list:
+        limit = max(1, min(limit, config.RELATED_TOP_K))
+        return related_index.related(product_id, limit)
+
+    @staticmethod
+    def record_order(items: list):
+        related_index.record_order(items)
+
+    @staticmethod
+    def product_updated(product: dict):
+        related_index.set_card(product)
+
+    @staticmethod
+    def product_removed(product_id: int):
+        related_index.drop_card(product_id)
+
+    @staticmethod
+    def products_upserted(skus: list):
+        """Refresh the cards of bulk-imported products (the next rebuild catches up on failure)."""
+        if not config.RELATED_ENABLED or not skus:
+            return
+        try:
+            for product in Product.cards_by_sku(skus):
+                related_index.set_card(product)
+        except Exception as e:
+            log.warning("related-product card refresh failed: %s", e)
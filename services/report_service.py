@@ -0,0 +1,172 @@
+"""
+services/report_service.py
+──────────────────────────
+Bulk reporting over order_items — top sellers, revenue per category,
+basket size and price paid vs current price.
+
+Rows are streamed from an unbuffered cursor (Order.stream_items) in
+REPORT_CHUNK_SIZE chunks. Each chunk becomes a handful of NumPy column
+arrays and is folded into running per-product / per-category totals
+with bincount, so no per-row Python work happens after the conversion.
+Memory is bounded by one chunk plus arrays sized by the product,
+category and order id ranges.
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+
+from config import config
+from models.order   import Order
+from models.product import Product
+from utils.tracing  import traced
+
+
+ROW_DTYPE = np.dtype([
+    ("order_id",      np.int64),
+    ("product_id",    np.int64),
+    ("category_id",   np.int64),
+    ("quantity",      np.float64),
+    ("unit_price",    np.float64),
+    ("current_price", np.float64),
+])
+
+
+def _accumulate(totals: np.ndarray, index: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """totals[index] += weights (repeated indices summed), growing `totals` as needed."""
+    counts = np.bincount(index, weights=weights, minlength=len(totals))
+    if len(counts) > len(totals):
+        counts[:len(totals)] += totals
+        return counts
+    totals += counts
+    return totals
+
+
+class ItemReport:
+    """
+    Running aggregates over item chunks of
+    (order_id, product_id, category_id, quantity, unit_price, current_price).
+    """
+
+    def __init__(self):
+        self.rows              = 0
+        self._orders           = np.zeros(0, dtype=bool)   # order id → seen
+        self._product_units    = np.zeros(0)
+        self._product_revenue  = np.zeros(0)
+        self._product_current  = np.zeros(0)               # Σ units × current price
+        self._category_units   = np.zeros(0)
+        self._category_revenue = np.zeros(0)
+
+    def add(self, chunk: list):
+        if not chunk:
+            return
+        # One C-level pass from row tuples to a record array, then column views
+        rows        = np.fromiter(chunk, dtype=ROW_DTYPE, count=len(chunk))
+        order_id    = rows["order_id"]
+        product_id  = rows["product_id"]
+        category_id = rows["category_id"]
+        quantity    = rows["quantity"]
+        unit_price  = rows["unit_price"]
+        current     = rows["current_price"]
+
+        paid = quantity * unit_price
+        self.rows += len(chunk)
+
+        top_order = int(order_id.max())
+        if top_order >= len(self._orders):
+            self._orders = np.concatenate(
+                [self._orders, np.zeros(top_order + 1 - len(self._orders), dtype=bool)])
+        self._orders[order_id] = True
+
+        self._product_units    = _accumulate(self._product_units,    product_id,  quantity)
+        self._product_revenue  = _accumulate(self._product_revenue,  product_id,  paid)
+        self._product_current  = _accumulate(self._product_current,  product_id,  quantity * current)
+        self._category_units   = _accumulate(self._category_units,   category_id, quantity)
+        self._category_revenue = _accumulate(self._category_revenue, category_id, paid)
+
+    def result(self, top: int = 10) -> dict:
+        orders  = int(self._orders.sum())
+        units   = float(self._product_units.sum())
+        revenue = float(self._product_revenue.sum())
+        at_current_prices = float(self._product_current.sum())
+
+        # Top sellers by units, revenue as the tie-breaker
+        sold   = np.flatnonzero(self._product_units)
+        ranked = sold[np.lexsort((-self._product_revenue[sold], -self._product_units[sold]))][:top]
+        top_sellers = []
+        for pid in ranked.tolist():
+            units_sold = self._product_units[pid]
+            top_sellers.append({
+                "product_id":     pid,
+                "units":          int(units_sold),
+                "revenue":        round(float(self._product_revenue[pid]), 2),
+                "avg_price_paid": round(float(self._product_revenue[pid] / units_sold), 2),
+                "current_price":  round(float(self._product_current[pid] / units_sold), 2),
+            })
+
+        categories = np.flatnonzero(self._category_units)
+        by_category = sorted((
+            {
+                "category_id": cid or None,
+                "units":       int(self._category_units[cid]),
+                "revenue":     round(float(self._category_revenue[cid]), 2),
+            }
+            for cid in categories.tolist()
+        ), key=lambda c: c["revenue"], reverse=True)
+
+        return {
+            "rows":        self.rows,
+            "orders":      orders,
+            "units":       int(units),
+            "revenue":     round(revenue, 2),
+            "basket": {
+                "avg_units": round(units / orders, 2) if orders else 0.0,
+                "avg_value": round(revenue / orders, 2) if orders else 0.0,
+            },
+            "pricing": {
+                "revenue_at_current_prices": round(at_current_prices, 2),
+                "change_pct": round((at_current_prices / revenue - 1) * 100, 2) if revenue else 0.0,
+            },
+            "top_sellers": top_sellers,
+            "by_category": by_category,
+        }
+
+
+class ReportService:
+    """Admin reporting built on streamed, vectorised aggregation."""
+
+    @staticmethod
+    def date_range(date_from: str = None, date_to: str = None, default_days: int = 30) -> tuple:
+        """Parse inclusive ISO dates (default: the last `default_days` days)."""
+        try:
+            end   = date.fromisoformat(date_to) if date_to else date.today()
+            start = (date.fromisoformat(date_from) if date_from
+                     else end - timedelta(days=default_days - 1))
+        except ValueError:
+            raise ValueError("Dates must be in YYYY-MM-DD format")
+        if start > end:
+            raise ValueError("'from' must not be after 'to'")
+        return start, end
+
+    @staticmethod
+    @traced()
+    def item_report(date_from: str = None, date_to: str = None,
+                    top: int = 10, chunk_size: int = None) -> dict:
+        """Aggregate every non-cancelled order line placed in [date_from, date_to]."""
+        start, end = ReportService.date_range(date_from, date_to)
+        top        = max(1, min(int(top), 100))
+
+        report = ItemReport()
+        for chunk in Order.stream_items(str(start), str(end + timedelta(days=1)),
+                                        chunk_size or config.REPORT_CHUNK_SIZE):
+            report.add(chunk)
+        result = report.result(top)
+
+        names = Product.names_by_id([p["product_id"] for p in result["top_sellers"]])
+        for product in result["top_sellers"]:
+            product["name"] = names.get(product["product_id"])
+        categories = {c["id"]: c["name"] for c in Product.get_categories() or []}
+        for category in result["by_category"]:
+            category["category_name"] = categories.get(category["category_id"], "Uncategorized")
+
+        return {"from": str(start), "to": str(end), **result}
@@ -0,0 +1,131 @@
+"""
+services/stock_service.py
+─────────────────────────
+Warehouse stock sync — POST /products/stock-sync and
+`python -m tools.stock_sync`.
+
+A delta file has one `sku,quantity` line per product:
+
+    sku,stock          optional header
+    # comment          comments and blank lines are skipped
+    SKU-001,25         absolute — stock becomes 25
+    SKU-002,+5         relative — stock goes up by 5
+    SKU-003,-2         relative — down by 2, never below 0
+
+The file is memory-mapped and split into lines without decoding it as
+a whole. Lines are applied STOCK_SYNC_BATCH_SIZE at a time, each batch
+in its own transaction: the SKUs are looked up, and one SELECT … FOR
+UPDATE by id (the order checkout locks in) reads the current stock; the
+new values are computed in Python (several lines for one SKU apply in
+file order), and a single UPDATE writes only the products whose stock
+actually changes. A failed batch is reported line by line and the sync
+continues with the next one. A file without a single well-formed line
+is rejected with ValueError.
+"""
+
+import mmap
+import os
+import shutil
+import tempfile
+
+from config import config
+from models.product import Product
+from utils.db import transaction
+from utils.tracing import traced
+
+BAD_LINE = "Expected 'sku,stock' (absolute) or 'sku,+n' / 'sku,-n' (relative)"
+
+
+def _deltas(buffer):
+    """(line number, sku, relative, value) per data line; sku None for a bad line."""
+    for line_no, line in enumerate(iter(buffer.readline, b""), 1):
+        line = line.strip()
+        if not line or line.startswith(b"#") or (line_no == 1 and line.lower().startswith(b"sku,")):
+            continue
+        sku, _, quantity = line.partition(b",")
+        sku, quantity    = sku.strip(), quantity.strip()
+        try:
+            value = int(quantity)
+        except ValueError:
+            sku = None
+        if not sku:
+            yield line_no, None, False, 0
+            continue
+        yield line_no, sku.decode("utf-8", "replace"), quantity[:1] in b"+-", value
+
+
+class StockService:
+    """Batched stock updates from warehouse delta files."""
+
+    @staticmethod
+    def _fail(report: dict, line_no: int, message: str):
+        report["failed"] += 1
+        if len(report["errors"]) < config.IMPORT_MAX_ERRORS:
+            report["errors"].append({"line": line_no, "error": message})
+
+    @staticmethod
+    def _apply(batch: list, report: dict):
+        """Apply one batch of (line number, sku, relative, value) in one transaction."""
+        failures = []
+        try:
+            with transaction() as tx:
+                current = Product.lock_stock(tx, list({sku for _, sku, _, _ in batch}))
+                stock   = {}
+                for line_no, sku, relative, value in batch:
+                    if sku not in current:
+                        failures.append((line_no, f"Unknown SKU {sku}"))
+                        continue
+                    old        = stock.get(sku, current[sku][1])
+                    stock[sku] = max(0, old + value) if relative else value
+                changed = {current[sku][0]: new for sku, new in stock.items() if new != current[sku][1]}
+                if changed:
+                    Product.set_stock(tx, changed)
+        except Exception as e:
+            for line_no, *_ in batch:
+                StockService._fail(report, line_no, str(e))
+            return
+
+        for line_no, message in failures:
+            StockService._fail(report, line_no, message)
+        report["updated"]   += len(changed)
+        report["unchanged"] += len(stock) - len(changed)
+
+    @staticmethod
+    @traced()
+    def sync_file(file) -> dict:
+        """
+        Apply the delta file open as `file` (binary, on disk). Returns
+        {"lines", "updated", "unchanged", "failed", "errors": [{"line",
+        "error"}]} — updated / unchanged count products, the rest lines.
+        Raises ValueError when no line of the file can be parsed.
+        """
+        report = {"lines": 0, "updated": 0, "unchanged": 0, "failed": 0, "errors": []}
+        if os.fstat(file.fileno()).st_size == 0:
+            return report
+
+        batch  = []
+        parsed = 0
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            for line_no, sku, relative, value in _deltas(buffer):
+                report["lines"] += 1
+                if sku is None:
+                    StockService._fail(report, line_no, BAD_LINE)
+                    continue
+                parsed += 1
+                batch.append((line_no, sku, relative, value))
+                if len(batch) >= config.STOCK_SYNC_BATCH_SIZE:
+                    StockService._apply(batch, report)
+                    batch = []
+        if report["lines"] and not parsed:
+            raise ValueError(f"Not a stock delta file: {BAD_LINE}")
+        if batch:
+            StockService._apply(batch, report)
+        return report
+
+    @staticmethod
+    def sync_stream(stream) -> dict:
+        """Spool an uploaded delta file (e.g. request.stream) to disk, then sync_file() it."""
+        with tempfile.TemporaryFile() as file:
+            shutil.copyfileobj(stream, file, 1 << 20)
+            file.flush()
+            return StockService.sync_file(file)
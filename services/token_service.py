@@ -0,0 +1,109 @@
+"""
+services/token_service.py
+─────────────────────────
+Token revocation — logout, refresh-token rotation and "sign out
+everywhere" on password change.
+
+Revocations are written to token_revocations and applied to this
+process's in-memory list straight away, so they take effect here
+immediately. Other workers load the whole log on startup and pull new
+rows every REVOCATION_SYNC_SECONDS, re-reading the last
+REVOCATION_SYNC_MARGIN seconds of it each time (see utils/revocation.py),
+measured by the database's clock, which stamps the rows. Refresh-token
+use is checked against the database itself: rotating a token that
+another worker already rotated fails on the jti's unique key.
+"""
+
+import logging
+import threading
+import time
+
+from config import config
+from models.token import TokenRevocation
+from utils.revocation import revocations
+from utils.tracing import traced
+
+log = logging.getLogger("ecommerce.tokens")
+
+PURGE_INTERVAL = 3600   # seconds between deletions of expired log rows
+
+
+class TokenService:
+    """Writes revocations and keeps the process-wide revocation list in sync."""
+
+    _thread = None
+
+    # ── Revoking ───────────────────────────────────────────────
+
+    @staticmethod
+    @traced()
+    def revoke(payload: dict) -> bool:
+        """
+        Revoke one decoded token. False when it was already revoked —
+        for a refresh token that means it has been used before.
+        Tokens without a jti (issued before ids existed) are left alone.
+        """
+        jti = payload.get("jti")
+        if jti is None:
+            return True
+        first = TokenRevocation.revoke(jti, payload["sub"], payload["exp"])
+        revocations.add(payload["sub"], payload["exp"], jti=jti)
+        return first
+
+    @staticmethod
+    @traced()
+    def revoke_all(user_id: int):
+        """
+        Revoke every token issued to the user before this second. iat has
+        one-second resolution, so tokens issued within the same second,
+        including the ones change_password hands back, stay valid.
+        """
+        not_before = int(time.time())
+        expires_at = not_before + int(config.JWT_REFRESH_EXPIRY.total_seconds())
+        TokenRevocation.revoke_all(user_id, not_before, expires_at)
+        revocations.add(user_id, expires_at, not_before=not_before)
+
+    @staticmethod
+    @traced()
+    def revoked_by_cutoff(payload: dict) -> bool:
+        """Authoritative (database) check of the user's cutoff, for refresh."""
+        return payload.get("iat", 0) < TokenRevocation.not_before(payload["sub"])
+
+    # ── In-memory list ─────────────────────────────────────────
+
+    @staticmethod
+    def sync():
+        """Apply revocations logged since the last settled row (all of them on the first)."""
+        started = TokenRevocation.clock()   # created_at's clock, whatever this host's says
+        for row in TokenRevocation.since(revocations.last_id, started):
+            revocations.add(row["user_id"], row["expires_at"], jti=row["jti"],
+                            not_before=row["not_before"], row_id=row["id"], created=row["created"])
+        revocations.settle(started - config.REVOCATION_SYNC_MARGIN)
+
+    @staticmethod
+    def start():
+        """Load the revocation log, then keep following it in the background."""
+        if TokenService._thread:
+            return
+        try:
+            TokenService.sync()
+            log.info("revocation list loaded: %d entries", len(revocations))
+        except Exception as e:
+            log.warning("revocation list load failed, retrying in background: %s", e)
+
+        def loop():
+            purged = time.monotonic()
+            while True:
+                time.sleep(config.REVOCATION_SYNC_SECONDS)
+                try:
+                    TokenService.sync()
+                    if time.monotonic() - purged >= PURGE_INTERVAL:
+                        now = int(time.time())
+                        TokenRevocation.purge(now)
+                        revocations.prune(now)
+                        purged = time.monotonic()
+                except Exception as e:
+                    log.warning("revocation sync failed: %s", e)
+
+        TokenService._thread = threading.Thread(target=loop, name="revocation-sync", daemon=True)
+        TokenService._thread.start()
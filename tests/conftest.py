@@ -0,0 +1,20 @@
+"""
+tests/conftest.py
+─────────────────
+Every test boots its own SQLite stand-in, so create_app() must not start
+the per-process background threads (rollup queue, revocation sync,
+related-products refresh, ...): they outlive the test that started them,
+and one still holding a pooled connection hands it back to the pool
+after the next test has pointed utils.db at a new database. Tests call
+the background work (SalesRollup.apply_pending, TokenService.sync, …)
+themselves.
+"""
+
+import pytest
+
+import app
+
+
+@pytest.fixture(autouse=True)
+def no_background_tasks(monkeypatch):
+    monkeypatch.setattr(app, "start_background_tasks", lambda: None)
@@ -0,0 +1,134 @@
+"""
+tests/test_async_routes.py
+──────────────────────────
+The catalogue, cart and checkout endpoints behave the same served by
+the sync views (utils.db) and by the coroutine ones (routes/
+async_routes.py on utils.adb): responses, stock checks, the order
+written, and a spent deadline answered 504.
+
+Run:
+    python -m pytest tests
+"""
+
+import inspect
+import os
+import sqlite3
+
+import pytest
+
+from benchmarks import harness
+from routes.async_routes import ASYNC_VIEWS
+from utils import adb, db
+
+
+def boot(tmp_path, mode: str, *argv):
+    argv = list(argv) + (["--async-routes"] if mode == "async" else [])
+    app, tokens, dataset = harness.boot(harness.build_parser().parse_args(argv), str(tmp_path))
+    return app, tokens, os.path.join(tmp_path, "bench.db")
+
+
+def shutdown():
+    db.close_pools()
+    adb.close_pools()
+
+
+@pytest.fixture(params=("sync", "async"))
+def client(request, tmp_path):
+    yield boot(tmp_path, request.param)
+    shutdown()
+
+
+def stock(path: str, product_id: int) -> int:
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT stock FROM products WHERE id = ?", (product_id,)).fetchone()[0]
+
+
+def set_stock(path: str, product_id: int, value: int):
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE products SET stock = ? WHERE id = ?", (value, product_id))
+
+
+@pytest.mark.parametrize("mode", ("sync", "async"))
+def test_async_routes_swap_in_only_their_endpoints(tmp_path, mode):
+    app, _, _ = boot(tmp_path, mode)
+    shutdown()
+    coroutines = {e for e, view in app.view_functions.items() if inspect.iscoroutinefunction(view)}
+    assert coroutines == (set(ASYNC_VIEWS) if mode == "async" else set())
+
+
+def test_catalogue(client):
+    app, _, _ = client
+    http = app.test_client()
+
+    listing = http.get("/products/?per_page=5&sort_by=price&order=ASC").get_json()
+    prices  = [p["price"] for p in listing["data"]]
+    assert len(prices) == 5 and prices == sorted(prices)
+    assert listing["pagination"]["total"] == 1000
+
+    many = http.get("/products/?ids=3,1,999999&fields=id,name").get_json()
+    assert [p["id"] for p in many["data"]] == [3, 1]
+    assert many["meta"]["missing"] == [999999]
+    assert set(many["data"][0]) == {"id", "name"}
+
+    assert http.get("/products/1?fields=id,stock").get_json()["data"] == {"id": 1, "stock": 1_000_000}
+    assert http.get("/products/999999").status_code == 404
+    assert http.get("/products/1?fields=nope").status_code == 400
+
+
+def test_cart_and_checkout(client):
+    app, tokens, path = client
+    http    = app.test_client()
+    headers = {"Authorization": f"Bearer {tokens['users'][0]}"}
+
+    assert http.post("/cart/", headers=headers, json={"product_id": 7, "quantity": 2}).status_code == 201
+    cart = http.post("/cart/", headers=headers, json={"product_id": 9, "quantity": 1}).get_json()["data"]
+    assert [(i["product_id"], i["quantity"]) for i in cart["items"]] == [(7, 2), (9, 1)]
+    assert http.get("/cart/", headers=headers).get_json()["data"] == cart
+
+    too_many = http.post("/cart/", headers=headers, json={"product_id": 7, "quantity": 2_000_000})
+    assert too_many.status_code == 400
+    assert http.get("/cart/").status_code == 401
+
+    placed = http.post("/orders/", headers=headers, json={"shipping_address": "1 Test Road"})
+    assert placed.status_code == 201
+    order = placed.get_json()["data"]
+    assert order["status"] == "pending"
+    assert order["total_amount"] == pytest.approx(cart["total"])
+    assert sorted((i["product_id"], i["quantity"]) for i in order["items"]) == [(7, 2), (9, 1)]
+    assert (stock(path, 7), stock(path, 9)) == (1_000_000 - 2, 1_000_000 - 1)
+    assert http.get("/cart/", headers=headers).get_json()["data"]["items"] == []
+
+    fetched = http.get(f"/orders/{order['id']}", headers=headers).get_json()["data"]
+    assert fetched == order
+    preview = http.get(f"/orders/{order['id']}?fields=id,status", headers=headers).get_json()["data"]
+    assert preview == {"id": order["id"], "status": "pending"}
+
+    other = {"Authorization": f"Bearer {tokens['users'][1]}"}
+    assert http.get(f"/orders/{order['id']}", headers=other).status_code == 404
+
+
+def test_checkout_refuses_what_is_no_longer_in_stock(client):
+    app, tokens, path = client
+    http    = app.test_client()
+    headers = {"Authorization": f"Bearer {tokens['users'][0]}"}
+
+    http.post("/cart/", headers=headers, json={"product_id": 5, "quantity": 3})
+    set_stock(path, 5, 2)
+
+    refused = http.post("/orders/", headers=headers, json={"shipping_address": "1 Test Road"})
+    assert refused.status_code == 400
+    assert "Available: 2, requested: 3" in refused.get_json()["message"]
+    assert stock(path, 5) == 2
+    assert len(http.get("/cart/", headers=headers).get_json()["data"]["items"]) == 1
+
+    assert http.post("/orders/", headers=headers, json={}).status_code == 400
+
+
+@pytest.mark.parametrize("mode", ("sync", "async"))
+def test_spent_deadline_is_a_504(tmp_path, mode):
+    app, _, _ = boot(tmp_path, mode, "--latency-ms", "30")
+    try:
+        response = app.test_client().get("/products/", headers={"X-Request-Timeout": "0.01"})
+    finally:
+        shutdown()
+    assert response.status_code == 504
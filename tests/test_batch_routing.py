@@ -0,0 +1,101 @@
+"""
+tests/test_batch_routing.py
+───────────────────────────
+Read-your-writes across /batch sub-requests, with a read replica
+configured: once a sub-request writes, later sub-requests read from the
+primary; the next request starts on the replica again. Runs against
+both the sync views and the coroutine ones (utils.adb).
+
+Run:
+    python -m pytest tests
+"""
+
+import threading
+
+import pytest
+
+from benchmarks import harness
+from utils import adb, db
+
+
+class Recorder(db.QueryListener):
+    """Logs (role, statement) — role being the pool that served the statement."""
+
+    def __init__(self):
+        self.log   = []
+        self.local = threading.local()
+
+    def on_query(self, query, params, seconds, rows=None, error=None):
+        self.log.append((self.local.role, query))
+
+
+@pytest.fixture(params=("sync", "async"))
+def client(request, tmp_path, monkeypatch):
+    argv = ["--async-routes"] if request.param == "async" else []
+    app, tokens, dataset = harness.boot(harness.build_parser().parse_args(argv), str(tmp_path))
+    recorder = Recorder()
+    connect  = db._connect
+    aconnect = adb._connect
+
+    def tag(conn):
+        recorder.local.role = "replica" if conn.pool.host == "replica" else "primary"
+        return conn
+
+    async def atagged(readonly):
+        return tag(await aconnect(readonly))
+
+    monkeypatch.setattr(db, "_connect", lambda readonly: tag(connect(readonly)))
+    monkeypatch.setattr(adb, "_connect", atagged)
+    monkeypatch.setattr(db, "replicas", [db.Replica("replica", 3307)])
+    db.add_listener(recorder)
+    yield app.test_client(), tokens, dataset, recorder.log
+    db.remove_listener(recorder)
+    db.close_pools()
+    adb.close_pools()
+
+
+def cart_reads(log: list) -> list:
+    """Roles that served the cart SELECTs, in order."""
+    return [role for role, query in log
+            if query.lstrip().upper().startswith("SELECT") and "FROM cart " in query]
+
+
+def test_reads_after_a_write_in_a_batch_go_to_the_primary(client):
+    client, tokens, dataset, log = client
+    headers = {"Authorization": f"Bearer {tokens['users'][0]}"}
+
+    response = client.post("/batch", headers=headers, json={"requests": [
+        {"method": "GET",  "path": "/cart/"},
+        {"method": "POST", "path": "/cart/", "body": {"product_id": 1, "quantity": 1}},
+        {"method": "GET",  "path": "/cart/"},
+        {"method": "GET",  "path": "/cart/"},
+    ]})
+
+    assert response.status_code == 200
+    assert [r["status"] for r in response.get_json()["data"]] == [200, 201, 200, 200]
+    reads = cart_reads(log)
+    assert reads[0] == "replica"
+    assert reads[-2:] == ["primary", "primary"]
+
+
+def test_next_request_reads_from_the_replica_again(client):
+    client, tokens, dataset, log = client
+    headers = {"Authorization": f"Bearer {tokens['users'][0]}"}
+
+    client.post("/batch", headers=headers, json={"requests": [
+        {"method": "POST", "path": "/cart/", "body": {"product_id": 1, "quantity": 1}},
+    ]})
+    log.clear()
+    assert client.get("/cart/", headers=headers).status_code == 200
+    assert cart_reads(log) == ["replica"]
+
+
+def test_a_batch_without_writes_stays_on_the_replica(client):
+    client, tokens, dataset, log = client
+    headers = {"Authorization": f"Bearer {tokens['users'][0]}"}
+
+    client.post("/batch", headers=headers, json={"requests": [
+        {"method": "GET", "path": "/cart/"},
+        {"method": "GET", "path": "/cart/"},
+    ]})
+    assert cart_reads(log) == ["replica", "replica"]
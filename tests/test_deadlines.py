@@ -0,0 +1,89 @@
+"""
+tests/test_deadlines.py
+───────────────────────
+Request deadlines on the sync path (utils.deadline, utils.db): a budget
+spent before a statement starts or while MySQL runs it is answered 504,
+and a pooled connection's MAX_EXECUTION_TIME does not outlive the
+request that set it. tests/test_async_routes.py covers the async twin.
+
+Run:
+    python -m pytest tests
+"""
+
+import pytest
+
+from benchmarks import harness
+from config import config
+from utils import db
+
+
+class Recorder(db.QueryListener):
+    def __init__(self):
+        self.queries = []
+
+    def on_query(self, query, params, seconds, rows=None, error=None):
+        self.queries.append((query, error))
+
+
+@pytest.fixture
+def boot(tmp_path, monkeypatch):
+    """boot(*harness argv) → (test client, pooled connections used, recorder)."""
+    recorder = Recorder()
+    used     = []
+
+    def start(*argv):
+        app, _, _ = harness.boot(harness.build_parser().parse_args(list(argv)), str(tmp_path))
+        db.close_pools()   # start from an empty pool
+        connect = db._connect
+        monkeypatch.setattr(db, "_connect", lambda readonly: used.append(connect(readonly)) or used[-1])
+        db.add_listener(recorder)
+        return app.test_client(), used, recorder
+
+    yield start
+    db.remove_listener(recorder)
+    db.close_pools()
+
+
+def assert_504(response):
+    assert response.status_code == 504
+    assert response.get_json()["message"] == "Request deadline exceeded"
+
+
+def test_statement_aborted_by_max_execution_time_is_a_504(boot):
+    http, used, recorder = boot("--latency-ms", "30")
+    # GET /products/ turns errors into 500s itself; the deadline hook makes it a 504
+    assert_504(http.get("/products/", headers={"X-Request-Timeout": "0.01"}))
+    assert recorder.queries and recorder.queries[-1][1] is not None   # sent, then aborted
+
+
+def test_deadline_spent_before_the_statement_is_a_504(boot):
+    http, used, recorder = boot("--connect-latency-ms", "30")
+    assert_504(http.get("/products/1", headers={"X-Request-Timeout": "0.01"}))
+    assert recorder.queries == []   # nothing sent once the budget was gone
+
+
+def test_configured_budget_applies_without_the_header(boot, monkeypatch):
+    http, used, recorder = boot("--latency-ms", "30")
+    monkeypatch.setitem(config.REQUEST_TIMEOUTS, "products", 0.01)
+    assert_504(http.get("/products/"))
+
+
+def test_bad_timeout_header_is_a_400(boot):
+    http, used, recorder = boot()
+    assert http.get("/products/", headers={"X-Request-Timeout": "soon"}).status_code == 400
+
+
+def test_max_execution_time_is_reset_for_a_request_without_deadline(boot, monkeypatch):
+    http, used, recorder = boot()
+    assert http.get("/products/1", headers={"X-Request-Timeout": "0.02"}).status_code == 200
+    conn = used[-1]
+    assert 0 < conn.max_execution_time <= 20
+    assert conn.raw.max_execution_time == conn.max_execution_time   # the SET reached the session
+
+    # The next request reuses the connection, has no deadline, and its
+    # statement takes longer than the previous request's limit
+    monkeypatch.setitem(config.REQUEST_TIMEOUTS, "products", None)
+    conn.raw.latency = 0.03
+    assert http.get("/products/1").status_code == 200
+    assert used[-1] is conn
+    assert conn.max_execution_time == 0 and conn.raw.max_execution_time == 0
@@ -0,0 +1,67 @@
+"""
+tests/test_fingerprint.py
+─────────────────────────
+utils.db.fingerprint() gives a statement built for any number of rows
+or ids one shape, so the per-fingerprint metrics labels and the trace
+db.statement attribute stay bounded.
+
+Run:
+    python -m pytest tests
+"""
+
+import pytest
+
+import models.product
+from models.order import Order
+from models.product import Product
+from models.sales import SalesRollup
+from utils import db
+
+
+def shapes(build, sizes=(1, 2, 7, 100)) -> set:
+    return {db.fingerprint(build(n)[0]) for n in sizes}
+
+
+def test_literals_and_whitespace():
+    assert db.fingerprint("SELECT *\n  FROM t WHERE a = 'it\\'s' AND b = 4.5 AND c = %s") == \
+           "SELECT * FROM t WHERE a = ? AND b = ? AND c = ?"
+
+
+def test_in_lists_collapse():
+    assert shapes(lambda n: Product._lock_by_id(list(range(n)))) == {
+        "SELECT id, sku, stock FROM products WHERE id IN (?+) AND is_active = TRUE "
+        "ORDER BY id FOR UPDATE"
+    }
+
+
+@pytest.mark.parametrize("build", [
+    lambda n: Order._items_insert(1, [{"product_id": i, "quantity": 1, "price": 1.0}
+                                      for i in range(n)]),
+    lambda n: SalesRollup._queue_insert(list(range(n)), None, "pending"),
+], ids=["order items", "rollup queue"])
+def test_multi_row_values_collapse(build):
+    (shape,) = shapes(build)
+    assert shape.endswith("VALUES (?+)")
+
+
+def test_bulk_upsert_collapses(monkeypatch):
+    sent = []
+    monkeypatch.setattr(models.product, "execute_query", lambda query, params: sent.append(query))
+    row = (None, "name", "", 1.0, 1, None, None)   # IMPORT_COLUMNS order
+    for n in (1, 3, 50):
+        Product.upsert_many([row] * n)
+    (shape,) = {db.fingerprint(q) for q in sent}
+    assert " VALUES (?+) ON DUPLICATE KEY UPDATE " in shape
+    assert "VALUES(name)" in shape   # the column references are left alone
+
+
+def test_case_runs_collapse():
+    (shape,) = shapes(lambda n: Product._set_stock({i: i * 10 for i in range(1, n + 1)}))
+    assert shape == "UPDATE products SET stock = CASE id WHEN ?+ THEN ?+ END WHERE id IN (?+)"
+
+
+def test_different_statements_stay_apart():
+    assert db.fingerprint("SELECT a FROM t WHERE id IN (%s, %s)") != \
+           db.fingerprint("SELECT b FROM t WHERE id IN (%s, %s)")
+    assert db.fingerprint("INSERT INTO t (a, b) VALUES (%s, NOW())") == \
+           "INSERT INTO t (a, b) VALUES (?, NOW())"
@@ -0,0 +1,164 @@
+"""
+tests/test_order_status.py
+──────────────────────────
+PUT /orders/admin/status (OrderService.bulk_update_status →
+Order.update_statuses): only the moves in Order.TRANSITIONS are applied,
+every order gets a result in request order, and a mixed batch leaves the
+per-user summaries and — once the queue is applied — the sales rollups
+exactly as recomputing them from the orders would.
+
+Run:
+    python -m pytest tests
+"""
+
+import os
+import sqlite3
+
+import pytest
+
+from benchmarks import harness
+from config import config
+from models.sales import SalesRollup
+from utils import db
+
+
+@pytest.fixture
+def client(tmp_path):
+    app, tokens, dataset = harness.boot(harness.build_parser().parse_args([]), str(tmp_path))
+    yield (app.test_client(), {"Authorization": f"Bearer {tokens['admin']}"},
+           os.path.join(tmp_path, "bench.db"))
+    db.close_pools()
+
+
+def query(path: str, sql: str, params: tuple = ()) -> list:
+    with sqlite3.connect(path) as conn:
+        return conn.execute(sql, params).fetchall()
+
+
+def orders_in(path: str, status: str, n: int) -> list:
+    return [r[0] for r in query(path, "SELECT id FROM orders WHERE status = ? ORDER BY id LIMIT ?",
+                                (status, n))]
+
+
+def statuses(path: str, ids: list) -> dict:
+    return dict(query(path, f"SELECT id, status FROM orders WHERE id IN ({', '.join('?' * len(ids))})",
+                      tuple(ids)))
+
+
+def summaries(path: str) -> tuple:
+    """user_order_summary as stored, and as recomputed from orders."""
+    stored = query(path, """SELECT user_id, total_orders, pending_orders, confirmed_orders,
+                                   shipped_orders, delivered_orders, cancelled_orders,
+                                   ROUND(lifetime_spend, 2)
+                            FROM user_order_summary""")
+    recomputed = query(path, """SELECT user_id, COUNT(*), SUM(status = 'pending'),
+                                       SUM(status = 'confirmed'), SUM(status = 'shipped'),
+                                       SUM(status = 'delivered'), SUM(status = 'cancelled'),
+                                       ROUND(COALESCE(SUM(CASE WHEN status <> 'cancelled'
+                                                               THEN total_amount END), 0), 2)
+                                FROM orders GROUP BY user_id""")
+    return {r[0]: r[1:] for r in stored}, {r[0]: r[1:] for r in recomputed}
+
+
+def rollups(path: str) -> tuple:
+    """Both rollup tables, empty buckets left out."""
+    daily = query(path, """SELECT day, status, order_count, units, ROUND(revenue, 2)
+                           FROM sales_daily WHERE order_count <> 0 ORDER BY day, status""")
+    by_category = query(path, """SELECT day, category_id, status, order_count, units, ROUND(revenue, 2)
+                                 FROM sales_daily_category WHERE order_count <> 0
+                                 ORDER BY day, category_id, status""")
+    return daily, by_category
+
+
+def applied_and_rebuilt(path: str) -> tuple:
+    while SalesRollup.apply_pending():
+        pass
+    applied = rollups(path)
+    SalesRollup.rebuild()
+    return applied, rollups(path)
+
+
+def test_allowed_and_rejected_transitions(client):
+    http, admin, path = client
+    pending      = orders_in(path, "pending", 2)
+    delivered,   = orders_in(path, "delivered", 1)
+    cancelled,   = orders_in(path, "cancelled", 1)
+    shipped,     = orders_in(path, "shipped", 1)
+
+    response = http.put("/orders/admin/status", headers=admin, json={"orders": [
+        {"id": pending[0], "status": "confirmed"},
+        {"id": delivered,  "status": "pending"},
+        {"id": cancelled,  "status": "shipped"},
+        {"id": pending[1], "status": "pending"},
+        {"id": 999999,     "status": "shipped"},
+        {"id": pending[0], "status": "cancelled"},
+        {"id": shipped,    "status": "lost"},
+        {"id": "x",        "status": "shipped"},
+    ]})
+    assert response.status_code == 200
+    report = response.get_json()["data"]
+    assert (report["updated"], report["unchanged"], report["failed"]) == (1, 1, 6)
+    assert report["results"] == [
+        {"id": pending[0], "status": "confirmed", "previous": "pending"},
+        {"id": delivered,  "error": "Cannot change status from 'delivered' to 'pending'"},
+        {"id": cancelled,  "error": "Cannot change status from 'cancelled' to 'shipped'"},
+        {"id": pending[1], "status": "pending", "previous": "pending"},
+        {"id": 999999,     "error": "Order not found"},
+        {"id": pending[0], "error": "Duplicate order id"},
+        {"id": shipped,    "error": "Invalid status 'lost'"},
+        {"id": "x",        "error": 'Expected {"id": <int>, "status": <status>}'},
+    ]
+    assert statuses(path, [*pending, delivered, cancelled, shipped]) == {
+        pending[0]: "confirmed", pending[1]: "pending",
+        delivered: "delivered", cancelled: "cancelled", shipped: "shipped",
+    }
+
+    stored, recomputed = summaries(path)
+    assert stored == recomputed
+
+    assert http.put("/orders/admin/status", headers=admin, json={"orders": []}).status_code == 400
+    assert http.put("/orders/admin/status", headers=admin, json=[1]).status_code == 400
+
+
+def test_mixed_batch_keeps_summaries_and_rollups_exact(client, monkeypatch):
+    http, admin, path = client
+    monkeypatch.setattr(config, "ORDER_STATUS_BATCH_SIZE", 3)   # several transactions
+    while SalesRollup.apply_pending():
+        pass
+
+    # Every order of the busiest user (several per (old, new) pair in one upsert) plus a spread
+    (user_id,) = query(path, "SELECT user_id FROM orders GROUP BY user_id ORDER BY COUNT(*) DESC LIMIT 1")[0]
+    own = dict(query(path, "SELECT id, status FROM orders WHERE user_id = ?", (user_id,)))
+    next_status = {"pending": "cancelled", "confirmed": "shipped", "shipped": "delivered"}
+    targets = {order_id: next_status[status] for order_id, status in own.items() if status in next_status}
+    for status, new, n in (("pending", "confirmed", 3), ("pending", "cancelled", 2),
+                           ("confirmed", "cancelled", 2), ("shipped", "delivered", 2)):
+        for order_id in orders_in(path, status, 20):
+            if n and order_id not in targets:
+                targets[order_id] = new
+                n -= 1
+    rejected, = [i for i in orders_in(path, "delivered", 10) if i not in own][:1]
+    before = statuses(path, list(targets))
+    queued = []
+    move_many = SalesRollup.move_many
+    monkeypatch.setattr(SalesRollup, "move_many", staticmethod(
+        lambda tx, ids, old, new: (queued.extend((i, old, new) for i in ids), move_many(tx, ids, old, new))
+    ))
+
+    response = http.put("/orders/admin/status", headers=admin, json={"orders": [
+        *({"id": order_id, "status": status} for order_id, status in targets.items()),
+        {"id": rejected, "status": "cancelled"},
+    ]})
+    report = response.get_json()["data"]
+    assert (report["updated"], report["failed"]) == (len(targets), 1)
+    assert {r["id"]: r["previous"] for r in report["results"][:-1]} == before
+    assert statuses(path, list(targets)) == targets
+    assert statuses(path, [rejected]) == {rejected: "delivered"}
+
+    stored, recomputed = summaries(path)
+    assert stored[user_id] == recomputed[user_id]
+    assert stored == recomputed
+
+    assert sorted(queued) == sorted((order_id, before[order_id], new) for order_id, new in targets.items())
+    applied, rebuilt = applied_and_rebuilt(path)
+    assert applied == rebuilt
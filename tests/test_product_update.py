@@ -0,0 +1,51 @@
+"""
+tests/test_product_update.py
+────────────────────────────
+PUT /products/<id> answers with the product as updated — also when the
+update deactivates it — and keeps the related-product cards in step.
+
+Run:
+    python -m pytest tests
+"""
+
+import pytest
+
+from benchmarks import harness
+from services.recommendation_service import RecommendationService
+from utils import db
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    app, tokens, dataset = harness.boot(harness.build_parser().parse_args([]), str(tmp_path))
+    calls = []
+    monkeypatch.setattr(RecommendationService, "product_updated",
+                        staticmethod(lambda product: calls.append(("updated", product["id"]))))
+    monkeypatch.setattr(RecommendationService, "product_removed",
+                        staticmethod(lambda product_id: calls.append(("removed", product_id))))
+    yield app.test_client(), {"Authorization": f"Bearer {tokens['admin']}"}, calls
+    db.close_pools()
+
+
+def test_update_returns_the_product(client):
+    http, admin, calls = client
+    response = http.put("/products/4", headers=admin, json={"price": 12.5})
+    assert response.status_code == 200
+    assert response.get_json()["data"]["price"] == 12.5
+    assert calls == [("updated", 4)]
+
+
+def test_deactivating_update_returns_the_product(client):
+    http, admin, calls = client
+    response = http.put("/products/4", headers=admin, json={"is_active": False, "stock": 3})
+    assert response.status_code == 200
+    product = response.get_json()["data"]
+    assert (product["id"], product["stock"], bool(product["is_active"])) == (4, 3, False)
+    assert calls == [("removed", 4)]
+    assert http.get("/products/4").status_code == 404
+
+
+def test_update_of_a_missing_product(client):
+    http, admin, calls = client
+    assert http.put("/products/999999", headers=admin, json={"price": 1}).status_code == 400
+    assert calls == []
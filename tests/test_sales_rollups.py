@@ -0,0 +1,118 @@
+"""
+tests/test_sales_rollups.py
+───────────────────────────
+Checkouts and status moves only queue rollup changes; applying the queue
+(SalesRollup.apply_pending, a batch at a time) must give the same totals
+as recomputing them (SalesRollup.rebuild), which also empties the queue.
+Categories are the ones at purchase, in the rollups and the item report.
+
+Run:
+    python -m pytest tests
+"""
+
+import os
+import sqlite3
+
+import pytest
+
+from benchmarks import harness
+from models.sales import SalesRollup
+from services.report_service import ReportService
+from utils import db
+
+
+@pytest.fixture
+def client(tmp_path):
+    app, tokens, dataset = harness.boot(harness.build_parser().parse_args([]), str(tmp_path))
+    yield app.test_client(), tokens, os.path.join(tmp_path, "bench.db")
+    db.close_pools()
+
+
+def query(path: str, sql: str, params: tuple = ()) -> list:
+    with sqlite3.connect(path) as conn:
+        return conn.execute(sql, params).fetchall()
+
+
+def rollups(path: str) -> tuple:
+    """Both rollup tables, empty buckets left out."""
+    daily = query(path, """SELECT day, status, order_count, units, ROUND(revenue, 2)
+                           FROM sales_daily WHERE order_count <> 0 ORDER BY day, status""")
+    by_category = query(path, """SELECT day, category_id, status, order_count, units, ROUND(revenue, 2)
+                                 FROM sales_daily_category WHERE order_count <> 0
+                                 ORDER BY day, category_id, status""")
+    return daily, by_category
+
+
+def checkout(http, token: str, lines: list) -> int:
+    headers = {"Authorization": f"Bearer {token}"}
+    for product_id, quantity in lines:
+        http.post("/cart/", headers=headers, json={"product_id": product_id, "quantity": quantity})
+    response = http.post("/orders/", headers=headers, json={"shipping_address": "1 Test Road"})
+    assert response.status_code == 201
+    return response.get_json()["data"]["id"]
+
+
+def move(http, admin: dict, order_id: int, status: str):
+    response = http.put(f"/orders/admin/{order_id}/status", headers=admin, json={"status": status})
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("limit", (2, None), ids=("batches of 2", "one batch"))
+def test_applied_queue_matches_a_rebuild(client, limit):
+    http, tokens, path = client
+    admin = {"Authorization": f"Bearer {tokens['admin']}"}
+    SalesRollup.rebuild()
+
+    first  = checkout(http, tokens["users"][0], [(1, 2), (2, 1)])
+    second = checkout(http, tokens["users"][1], [(3, 4)])
+    third  = checkout(http, tokens["users"][2], [(1, 1), (4, 3)])
+    fourth = checkout(http, tokens["users"][3], [(2, 5)])
+    move(http, admin, first, "confirmed")
+    move(http, admin, first, "shipped")     # queued twice before the queue is applied
+    move(http, admin, second, "cancelled")
+    http.put("/orders/admin/status", headers=admin, json={"orders": [
+        {"id": third, "status": "confirmed"}, {"id": first, "status": "delivered"},
+    ]})
+    for status in ("confirmed", "pending", "confirmed"):   # the same move twice
+        move(http, admin, fourth, status)
+    seeded, = query(path, "SELECT MIN(id) FROM orders WHERE status = 'pending'")[0]
+    move(http, admin, seeded, "cancelled")
+
+    while SalesRollup.apply_pending(limit=limit):
+        pass
+    assert query(path, "SELECT COUNT(*) FROM sales_rollup_queue") == [(0,)]
+    applied = rollups(path)
+
+    SalesRollup.rebuild()
+    assert rollups(path) == applied
+
+
+def test_rebuild_empties_the_queue(client):
+    http, tokens, path = client
+    checkout(http, tokens["users"][0], [(5, 1)])
+    SalesRollup.rebuild()
+    assert query(path, "SELECT COUNT(*) FROM sales_rollup_queue") == [(0,)]
+    assert SalesRollup.apply_pending() == 0
+    rebuilt = rollups(path)
+    SalesRollup.rebuild()
+    assert rollups(path) == rebuilt
+
+
+def test_categories_are_the_ones_at_purchase(client):
+    http, tokens, path = client
+    admin = {"Authorization": f"Bearer {tokens['admin']}"}
+    (category, other), = query(path, "SELECT MIN(id), MAX(id) FROM categories")
+    query(path, "UPDATE products SET category_id = ? WHERE id = 6", (category,))
+
+    order_id = checkout(http, tokens["users"][0], [(6, 2)])
+    assert http.put("/products/6", headers=admin, json={"category_id": other}).status_code == 200
+    move(http, admin, order_id, "confirmed")
+    while SalesRollup.apply_pending():
+        pass
+    assert query(path, "SELECT category_id FROM order_items WHERE order_id = ?", (order_id,)) == [(category,)]
+
+    rollup = {r["category_id"]: int(r["units"])
+              for r in SalesRollup.by_category("2000-01-01", "2100-01-01")}
+    report = {c["category_id"] or 0: c["units"]
+              for c in ReportService.item_report("2000-01-01", "2100-01-01")["by_category"]}
+    assert report == rollup
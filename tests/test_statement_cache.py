@@ -0,0 +1,103 @@
+"""
+tests/test_statement_cache.py
+─────────────────────────────
+With DB_PREPARED_STATEMENTS, constant SQL is prepared once per pooled
+connection; SQL whose text grows with the number of values (IN lists,
+multi-row VALUES) goes over the text protocol and never enters the
+cache, so it cannot evict the constant statements.
+
+Run:
+    python -m pytest tests
+"""
+
+import pytest
+from mysql.connector import Error
+
+from config import config
+from models.order import Order
+from models.product import Product
+from models.sales import SalesRollup
+from utils import db
+
+
+class Cursor:
+    rowcount  = 0
+    lastrowid = None
+
+    def __init__(self, raw, prepared):
+        self.raw      = raw
+        self.prepared = prepared
+
+    def execute(self, query, params=()):
+        if self.prepared and query in self.raw.refuse:
+            raise Error(msg="This command is not supported in the prepared statement protocol yet",
+                        errno=db._UNSUPPORTED_PS)
+        self.raw.sent.append(("prepared" if self.prepared else "text", query))
+
+    def fetchone(self):
+        return None
+
+    def fetchall(self):
+        return []
+
+    def close(self):
+        pass
+
+
+class Raw:
+    """Records (protocol, query) per statement; `refuse` fails to prepare."""
+
+    def __init__(self):
+        self.sent   = []
+        self.refuse = set()
+
+    def cursor(self, prepared=False, dictionary=False):
+        return Cursor(self, prepared)
+
+
+@pytest.fixture
+def conn(monkeypatch):
+    monkeypatch.setattr(config, "DB_PREPARED_STATEMENTS", True)
+    monkeypatch.setattr(config, "DB_STATEMENT_CACHE_SIZE", 4)
+    monkeypatch.setattr(db, "_unpreparable", set())
+    return db.PooledConnection(Raw(), None)
+
+
+def protocols(conn) -> list:
+    return [protocol for protocol, query in conn.raw.sent if not query.startswith("SET SESSION")]
+
+
+def test_constant_sql_is_prepared_once(conn):
+    query = "SELECT id FROM users WHERE email = %s"
+    for _ in range(3):
+        conn.execute(query, ("a@b.c",), "one")
+    assert protocols(conn) == ["prepared"] * 3
+    assert len(conn.statements) == 1
+
+
+@pytest.mark.parametrize("build", [
+    lambda n: Product._lock_by_id(list(range(n))),
+    lambda n: Product._set_stock({i: i for i in range(1, n + 1)}),
+    lambda n: Order._items_insert(1, [{"product_id": i, "quantity": 1, "price": 1.0}
+                                      for i in range(n)]),
+    lambda n: SalesRollup._queue_insert(list(range(n)), None, "pending"),
+], ids=["IN list", "CASE id", "order items", "rollup queue"])
+def test_variable_arity_sql_bypasses_the_cache(conn, build):
+    hot = "SELECT id FROM users WHERE email = %s"
+    conn.execute(hot, ("a@b.c",), "one")
+    for n in range(2, 12):
+        conn.execute(*build(n), "none")
+    assert protocols(conn) == ["prepared"] + ["text"] * 10
+    assert len(conn.statements) == 1   # the hot statement was not evicted
+
+
+def test_unpreparable_sql_falls_back_and_stays_bounded(conn, monkeypatch):
+    monkeypatch.setattr(db, "_UNPREPARABLE_MAX", 3)
+    queries = [f"CALL proc_{i}()" for i in range(5)]
+    conn.raw.refuse.update(queries)
+    for query in queries:
+        conn.execute(query, (), "none")
+        conn.execute(query, (), "none")
+    assert protocols(conn) == ["text"] * 10   # the refusal is remembered per query
+    assert len(db._unpreparable) <= 3
+    assert len(conn.statements) == 0
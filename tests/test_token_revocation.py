@@ -0,0 +1,108 @@
+"""
+tests/test_token_revocation.py
+──────────────────────────────
+Logout revokes the access and refresh tokens, a rotated refresh token
+cannot be used again, and other workers' revocations reach this process
+through TokenService.sync() — including a row that commits after a
+higher id was already read, with the app host's clock off by an hour.
+
+Run:
+    python -m pytest tests
+"""
+
+import os
+import sqlite3
+import time
+import types
+
+import pytest
+
+import services.token_service
+from benchmarks import harness
+from services.token_service import TokenService
+from utils import db
+from utils.jwt_handler import decode_token
+from utils.revocation import revocations
+
+
+@pytest.fixture
+def client(tmp_path):
+    app, tokens, dataset = harness.boot(harness.build_parser().parse_args([]), str(tmp_path))
+    revocations.__init__()   # per process; forget the previous test's database
+    yield app.test_client(), os.path.join(tmp_path, "bench.db")
+    db.close_pools()
+    revocations.__init__()
+
+
+def login(http) -> dict:
+    account = {"name": "Test", "email": "revocation@test.local", "password": "secret1"}
+    http.post("/auth/register", json=account)
+    response = http.post("/auth/login", json={k: account[k] for k in ("email", "password")})
+    assert response.status_code == 200
+    return response.get_json()["data"]
+
+
+def profile(http, access_token: str) -> int:
+    return http.get("/auth/profile", headers={"Authorization": f"Bearer {access_token}"}).status_code
+
+
+def refresh(http, refresh_token: str):
+    return http.post("/auth/refresh", json={"refresh_token": refresh_token})
+
+
+def log_revocation(path: str, row_id: int, jti: str, user_id: int):
+    """What another worker's TokenRevocation.revoke() leaves in the log."""
+    with sqlite3.connect(path) as conn:
+        conn.execute("INSERT INTO token_revocations (id, jti, user_id, expires_at) VALUES (?, ?, ?, ?)",
+                     (row_id, jti, user_id, int(time.time()) + 86400))
+
+
+def test_logout_revokes_both_tokens(client):
+    http, _ = client
+    tokens = login(http)
+    assert profile(http, tokens["access_token"]) == 200
+
+    response = http.post("/auth/logout", json={"refresh_token": tokens["refresh_token"]},
+                         headers={"Authorization": f"Bearer {tokens['access_token']}"})
+    assert response.status_code == 200
+    assert profile(http, tokens["access_token"]) == 401
+    assert refresh(http, tokens["refresh_token"]).status_code == 401
+
+
+def test_a_rotated_refresh_token_cannot_be_reused(client):
+    http, _ = client
+    tokens  = login(http)
+    rotated = refresh(http, tokens["refresh_token"])
+    assert rotated.status_code == 200
+
+    reused = refresh(http, tokens["refresh_token"])
+    assert reused.status_code == 401
+    assert "already been used" in reused.get_json()["message"]
+    assert refresh(http, rotated.get_json()["data"]["refresh_token"]).status_code == 200
+
+
+def test_another_workers_revocation_is_picked_up(client):
+    http, path = client
+    tokens  = login(http)
+    payload = decode_token(tokens["access_token"])
+
+    log_revocation(path, 1, payload["jti"], payload["sub"])
+    assert profile(http, tokens["access_token"]) == 200   # not synced yet
+    TokenService.sync()
+    assert profile(http, tokens["access_token"]) == 401
+
+
+def test_a_late_commit_below_a_read_id_is_applied_despite_clock_skew(client, monkeypatch):
+    http, path = client
+    ahead = types.SimpleNamespace(time=lambda: time.time() + 3600, sleep=time.sleep,
+                                  monotonic=time.monotonic)
+    monkeypatch.setattr(services.token_service, "time", ahead)
+    tokens  = login(http)
+    payload = decode_token(tokens["access_token"])
+
+    log_revocation(path, 5, "other-token", payload["sub"])
+    TokenService.sync()                                          # reads id 5 ...
+    log_revocation(path, 3, payload["jti"], payload["sub"])      # ... then id 3 commits
+    TokenService.sync()
+    assert revocations.last_id < 3
+    assert profile(http, tokens["access_token"]) == 401
@@ -0,0 +1,66 @@
+"""
+tools/item_report.py
+────────────────────
+Command-line front end for ReportService.item_report — top sellers,
+revenue per category, basket size and price paid vs current price for
+non-cancelled orders placed in a date range.
+
+Run:
+    python -m tools.item_report --from 2026-09-01 --to 2026-09-30
+    python -m tools.item_report --top 25 --json > september.json
+"""
+
+import argparse
+import json
+import sys
+
+from services.report_service import ReportService
+
+
+def print_report(report: dict):
+    print(f"Orders {report['from']} → {report['to']}: {report['orders']} orders, "
+          f"{report['units']} units, revenue {report['revenue']:,.2f}")
+    print(f"Basket: {report['basket']['avg_units']} units / "
+          f"{report['basket']['avg_value']:,.2f} on average")
+    print(f"At current prices: {report['pricing']['revenue_at_current_prices']:,.2f} "
+          f"({report['pricing']['change_pct']:+.2f}%)")
+
+    print(f"\n{'top sellers':<40}{'units':>8}{'revenue':>14}{'paid':>10}{'now':>10}")
+    print("─" * 82)
+    for p in report["top_sellers"]:
+        print(f"{(p['name'] or '#' + str(p['product_id']))[:39]:<40}{p['units']:>8}"
+              f"{p['revenue']:>14,.2f}{p['avg_price_paid']:>10,.2f}{p['current_price']:>10,.2f}")
+
+    print(f"\n{'category':<40}{'units':>8}{'revenue':>14}")
+    print("─" * 62)
+    for c in report["by_category"]:
+        print(f"{c['category_name'][:39]:<40}{c['units']:>8}{c['revenue']:>14,.2f}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Order item report")
+    parser.add_argument("--from", dest="date_from", help="first day, YYYY-MM-DD (default: 30 days ago)")
+    parser.add_argument("--to",   dest="date_to",   help="last day, YYYY-MM-DD (default: today)")
+    parser.add_argument("--top",  type=int, default=10, help="number of top sellers")
+    parser.add_argument("--chunk-size", type=int, help="rows per streamed chunk")
+    parser.add_argument("--json", action="store_true", help="print the raw JSON report")
+    args = parser.parse_args(argv)
+
+    try:
+        report = ReportService.item_report(args.date_from, args.date_to, args.top, args.chunk_size)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    except Exception as e:
+        print(f"Report failed: {e}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
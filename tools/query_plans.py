@@ -0,0 +1,242 @@
+"""
+tools/query_plans.py
+────────────────────
+Query-plan regression check for every read shape the models can emit.
+
+Each model read is called once per parameter combination — for
+Product.get_all that is every ALLOWED_SORT column × direction × category
+/ search / price filter — while a QueryListener records the statements
+it issues. Every distinct statement shape is then EXPLAINed. The
+models' *_async twins build their SQL with the same helpers, so their
+shapes are covered too.
+
+Shapes marked hot must not need a full table scan or a sort (filesort /
+temporary table). Full-text search and price ranges sorted by another
+column cannot avoid the sort; they are reported but not enforced.
+
+Run:
+    python -m tools.query_plans             # MySQL from DB_* (.env)
+    python -m tools.query_plans --fake      # seeded SQLite stand-in
+    python -m tools.query_plans --verbose   # every shape and plan, incl. accepted sorts
+
+Exit status is 1 when a hot shape regresses. Against MySQL, run it on a
+realistically sized copy: on near-empty tables the optimizer prefers
+scans whatever indexes exist.
+"""
+
+import argparse
+import itertools
+import os
+import random
+import sys
+import tempfile
+from functools import partial
+
+from utils import db
+from models.cart    import Cart
+from models.order   import Order
+from models.product import Product
+from models.sales   import SalesRollup
+from models.token   import TokenRevocation
+from models.user    import User
+
+
+# ── Shape enumeration ──────────────────────────────────────────────────────────
+
+PRICE_FILTERS = ((None, None), (100, None), (None, 500), (100, 500))
+
+
+class Recorder(db.QueryListener):
+    """Collects the distinct SELECT shapes issued while it is installed."""
+
+    def __init__(self):
+        self.statements = {}   # fingerprint → (query, params)
+
+    def on_query(self, query, params, seconds, rows=None, error=None):
+        if error is None and query.lstrip()[:6].upper() == "SELECT":
+            self.statements.setdefault(db.fingerprint(query), (query, params))
+
+
+def record(call) -> list:
+    recorder = Recorder()
+    db.add_listener(recorder)
+    try:
+        call()
+    finally:
+        db.remove_listener(recorder)
+    return list(recorder.statements.values())
+
+
+def drain(stream, *args):
+    """Read a stream_query() generator to the end (its statement is reported on completion)."""
+    for _ in stream(*args):
+        pass
+
+
+def in_transaction(read, *args):
+    """Call a model read that takes the transaction handle (SELECT … FOR UPDATE)."""
+    with db.transaction() as tx:
+        read(tx, *args)
+
+
+def lock_stock_rows(tx, product_ids: list):
+    """Second statement of Product.lock_stock, only sent when a SKU matches."""
+    tx.execute(*Product._lock_by_id(product_ids, active_only=False), fetch="all")
+
+
+def shapes(ids: dict):
+    """Yield (label, call, hot) for every read path in the models."""
+    yield "Product.find_by_id",     partial(Product.find_by_id, ids["product"]), True
+    yield "Product.find_many",      partial(Product.find_many, [ids["product"], ids["product"] + 1]), True
+    yield "Product.get_categories", Product.get_categories,                      False
+
+    for category, search, (low, high), sort_by, order in itertools.product(
+            (None, ids["category"]), (None, "phone"), PRICE_FILTERS,
+            Product.ALLOWED_SORT, ("ASC", "DESC")):
+        hot   = search is None and (sort_by == "price" or (low is None and high is None))
+        label = (f"Product.get_all(category={category}, search={search}, "
+                 f"price={low}..{high}, sort={sort_by} {order})")
+        yield label, partial(Product.get_all, category_id=category, search=search,
+                             min_price=low, max_price=high,
+                             sort_by=sort_by, order=order), hot
+
+    card = ("id", "name", "price", "image_url", "stock")
+    yield "Product.get_all(fields=card)", partial(Product.get_all, fields=card),                      True
+    yield "Product.find_by_id(fields=card)", partial(Product.find_by_id, ids["product"], fields=card), True
+    # Per-line stock pre-check of OrderService.place_order_async (same SQL as the async twin)
+    yield "Product.find_by_id(fields=stock)", partial(Product.find_by_id, ids["product"], fields=("stock",)), True
+
+    yield "Cart.get_user_cart",           partial(Cart.get_user_cart, ids["user_id"]),                True
+    yield "Cart.item_count",              partial(Cart.item_count, ids["user_id"]),                   True
+    yield "User.find_by_id",              partial(User.find_by_id, ids["user_id"]),                   True
+    yield "User.find_by_email",           partial(User.find_by_email, ids["email"]),                  True
+    yield "User.email_exists",            partial(User.email_exists, ids["email"]),                   True
+    yield "Order.find_by_id",             partial(Order.find_by_id, ids["order_id"]),                 True
+    yield "Order.find_by_id(user)",       partial(Order.find_by_id, ids["order_id"], ids["user_id"]), True
+    yield "Order.get_user_orders",        partial(Order.get_user_orders, ids["user_id"]),             True
+    yield "Order.get_summary",            partial(Order.get_summary, ids["user_id"]),                 True
+    yield "Order.get_all_orders",         Order.get_all_orders,                                       True
+    yield "Order.get_all_orders(status)", partial(Order.get_all_orders, status="pending"),            True
+    yield "Order.get_all_orders(fields)", partial(Order.get_all_orders, fields=("id", "status")),     True
+    yield "SalesRollup.daily",            partial(SalesRollup.daily, "2000-01-01", "2100-01-01"),     True
+    yield "SalesRollup.by_category",      partial(SalesRollup.by_category, "2000-01-01", "2100-01-01"), False
+    yield "TokenRevocation.not_before",   partial(TokenRevocation.not_before, ids["user_id"]),        True
+    yield "Product.lock_stock",           partial(in_transaction, Product.lock_stock, ["A-1", "A-2"]), True
+    yield "Product.lock_stock(rows)",     partial(in_transaction, lock_stock_rows, [1, 2]),            True
+    yield "Product.lock_stock_by_id",     partial(in_transaction, Product.lock_stock_by_id, [1, 2]),    True
+    yield "Product.cards_by_sku",         partial(Product.cards_by_sku, ["A-1", "A-2"]),               True
+    yield "Product.stream_export",        partial(drain, Product.stream_export),                      False
+    yield "Product.stream_export(since)", partial(drain, Product.stream_export, "2100-01-01"),        True
+    yield "Order.stream_export",          partial(drain, Order.stream_export),                        False
+    yield "Order.stream_export(since)",   partial(drain, Order.stream_export, "2100-01-01"),          True
+    yield "TokenRevocation.since",        partial(TokenRevocation.since, 0, 0),                       True
+
+
+def sample_ids() -> dict:
+    row = db.execute_query(
+        """SELECT (SELECT MIN(id) FROM products)      AS product,
+                  (SELECT MIN(id) FROM categories)    AS category,
+                  (SELECT MIN(id) FROM orders)        AS order_id,
+                  (SELECT MIN(user_id) FROM orders)   AS user_id""",
+        fetch="one"
+    )
+    if not all(row.values()):
+        sys.exit("Needs products, categories and orders in the database.")
+    row["email"] = User.find_by_id(row["user_id"]).email
+    return row
+
+
+# ── EXPLAIN ────────────────────────────────────────────────────────────────────
+
+def explain_mysql(query: str, params: tuple) -> tuple:
+    """(plan rows, problems) from MySQL's tabular EXPLAIN."""
+    plan     = db.execute_query("EXPLAIN " + query, params, fetch="all")
+    problems = []
+    for row in plan:
+        extra = row.get("Extra") or ""
+        if row.get("type") == "ALL":
+            problems.append(f"full scan of {row['table']}")
+        if "Using filesort" in extra:
+            problems.append(f"filesort on {row['table']}")
+        if "Using temporary" in extra:
+            problems.append(f"temporary table for {row['table']}")
+    return plan, problems
+
+
+def explain_sqlite(query: str, params: tuple) -> tuple:
+    """(plan rows, problems) from SQLite's EXPLAIN QUERY PLAN (--fake)."""
+    plan     = db.execute_query("EXPLAIN QUERY PLAN " + query, params, fetch="all")
+    problems = []
+    for row in plan:
+        detail = row["detail"]
+        if detail.startswith("SCAN ") and " USING " not in detail:
+            problems.append(f"full scan: {detail}")
+        if "TEMP B-TREE" in detail:
+            problems.append(f"sort: {detail}")
+    return plan, problems
+
+
+def use_fake_db(workdir: str):
+    """Seed the benchmark SQLite stand-in and point utils.db at it."""
+    from benchmarks.fake_db import FakeDatabase
+    from benchmarks.harness import seed
+
+    fake = FakeDatabase(os.path.join(workdir, "plans.db"))
+    fake.create_schema()
+    seed(fake, 1, random.Random(42))
+    conn = fake.raw()
+    conn.execute("ANALYZE")
+    conn.close()
+    db.get_connection = fake.connect
+    SalesRollup.rebuild()   # seed() writes orders directly
+
+
+# ── Main ───────────────────────────────────────────────────────────────────────
+
+def check(explain, verbose: bool = False) -> int:
+    ids = sample_ids()
+
+    # A shape shared by a hot and a non-hot call (e.g. a COUNT) is enforced
+    statements = {}   # fingerprint → [query, params, label, hot]
+    for label, call, hot in shapes(ids):
+        for query, params in record(call):
+            entry = statements.setdefault(db.fingerprint(query), [query, params, label, hot])
+            if hot and not entry[3]:
+                entry[2:] = [label, True]
+
+    failures = warnings = 0
+    for shape, (query, params, label, hot) in statements.items():
+        plan, problems = explain(query, params)
+        status   = "ok  " if not problems else ("FAIL" if hot else "warn")
+        failures += bool(problems) and hot
+        warnings += bool(problems) and not hot
+
+        if (problems and hot) or verbose:
+            print(f"{status} {label}\n     {shape}")
+            for problem in problems:
+                print(f"       ✗ {problem}")
+            if verbose:
+                for row in plan:
+                    print(f"       · {row}")
+
+    print("─" * 78)
+    print(f"{len(statements)} shapes, {failures} hot regressions, "
+          f"{warnings} accepted sorts/scans")
+    return 1 if failures else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    parser.add_argument("--fake",    action="store_true", help="use the seeded SQLite stand-in")
+    parser.add_argument("--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args(argv)
+
+    if not args.fake:
+        return check(explain_mysql, args.verbose)
+    with tempfile.TemporaryDirectory() as workdir:
+        use_fake_db(workdir)
+        return check(explain_sqlite, args.verbose)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+"""
+tools/rebuild_rollups.py
+────────────────────────
+Recompute the sales rollup tables (sales_daily, sales_daily_category)
+from orders / order_items.
+
+Use it to backfill after migration 003 or to repair drift. It runs as a
+single transaction on the primary and empties sales_rollup_queue in it;
+live checkouts wait on it, so run it off-peak on large databases.
+
+Run:
+    python -m tools.rebuild_rollups
+"""
+
+import sys
+import time
+
+from models.sales import SalesRollup
+
+
+def main() -> int:
+    started = time.perf_counter()
+    try:
+        SalesRollup.rebuild()
+    except Exception as e:
+        print(f"Rebuild failed: {e}", file=sys.stderr)
+        return 1
+    print(f"Sales rollups rebuilt in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""
+tools/stock_sync.py
+───────────────────
+Apply a warehouse stock delta file (format in services/stock_service.py)
+— the same sync as POST /products/stock-sync, without the upload.
+
+Run:
+    python -m tools.stock_sync deltas.csv
+    python -m tools.stock_sync deltas.csv --errors 50   # list more failed lines
+
+Exit status is 1 when any line failed.
+"""
+
+import argparse
+import sys
+import time
+
+from services.stock_service import StockService
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Apply a warehouse stock delta file")
+    parser.add_argument("path")
+    parser.add_argument("--errors", type=int, default=20, help="failed lines to print")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        with open(args.path, "rb") as file:
+            report = StockService.sync_file(file)
+    except Exception as e:
+        print(f"Stock sync failed: {e}", file=sys.stderr)
+        return 1
+
+    print(f"{report['lines']:,} lines in {time.perf_counter() - started:.2f}s: "
+          f"{report['updated']:,} products updated, {report['unchanged']:,} unchanged, "
+          f"{report['failed']:,} lines failed")
+    for e in report["errors"][:args.errors]:
+        print(f"  line {e['line']}: {e['error']}", file=sys.stderr)
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,393 @@
+"""
+utils/adb.py
+────────────
+asyncio twin of utils/db.py, for the coroutine routes
+(routes/async_routes.py) and the ASGI entry point (asgi.py).
+
+execute_query / transaction() / execute_transaction() mirror their
+utils.db counterparts and are awaited:
+
+    row = await adb.execute_query("SELECT ...", (product_id,), fetch="one")
+
+    async with adb.transaction() as tx:
+        order_id = (await tx.execute("INSERT ...", (...)))["lastrowid"]
+
+Connections are aiomysql ones (autocommit, dict rows), pooled per host
+like utils.db's. Replica routing and read-your-writes stickiness,
+the request deadline (MAX_EXECUTION_TIME) and the QueryListeners are
+shared with utils.db, so both paths are routed, bounded and measured
+the same way. PyMySQL has no server-side prepared statements; the
+statements go over the text protocol.
+
+An aiomysql connection belongs to the event loop it was opened on, so
+all of them live on one long-lived loop per process: the ASGI server's
+(bind_loop(), called from asgi.py's lifespan startup), or else a private
+daemon thread started on first use (and again after fork). run() hands
+a coroutine to that loop from a worker thread and waits for it;
+init_async(app) makes Flask run its coroutine views that way rather
+than on a new loop per request, which would leave nothing to pool.
+
+aiomysql is an optional dependency, only needed when ASYNC_ROUTES is on
+or the app is served through asgi.py.
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import os
+import threading
+from collections import deque
+from contextlib import asynccontextmanager
+from time import perf_counter
+
+from config import config
+from utils import db
+from utils.deadline import DeadlineExceeded, statement_timeout_ms
+
+try:
+    import aiomysql                                # optional dependency
+    from pymysql.err import MySQLError as Error    # what aiomysql raises
+except ImportError:
+    aiomysql = None
+    Error    = ()   # catches nothing: without the driver no statement is ever sent
+
+
+async def connect(host: str = None, port: int = None):
+    """Open a new aiomysql connection (primary unless host/port given)."""
+    if aiomysql is None:
+        raise RuntimeError("Async routes need the aiomysql package (pip install aiomysql)")
+    return await aiomysql.connect(
+        host     = host or config.DB_HOST,
+        port     = port or config.DB_PORT,
+        user     = config.DB_USER,
+        password = config.DB_PASSWORD,
+        db       = config.DB_NAME,
+        autocommit  = True,
+        cursorclass = aiomysql.DictCursor
+    )
+
+
+def _errno(e: Exception):
+    return e.args[0] if e.args and isinstance(e.args[0], int) else None
+
+
+# ── Event loop ─────────────────────────────────────────────────────────────────
+
+_loop      = None
+_loop_pid  = None
+_loop_lock = threading.Lock()
+_UNSET     = object()
+
+
+def bind_loop(loop: asyncio.AbstractEventLoop):
+    """Run every coroutine (and keep every pool) on `loop`, which must be running."""
+    global _loop, _loop_pid
+    with _loop_lock:
+        _loop, _loop_pid = loop, os.getpid()
+        _pools.clear()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """The process's loop: the bound one, else a private one on a daemon thread."""
+    global _loop, _loop_pid
+    if _loop is None or _loop_pid != os.getpid():
+        with _loop_lock:
+            if _loop is None or _loop_pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="adb-loop", daemon=True).start()
+                _pools.clear()   # after fork the parent's connections are not ours
+                _loop, _loop_pid = loop, os.getpid()
+    return _loop
+
+
+def _running_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def run(coro):
+    """
+    Run `coro` on the shared loop and wait for its result, from a thread
+    that is not running an event loop (a WSGI / ASGI worker thread).
+
+    The coroutine sees the caller's context variables (Flask's request,
+    the deadline, DB routing, the trace span) and what it sets is copied
+    back, e.g. read-your-writes stickiness after a write.
+    """
+    if _running_loop() is not None:
+        coro.close()
+        raise RuntimeError("adb.run() called from a coroutine; await it instead")
+
+    loop   = get_loop()
+    ctx    = contextvars.copy_context()
+    result = concurrent.futures.Future()
+
+    def settle(task):
+        if task.cancelled():
+            result.cancel()
+        elif task.exception() is not None:
+            result.set_exception(task.exception())
+        else:
+            result.set_result(task.result())
+
+    def start():
+        loop.create_task(coro, context=ctx).add_done_callback(settle)
+
+    loop.call_soon_threadsafe(start)
+    try:
+        return result.result()
+    finally:
+        for var, value in ctx.items():
+            if var.get(_UNSET) is not value:
+                var.set(value)
+
+
+async def gather(*aws):
+    """
+    asyncio.gather(), but a deadline missed by any of them is also marked
+    on the caller's context (child tasks run in copies of it), so the
+    request is still answered 504.
+    """
+    try:
+        return await asyncio.gather(*aws)
+    except DeadlineExceeded:
+        raise DeadlineExceeded() from None
+
+
+def init_async(app):
+    """Run `app`'s coroutine views on the shared loop. Call once from create_app()."""
+    app.async_to_sync = lambda view: lambda *args, **kwargs: run(view(*args, **kwargs))
+
+
+# ── Connection pool ────────────────────────────────────────────────────────────
+
+class PooledConnection:
+    """An aiomysql connection; release() returns it to the pool."""
+
+    __slots__ = ("raw", "pool", "max_execution_time")
+
+    def __init__(self, raw, pool):
+        self.raw  = raw
+        self.pool = pool
+        self.max_execution_time = 0   # ms, as last SET on this session (0 = no limit)
+
+    async def limit_execution_time(self):
+        """utils.db.PooledConnection.limit_execution_time(), awaited."""
+        ms = statement_timeout_ms()
+        if ms != self.max_execution_time:
+            async with self.raw.cursor() as cursor:
+                await cursor.execute("SET SESSION max_execution_time = %s", (ms,))
+            self.max_execution_time = ms
+
+    async def execute(self, query: str, params: tuple, fetch: str):
+        await self.limit_execution_time()
+        async with self.raw.cursor() as cursor:
+            return await _run(cursor, query, params, fetch)
+
+    def release(self):
+        self.pool.release(self)
+
+    def close(self):
+        try:
+            self.raw.close()
+        except Error:
+            pass
+
+
+class ConnectionPool:
+    """
+    Keeps up to `size` idle connections to one host; extra ones are closed.
+    Only used from the loop's thread, so it needs no lock.
+    """
+
+    def __init__(self, host: str, port: int, size: int):
+        self.host  = host
+        self.port  = port
+        self.size  = size
+        self._idle = deque()
+
+    async def acquire(self) -> PooledConnection:
+        if self._idle:
+            return self._idle.pop()
+        return PooledConnection(await connect(self.host, self.port), self)
+
+    def release(self, conn: PooledConnection):
+        if len(self._idle) < self.size:
+            self._idle.append(conn)
+        else:
+            conn.close()
+
+    def clear(self):
+        idle, self._idle = self._idle, deque()
+        for conn in idle:
+            conn.close()
+
+
+_pools = {}
+
+
+def get_pool(host: str = None, port: int = None) -> ConnectionPool:
+    key  = (host or config.DB_HOST, port or config.DB_PORT)
+    pool = _pools.get(key)
+    if pool is None:
+        pool = _pools[key] = ConnectionPool(key[0], key[1], config.DB_POOL_SIZE)
+    return pool
+
+
+def close_pools():
+    """Close every idle pooled connection (on shutdown, or when the database moved)."""
+    pools = list(_pools.values())
+    _pools.clear()
+    loop = _loop if _loop_pid == os.getpid() else None
+    for pool in pools:
+        if loop is not None and _running_loop() is not loop:
+            loop.call_soon_threadsafe(pool.clear)   # connections are the loop's to close
+        else:
+            pool.clear()
+
+
+async def _connect(readonly: bool) -> PooledConnection:
+    """utils.db._connect(): a replica for reads when possible, else the primary."""
+    if readonly and db.replicas and not db.on_primary():
+        start = next(db._next_replica)
+        for i in range(len(db.replicas)):
+            replica = db.replicas[(start + i) % len(db.replicas)]
+            if not replica.healthy:
+                continue
+            try:
+                return await get_pool(replica.host, replica.port).acquire()
+            except Error:
+                replica.mark_down()   # fail over to the next one / primary
+    return await get_pool().acquire()
+
+
+async def _acquire(readonly: bool = False) -> PooledConnection:
+    started = perf_counter()
+    try:
+        conn = await _connect(readonly)
+    except Error as e:
+        if db._listeners:
+            db._notify_acquire(perf_counter() - started, e)
+        raise
+    if db._listeners:
+        db._notify_acquire(perf_counter() - started)
+    return conn
+
+
+async def _run(cursor, query: str, params: tuple, fetch: str):
+    """Execute one statement on `cursor`, fetch, and report it to listeners."""
+    started = perf_counter()
+    try:
+        await cursor.execute(query, params)
+
+        if fetch == "one":
+            result = await cursor.fetchone()
+            rows   = 1 if result else 0
+        elif fetch == "all":
+            result = await cursor.fetchall()
+            rows   = len(result)
+        else:
+            result = {
+                "affected_rows": cursor.rowcount,
+                "lastrowid":     cursor.lastrowid
+            }
+            rows = cursor.rowcount
+    except Error as e:
+        if db._listeners:
+            elapsed = perf_counter() - started
+            for listener in db._listeners:
+                listener.on_query(query, params, elapsed, None, e)
+        raise
+
+    if db._listeners:
+        elapsed = perf_counter() - started
+        for listener in db._listeners:
+            listener.on_query(query, params, elapsed, rows)
+    return result
+
+
+# ── Query helpers ──────────────────────────────────────────────────────────────
+
+async def execute_query(query: str, params: tuple = (), fetch: str = "none"):
+    """utils.db.execute_query(), awaited — same parameters and results."""
+    readonly = fetch in ("one", "all")
+    if not readonly:
+        db.stick_to_primary()
+
+    # Reads are retried once on a fresh connection if a pooled one went stale
+    for attempt in (1, 2):
+        conn = None
+        try:
+            conn   = await _acquire(readonly)
+            result = await conn.execute(query, params, fetch)   # autocommit: DML is committed
+            conn.release()
+            return result
+
+        except DeadlineExceeded:
+            if conn:
+                conn.release()   # raised before the statement was sent
+            raise
+
+        except Error as e:
+            if conn:
+                conn.close()   # never hand a failed connection back to the pool
+            if _errno(e) == db._QUERY_TIMEOUT:
+                raise DeadlineExceeded()
+            if attempt == 1 and readonly and _errno(e) in db._DISCONNECT_ERRNOS:
+                continue
+            raise Exception(f"Database error: {e}")
+
+
+class Transaction:
+    """Handle yielded by transaction(); execute() mirrors execute_query()."""
+
+    def __init__(self, conn: PooledConnection):
+        self.conn = conn
+
+    async def execute(self, query: str, params: tuple = (), fetch: str = "none"):
+        return await self.conn.execute(query, params, fetch)
+
+
+@asynccontextmanager
+async def transaction():
+    """
+    utils.db.transaction(), awaited. Statements on one connection run one
+    after another — a transaction cannot be spread over several.
+    """
+    db.stick_to_primary()
+
+    conn = None
+    try:
+        conn = await _acquire()
+        await conn.raw.begin()
+        yield Transaction(conn)
+        await conn.raw.commit()
+
+    except Error as e:
+        if conn:
+            conn.close()   # rollback happens server-side when the session ends
+            conn = None
+        if _errno(e) == db._QUERY_TIMEOUT:
+            raise DeadlineExceeded()
+        raise Exception(f"Transaction failed: {e}")
+
+    except BaseException:
+        if conn:
+            try:
+                await conn.raw.rollback()
+            except Error:
+                conn.close()
+                conn = None
+        raise
+
+    finally:
+        if conn:
+            conn.release()
+
+
+async def execute_transaction(queries: list):
+    """utils.db.execute_transaction(), awaited: lastrowid of each (query, params)."""
+    async with transaction() as tx:
+        return [(await tx.execute(query, params))["lastrowid"] for query, params in queries]
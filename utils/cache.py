@@ -0,0 +1,53 @@
+"""
+utils/cache.py
+──────────────
+Small in-process caches.
+
+TTLCache is a thread-safe LRU whose entries also expire after `ttl`
+seconds, bounding how stale a value can be in workers that did not see
+the write that invalidated it.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """LRU of at most `size` entries, each valid for `ttl` seconds."""
+
+    def __init__(self, size: int, ttl: float):
+        self._size    = size
+        self._ttl     = ttl
+        self._entries = OrderedDict()   # key → (expires, value)
+        self._lock    = threading.Lock()
+
+    def get(self, key):
+        """Cached value, or None when missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
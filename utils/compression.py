@@ -0,0 +1,109 @@
+"""
+utils/compression.py
+────────────────────
+Response compression negotiated through Accept-Encoding.
+
+  • gzip always; zstd / br when the optional `zstandard` / `brotli`
+    packages are installed. Preference order and levels come from
+    config.COMPRESSION_LEVELS; the client's q-values win over it.
+  • Only JSON / text bodies of at least COMPRESSION_MIN_BYTES, and never
+    streamed responses (they are sent as they are produced).
+  • Public GET 200 responses (no Authorization header) are cacheable:
+    their compressed bodies are kept in an LRU keyed by encoding + a
+    hash of the uncompressed body. Hashing runs at memory speed while
+    compressing does not, so a catalogue page served thousands of times
+    is compressed once per content change, never served stale, and no
+    invalidation is needed.
+
+Wire it up with init_compression(app) inside create_app().
+"""
+
+import gzip
+import hashlib
+import logging
+
+from flask import request
+from config import config
+from utils.cache import TTLCache
+
+log = logging.getLogger("ecommerce.compression")
+
+COMPRESSIBLE = ("application/json", "text/")
+CACHE_TTL    = 600   # seconds an unused compressed body is kept
+
+
+# ── Encoders ───────────────────────────────────────────────────────────────────
+
+def _gzip(level: int):
+    return lambda data: gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _zstd(level: int):
+    import zstandard   # optional dependency
+    return lambda data: zstandard.compress(data, level)
+
+
+def _brotli(level: int):
+    import brotli      # optional dependency
+    return lambda data: brotli.compress(data, quality=level)
+
+
+_FACTORIES = {"gzip": _gzip, "zstd": _zstd, "br": _brotli}
+
+
+def available_encoders() -> dict:
+    """Content-Encoding → compress(bytes), in preference order."""
+    encoders = {}
+    for name, level in config.COMPRESSION_LEVELS.items():
+        try:
+            encoders[name] = _FACTORIES[name](level)
+        except ImportError:
+            log.info("%s compression unavailable (package not installed)", name)
+    return encoders
+
+
+# ── Middleware ─────────────────────────────────────────────────────────────────
+
+def init_compression(app):
+    """Compress eligible responses; does nothing when COMPRESSION_ENABLED is off."""
+    if not config.COMPRESSION_ENABLED:
+        return
+
+    encoders = available_encoders()
+    names    = list(encoders)
+    cache    = TTLCache(config.COMPRESSION_CACHE_SIZE, CACHE_TTL)
+
+    @app.after_request
+    def _compress(response):
+        if (response.direct_passthrough or response.is_streamed
+                or response.status_code < 200 or response.status_code in (204, 304)
+                or "Content-Encoding" in response.headers
+                or not response.mimetype.startswith(COMPRESSIBLE)):
+            return response
+
+        body = response.get_data()
+        if len(body) < config.COMPRESSION_MIN_BYTES:
+            return response
+        response.vary.add("Accept-Encoding")
+
+        encoding = request.accept_encodings.best_match(names)
+        if encoding is None:
+            return response
+
+        cacheable = (request.method == "GET" and response.status_code == 200
+                     and "Authorization" not in request.headers
+                     and len(body) <= config.COMPRESSION_CACHE_MAX_BYTES)
+        compressed = None
+        if cacheable:
+            key        = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+            compressed = cache.get(key)
+        if compressed is None:
+            compressed = encoders[encoding](body)
+            if cacheable:
+                cache.set(key, compressed)
+        if len(compressed) >= len(body):
+            return response
+
+        response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+        return response
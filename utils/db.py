@@ -3,24 +3,439 @@ utils/db.py
 ───────────
 Thin database layer — provides a context-managed MySQL connection
 and a helper that executes a query and returns results.
+
+Every statement run through execute_query / execute_transaction /
+transaction() is reported to the registered QueryListeners
+(metrics, profiling, ...). With no listeners registered the only
+overhead is a perf_counter() call per statement.
+
+Connections are pooled per host (autocommit on; transaction() issues
+START TRANSACTION explicitly). With DB_PREPARED_STATEMENTS each pooled
+connection keeps an LRU of server-side prepared statements keyed by SQL
+text, so the constant SQL in the models is parsed once per connection
+and the finite set of dynamic shapes (Product.get_all filters / sort
+columns) stays bounded by DB_STATEMENT_CACHE_SIZE. Statements whose text
+grows with the number of values — IN lists, multi-row VALUES — go over
+the text protocol instead: each length would be a statement of its own
+and push the constant ones out of the cache.
+
+stream_query() feeds large reads (reporting, exports) chunk by chunk
+from an unbuffered cursor.
+
+Every statement is bounded by the current request's deadline
+(utils.deadline): the session's MAX_EXECUTION_TIME is set to the time
+left, and a statement that cannot start or finish in time raises
+DeadlineExceeded instead of a database error.
+
+Read / write splitting: when DB_REPLICAS is set, fetch="one"/"all"
+reads go to a healthy replica (round robin) and DML / transactions go
+to the primary. After the first write in a request, all later reads
+in that request stick to the primary so they see their own writes.
 """
 
+import contextvars
+import itertools
+import re
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from functools import lru_cache
+from time import perf_counter, monotonic, sleep
+
 import mysql.connector
 from mysql.connector import Error
 from config import config
+from utils.deadline import DeadlineExceeded, statement_timeout_ms
 
 
-def get_connection():
-    """Return a new MySQL connection using the active config."""
+def get_connection(host: str = None, port: int = None):
+    """Return a new MySQL connection (primary unless host/port given)."""
     return mysql.connector.connect(
-        host     = config.DB_HOST,
-        port     = config.DB_PORT,
+        host     = host or config.DB_HOST,
+        port     = port or config.DB_PORT,
         user     = config.DB_USER,
         password = config.DB_PASSWORD,
-        database = config.DB_NAME
+        database = config.DB_NAME,
+        autocommit = True
     )
 
 
+# ── Connection pool & prepared statements ──────────────────────
+
+# Lost-connection client errors (server gone away / lost during query)
+_DISCONNECT_ERRNOS = {2006, 2013, 2055}
+# ER_UNSUPPORTED_PS — statement type cannot be prepared
+_UNSUPPORTED_PS = 1295
+# ER_QUERY_TIMEOUT — SELECT aborted by MAX_EXECUTION_TIME
+_QUERY_TIMEOUT  = 3024
+
+# Constant SQL the server refused to prepare (cleared once it holds this many)
+_unpreparable     = set()
+_UNPREPARABLE_MAX = 1024
+
+# `IN (%s`, `), (%s` (second VALUES row): text that varies with the value count
+_VARIABLE_ARITY = re.compile(r"\bIN\s*\(\s*%s|\)\s*,\s*\(\s*%s", re.IGNORECASE)
+
+
+def _preparable(query: str) -> bool:
+    """Whether `query` goes through the statement cache (constant-arity SQL only)."""
+    return query not in _unpreparable and not _VARIABLE_ARITY.search(query)
+
+
+class StatementCache:
+    """
+    Per-connection LRU: SQL text → (prepared cursor, SQL object).
+    Reusing the exact string object lets the prepared cursor skip
+    re-preparing; evicted cursors are closed, deallocating the
+    statement on the server.
+    """
+
+    def __init__(self, raw, size: int):
+        self._raw     = raw
+        self._size    = size
+        self._entries = OrderedDict()
+
+    def get(self, query: str):
+        entry = self._entries.get(query)
+        if entry is not None:
+            self._entries.move_to_end(query)
+            return entry
+
+        entry = self._entries[query] = (self._raw.cursor(prepared=True, dictionary=True), query)
+        if len(self._entries) > self._size:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            evicted.close()
+        return entry
+
+    def discard(self, query: str):
+        entry = self._entries.pop(query, None)
+        if entry:
+            entry[0].close()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class PooledConnection:
+    """A raw connection plus its statement cache; release() returns it to the pool."""
+
+    __slots__ = ("raw", "pool", "statements", "max_execution_time")
+
+    def __init__(self, raw, pool):
+        self.raw        = raw
+        self.pool       = pool
+        self.statements = (StatementCache(raw, config.DB_STATEMENT_CACHE_SIZE)
+                           if config.DB_PREPARED_STATEMENTS else None)
+        self.max_execution_time = 0   # ms, as last SET on this session (0 = no limit)
+
+    def limit_execution_time(self):
+        """
+        Cap this session's SELECTs at the current request's remaining time
+        (utils.deadline); raises DeadlineExceeded, before sending anything,
+        once it is spent. The SET is only issued when the value changes.
+        """
+        ms = statement_timeout_ms()
+        if ms != self.max_execution_time:
+            cursor = self.raw.cursor()
+            try:
+                cursor.execute("SET SESSION max_execution_time = %s", (ms,))
+            finally:
+                cursor.close()
+            self.max_execution_time = ms
+
+    def execute(self, query: str, params: tuple, fetch: str):
+        self.limit_execution_time()
+        if self.statements is not None and _preparable(query):
+            try:
+                cursor, query = self.statements.get(query)
+                return _run(cursor, query, params, fetch)
+            except Error as e:
+                if e.errno != _UNSUPPORTED_PS:
+                    raise
+                if len(_unpreparable) >= _UNPREPARABLE_MAX:
+                    _unpreparable.clear()
+                _unpreparable.add(query)
+                self.statements.discard(query)
+
+        cursor = self.raw.cursor(dictionary=True)
+        try:
+            return _run(cursor, query, params, fetch)
+        finally:
+            cursor.close()
+
+    def release(self):
+        self.pool.release(self)
+
+    def close(self):
+        """Drop the connection (and with it every prepared statement)."""
+        self.statements = None
+        try:
+            self.raw.close()
+        except Error:
+            pass
+
+
+class ConnectionPool:
+    """Keeps up to `size` idle connections to one host; extra ones are closed."""
+
+    def __init__(self, host: str, port: int, size: int):
+        self.host  = host
+        self.port  = port
+        self.size  = size
+        self._idle = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> PooledConnection:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return PooledConnection(get_connection(self.host, self.port), self)
+
+    def release(self, conn: PooledConnection):
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def clear(self):
+        with self._lock:
+            idle, self._idle = self._idle, deque()
+        for conn in idle:
+            conn.close()
+
+
+_pools      = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(host: str = None, port: int = None) -> ConnectionPool:
+    key  = (host or config.DB_HOST, port or config.DB_PORT)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = ConnectionPool(key[0], key[1], config.DB_POOL_SIZE)
+    return pool
+
+
+def close_pools():
+    """Close every idle pooled connection (e.g. after fork or on shutdown)."""
+    for pool in list(_pools.values()):
+        pool.clear()
+
+
+# ── Replica routing ────────────────────────────────────────────
+
+class Replica:
+    """A read replica; `down_until` > now means it is skipped."""
+
+    __slots__ = ("host", "port", "down_until")
+
+    def __init__(self, host: str, port: int):
+        self.host       = host
+        self.port       = port
+        self.down_until = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        return self.down_until <= monotonic()
+
+    def mark_down(self):
+        self.down_until = monotonic() + config.DB_REPLICA_RETRY_SECONDS
+
+
+def _parse_replicas(spec: list) -> list:
+    replicas = []
+    for entry in spec:
+        host, _, port = entry.partition(":")
+        replicas.append(Replica(host, int(port or config.DB_PORT)))
+    return replicas
+
+
+replicas = _parse_replicas(config.DB_REPLICAS)
+_next_replica = itertools.count()
+
+# True once the current request has written — later reads go to the primary
+_use_primary = contextvars.ContextVar("db_use_primary", default=False)
+
+
+def reset_routing():
+    """Forget read-your-writes stickiness. Called at the start of every request."""
+    _use_primary.set(False)
+
+
+def stick_to_primary():
+    """Send every remaining read of the current request to the primary."""
+    _use_primary.set(True)
+
+
+def on_primary() -> bool:
+    """True once the current request reads from the primary (it has written)."""
+    return _use_primary.get()
+
+
+def _connect(readonly: bool) -> PooledConnection:
+    """Pooled replica connection for reads when possible, else the primary."""
+    if readonly and replicas and not _use_primary.get():
+        start = next(_next_replica)
+        for i in range(len(replicas)):
+            replica = replicas[(start + i) % len(replicas)]
+            if not replica.healthy:
+                continue
+            try:
+                return get_pool(replica.host, replica.port).acquire()
+            except Error:
+                replica.mark_down()   # fail over to the next one / primary
+    return get_pool().acquire()
+
+
+def check_replicas():
+    """
+    Health-check every replica: unreachable ones, or ones lagging more than
+    DB_REPLICA_MAX_LAG seconds behind the primary, are taken out of rotation.
+    """
+    for replica in replicas:
+        try:
+            conn = get_connection(replica.host, replica.port)
+        except Error:
+            replica.mark_down()
+            continue
+
+        lag = 0
+        try:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("SHOW REPLICA STATUS")
+            status = cursor.fetchone()
+            cursor.close()
+            if status:
+                lag = status.get("Seconds_Behind_Source")
+        except Error:
+            pass   # no REPLICATION CLIENT privilege — reachability only
+        finally:
+            conn.close()
+
+        if lag is None or lag > config.DB_REPLICA_MAX_LAG:
+            replica.mark_down()
+        else:
+            replica.down_until = 0.0
+
+
+def start_replica_health_checks():
+    """Run check_replicas() every DB_REPLICA_CHECK_INTERVAL seconds in the background."""
+    if not replicas or getattr(start_replica_health_checks, "started", False):
+        return
+    start_replica_health_checks.started = True
+
+    def loop():
+        while True:
+            check_replicas()
+            sleep(config.DB_REPLICA_CHECK_INTERVAL)
+
+    threading.Thread(target=loop, name="replica-health", daemon=True).start()
+
+
+# ── Instrumentation hooks ──────────────────────────────────────
+
+class QueryListener:
+    """Base class for DB observers. Override what you need."""
+
+    def on_acquire(self, seconds: float, error: Exception = None):
+        """A connection was obtained (or failed to be) after `seconds`."""
+
+    def on_query(self, query: str, params: tuple, seconds: float,
+                 rows: int = None, error: Exception = None):
+        """A statement finished. `rows` is fetched/affected rows."""
+
+
+_listeners = []
+
+
+def add_listener(listener: QueryListener):
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_listener(listener: QueryListener):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+_LITERALS = re.compile(r"'(?:[^'\\]|\\.)*'|\b\d+(?:\.\d+)?\b|%s")
+_IN_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_ROW_RUNS = re.compile(r"\(\?\+\)(?:\s*,\s*\(\?\+\))+")
+_WHEN_RUN = re.compile(r"\bWHEN \? THEN \?(?: WHEN \? THEN \?)*", re.IGNORECASE)
+_SPACES   = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(query: str) -> str:
+    """
+    Normalise a statement to its shape: literals and placeholders become
+    `?`, IN-lists and multi-row VALUES lists collapse to `(?+)`, a run of
+    `WHEN ? THEN ?` to `WHEN ?+ THEN ?+`, whitespace is squeezed — so a
+    statement built for any number of rows has one shape.
+    """
+    shape = _SPACES.sub(" ", _LITERALS.sub("?", query)).strip()
+    shape = _ROW_RUNS.sub("(?+)", _IN_LISTS.sub("(?+)", shape))
+    return _WHEN_RUN.sub("WHEN ?+ THEN ?+", shape)
+
+
+def _notify_acquire(seconds: float, error: Exception = None):
+    for listener in _listeners:
+        listener.on_acquire(seconds, error)
+
+
+def _acquire(readonly: bool = False):
+    started = perf_counter()
+    try:
+        conn = _connect(readonly)
+    except Error as e:
+        if _listeners:
+            _notify_acquire(perf_counter() - started, e)
+        raise
+    if _listeners:
+        _notify_acquire(perf_counter() - started)
+    return conn
+
+
+def _run(cursor, query: str, params: tuple, fetch: str):
+    """Execute one statement on `cursor`, fetch, and report it to listeners."""
+    started = perf_counter()
+    try:
+        cursor.execute(query, params)
+
+        if fetch == "one":
+            result = cursor.fetchone()
+            rows   = 1 if result else 0
+            if result is not None:
+                cursor.fetchall()   # drain, so the pooled connection stays usable
+        elif fetch == "all":
+            result = cursor.fetchall()
+            rows   = len(result)
+        else:
+            result = {
+                "affected_rows": cursor.rowcount,
+                "lastrowid":     cursor.lastrowid
+            }
+            rows = cursor.rowcount
+    except Error as e:
+        if _listeners:
+            elapsed = perf_counter() - started
+            for listener in _listeners:
+                listener.on_query(query, params, elapsed, None, e)
+        raise
+
+    if _listeners:
+        elapsed = perf_counter() - started
+        for listener in _listeners:
+            listener.on_query(query, params, elapsed, rows)
+    return result
+
+
+# ── Query helpers ──────────────────────────────────────────────
+
 def execute_query(query: str, params: tuple = (), fetch: str = "none"):
     """
     Execute a SQL query and optionally return results.
@@ -40,36 +455,133 @@ def execute_query(query: str, params: tuple = (), fetch: str = "none"):
       "all"  → list[dict]
       "none" → {"affected_rows": int, "lastrowid": int}
     """
-    conn   = None
-    cursor = None
+    readonly = fetch in ("one", "all")
+    if not readonly:
+        _use_primary.set(True)
+
+    # Reads are retried once on a fresh connection if a pooled one went stale
+    for attempt in (1, 2):
+        conn = None
+        try:
+            conn   = _acquire(readonly)
+            result = conn.execute(query, params, fetch)   # autocommit: DML is committed
+            conn.release()
+            return result
+
+        except DeadlineExceeded:
+            if conn:
+                conn.release()   # raised before the statement was sent
+            raise
+
+        except Error as e:
+            if conn:
+                conn.close()   # never hand a failed connection back to the pool
+            if e.errno == _QUERY_TIMEOUT:
+                raise DeadlineExceeded()
+            if attempt == 1 and readonly and e.errno in _DISCONNECT_ERRNOS:
+                continue
+            raise Exception(f"Database error: {e}")
+
+
+def stream_query(query: str, params: tuple = (), chunk_size: int = 10_000):
+    """
+    Yield a large SELECT's result as lists of up to `chunk_size` tuples
+    (columns in SELECT order), read from an unbuffered cursor so memory
+    stays bounded by one chunk. Reads go to a replica when configured.
+
+    A stream abandoned before the end drops its connection (the unread
+    rows make it unusable) instead of returning it to the pool.
+    """
+    conn    = None
+    done    = False
+    rows    = 0
+    started = perf_counter()
     try:
-        conn   = get_connection()
-        cursor = conn.cursor(dictionary=True)   # rows as dicts
+        conn   = _acquire(readonly=True)
+        conn.limit_execution_time()
+        cursor = conn.raw.cursor()   # text protocol, unbuffered, plain tuples
         cursor.execute(query, params)
+        while True:
+            chunk = cursor.fetchmany(chunk_size)
+            if not chunk:
+                break
+            rows += len(chunk)
+            yield chunk
+        cursor.close()
+        done = True
 
-        if fetch == "one":
-            return cursor.fetchone()
+    except Error as e:
+        if _listeners:
+            for listener in _listeners:
+                listener.on_query(query, params, perf_counter() - started, None, e)
+        if e.errno == _QUERY_TIMEOUT:
+            raise DeadlineExceeded()
+        raise Exception(f"Database error: {e}")
+
+    finally:
+        if conn and done:
+            conn.release()
+        elif conn:
+            conn.close()
+
+    if _listeners:
+        elapsed = perf_counter() - started
+        for listener in _listeners:
+            listener.on_query(query, params, elapsed, rows)
 
-        if fetch == "all":
-            return cursor.fetchall()
 
-        # DML — commit and return metadata
-        conn.commit()
-        return {
-            "affected_rows": cursor.rowcount,
-            "lastrowid":     cursor.lastrowid
-        }
+class Transaction:
+    """Handle yielded by transaction(); execute() mirrors execute_query()."""
+
+    def __init__(self, conn: PooledConnection):
+        self.conn = conn
+
+    def execute(self, query: str, params: tuple = (), fetch: str = "none"):
+        return self.conn.execute(query, params, fetch)
+
+
+@contextmanager
+def transaction():
+    """
+    Run several statements on one connection and commit them atomically.
+
+        with transaction() as tx:
+            order_id = tx.execute("INSERT ...", (...))["lastrowid"]
+            tx.execute("INSERT ...", (order_id, ...))
+
+    Any exception rolls back; MySQL errors are re-raised as
+    Exception("Transaction failed: ...").
+    Always runs on the primary.
+    """
+    _use_primary.set(True)
+
+    conn = None
+    try:
+        conn = _acquire()
+        conn.raw.start_transaction()
+        yield Transaction(conn)
+        conn.raw.commit()
 
     except Error as e:
         if conn:
-            conn.rollback()
-        raise Exception(f"Database error: {e}")
+            conn.close()   # rollback happens server-side when the session ends
+            conn = None
+        if e.errno == _QUERY_TIMEOUT:
+            raise DeadlineExceeded()
+        raise Exception(f"Transaction failed: {e}")
+
+    except BaseException:
+        if conn:
+            try:
+                conn.raw.rollback()
+            except Error:
+                conn.close()
+                conn = None
+        raise
 
     finally:
-        if cursor:
-            cursor.close()
-        if conn and conn.is_connected():
-            conn.close()
+        if conn:
+            conn.release()
 
 
 def execute_transaction(queries: list):
@@ -84,27 +596,5 @@ def execute_transaction(queries: list):
     -------
     list of lastrowid for each query
     """
-    conn   = None
-    cursor = None
-    try:
-        conn   = get_connection()
-        cursor = conn.cursor(dictionary=True)
-        results = []
-
-        for query, params in queries:
-            cursor.execute(query, params)
-            results.append(cursor.lastrowid)
-
-        conn.commit()
-        return results
-
-    except Error as e:
-        if conn:
-            conn.rollback()
-        raise Exception(f"Transaction failed: {e}")
-
-    finally:
-        if cursor:
-            cursor.close()
-        if conn and conn.is_connected():
-            conn.close()
+    with transaction() as tx:
+        return [tx.execute(query, params)["lastrowid"] for query, params in queries]
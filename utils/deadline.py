@@ -0,0 +1,130 @@
+"""
+utils/deadline.py
+─────────────────
+Per-request time budgets, enforced down to the database.
+
+  • init_deadlines(app) gives every request a deadline when it starts:
+    the budget configured for its endpoint or blueprint in
+    config.REQUEST_TIMEOUTS (else REQUEST_TIMEOUT_DEFAULT), or the
+    client's X-Request-Timeout header (seconds, capped at
+    REQUEST_TIMEOUT_MAX). None means no deadline (streamed exports and
+    imports).
+  • The deadline lives in a context variable, so it reaches the services
+    and utils.db without being passed around, and /batch sub-requests
+    keep the outer request's deadline if it is the earlier one.
+  • utils.db calls statement_timeout_ms() before every statement and caps
+    the session's MAX_EXECUTION_TIME at the time left; a statement that
+    would start after the deadline, or that MySQL aborts for running out
+    of it, raises DeadlineExceeded.
+  • The request is answered 504 — also when a route's generic
+    `except Exception` turned the DeadlineExceeded into a 500.
+"""
+
+import contextvars
+from bisect import bisect_right
+from time import monotonic
+
+from flask import request, g
+from config import config
+from utils.response import error
+
+_deadline = contextvars.ContextVar("request_deadline", default=None)
+_exceeded = contextvars.ContextVar("request_deadline_exceeded", default=False)
+
+# MAX_EXECUTION_TIME values (ms) a connection is set to: the remaining
+# budget is rounded down to the nearest step (each 2^¼ ≈ 19% above the
+# last), so a pooled connection keeps its setting across requests with
+# similar budgets instead of needing a SET before nearly every statement.
+_STEPS = sorted({int(2 ** (k / 4)) for k in range(4 * 22)})
+
+
+class DeadlineExceeded(Exception):
+    """The current request ran out of time (answered with 504)."""
+
+    def __init__(self, message: str = "Request deadline exceeded"):
+        super().__init__(message)
+        _exceeded.set(True)
+
+
+def remaining() -> float:
+    """Seconds left for the current request; None without a deadline."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - monotonic()
+
+
+def check():
+    """Raise DeadlineExceeded if the current request is out of time."""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded()
+
+
+def statement_timeout_ms() -> int:
+    """
+    MAX_EXECUTION_TIME for the next statement: the remaining budget in
+    ms, rounded down to a step; 0 (no limit) without a deadline. Raises
+    DeadlineExceeded when less than 1 ms is left.
+    """
+    left = remaining()
+    if left is None:
+        return 0
+    ms = int(left * 1000)
+    if ms < 1:
+        raise DeadlineExceeded()
+    return _STEPS[bisect_right(_STEPS, ms) - 1]
+
+
+def budget() -> float:
+    """This request's budget in seconds (None = no deadline); ValueError on a bad header."""
+    header = request.headers.get(config.REQUEST_TIMEOUT_HEADER)
+    if header is not None:
+        try:
+            seconds = float(header)
+        except ValueError:
+            seconds = 0.0
+        if not 0 < seconds < float("inf"):
+            raise ValueError(f"{config.REQUEST_TIMEOUT_HEADER} must be a positive number of seconds")
+        return min(seconds, config.REQUEST_TIMEOUT_MAX)
+
+    for key in (request.endpoint, request.blueprint):
+        if key in config.REQUEST_TIMEOUTS:
+            return config.REQUEST_TIMEOUTS[key]
+    return config.REQUEST_TIMEOUT_DEFAULT
+
+
+# ── Flask integration ──────────────────────────────────────────────────────────
+
+def init_deadlines(app):
+    """Register the deadline hooks on `app`. Call once from create_app()."""
+
+    @app.before_request
+    def _start_deadline():
+        try:
+            seconds = budget()
+        except ValueError as e:
+            return error(str(e), 400)
+
+        inherited = _deadline.get()   # set when this is a /batch sub-request
+        deadline  = None if seconds is None else monotonic() + seconds
+        if inherited is not None and (deadline is None or inherited < deadline):
+            deadline = inherited
+        g._deadline_tokens = (_deadline.set(deadline), _exceeded.set(False))
+        return None
+
+    @app.after_request
+    def _gateway_timeout(response):
+        if _exceeded.get() and response.status_code >= 500 and not response.is_streamed:
+            response, status     = error("Request deadline exceeded", 504)
+            response.status_code = status
+        return response
+
+    @app.teardown_request
+    def _clear_deadline(exc):
+        tokens = g.pop("_deadline_tokens", None)
+        if tokens:
+            _deadline.reset(tokens[0])
+            _exceeded.reset(tokens[1])
+
+    @app.errorhandler(DeadlineExceeded)
+    def _deadline_exceeded(e):
+        return error(str(e), 504)
@@ -0,0 +1,45 @@
+"""
+utils/fields.py
+───────────────
+Sparse fieldsets — `?fields=id,name,price` on list / detail endpoints.
+
+A model declares FIELDS: output name → (SQL columns it needs, function
+building the value from a row). From a validated field list these
+helpers derive the SELECT column list, so unrequested columns (wide
+TEXT in particular) are never read, and the projected JSON object.
+"id" is always included.
+"""
+
+ALWAYS = ("id",)
+
+
+class FieldsError(ValueError):
+    """Unknown name in ?fields= (a 400, even where ValueError means 404)."""
+
+
+def parse_fields(spec: str, allowed) -> tuple:
+    """
+    "name, price" → ("id", "name", "price"); None/empty → None (every
+    field). Raises FieldsError naming unknown fields.
+    """
+    if not spec:
+        return None
+    fields  = tuple(dict.fromkeys((*ALWAYS, *(f.strip() for f in spec.split(",") if f.strip()))))
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise FieldsError(f"Unknown field(s): {', '.join(unknown)}. "
+                          f"Allowed: {', '.join(allowed)}")
+    return fields
+
+
+def select_list(fields, spec: dict) -> str:
+    """SQL column list covering `fields` (every field in `spec` when None), each column once."""
+    columns = {}
+    for name in (fields or spec):
+        columns.update(dict.fromkeys(spec[name][0]))
+    return ", ".join(columns)
+
+
+def project(row: dict, fields, spec: dict) -> dict:
+    """The requested fields of a row, in request order."""
+    return {name: spec[name][1](row) for name in fields}
@@ -2,13 +2,23 @@
 utils/jwt_handler.py
 ────────────────────
 JWT-based session handling — generates and validates access/refresh tokens.
+
+Every token carries a random id (jti). The decorators reject tokens
+found in the in-memory revocation list (utils/revocation.py);
+admin_required also re-checks the role through User.cached().
 """
 
+import inspect
+import uuid
+
 import jwt
 from datetime import datetime, timezone
 from functools import wraps
-from flask import request, jsonify
+from flask import request, jsonify, g
 from config import config
+from models.user import User
+from utils.revocation import revocations
+from utils.tracing import traced
 
 
 # ── Token generation ───────────────────────────────────────────────────────────
@@ -19,6 +29,7 @@ def generate_access_token(user_id: int, role: str) -> str:
         "sub":  user_id,
         "role": role,
         "type": "access",
+        "jti":  uuid.uuid4().hex,
         "iat":  datetime.now(timezone.utc),
         "exp":  datetime.now(timezone.utc) + config.JWT_ACCESS_EXPIRY,
     }
@@ -30,44 +41,88 @@ def generate_refresh_token(user_id: int) -> str:
     payload = {
         "sub":  user_id,
         "type": "refresh",
+        "jti":  uuid.uuid4().hex,
         "iat":  datetime.now(timezone.utc),
         "exp":  datetime.now(timezone.utc) + config.JWT_REFRESH_EXPIRY,
     }
     return jwt.encode(payload, config.JWT_SECRET_KEY, algorithm="HS256")
 
 
+@traced("jwt.decode")
 def decode_token(token: str) -> dict:
     """Decode and validate a JWT; raises jwt exceptions on failure."""
     return jwt.decode(token, config.JWT_SECRET_KEY, algorithms=["HS256"])
 
 
+def decode_request_token(token: str) -> dict:
+    """
+    Same as decode_token, but memoised on flask.g so the rate limiter and
+    the route decorators only verify the signature once per request.
+    """
+    cached = g.get("_jwt_decoded")
+    if cached is None or cached[0] != token:
+        try:
+            cached = (token, decode_token(token), None)
+        except jwt.InvalidTokenError as e:
+            cached = (token, None, e)
+        g._jwt_decoded = cached
+
+    if cached[2] is not None:
+        raise cached[2]
+    return cached[1]
+
+
+def current_token() -> dict:
+    """Payload of the access token the current request was authenticated with."""
+    return g._jwt_decoded[1]
+
+
 # ── Route decorators ───────────────────────────────────────────────────────────
 
+def _authenticate():
+    """(current_user, None) for a valid access token, else (None, 401 response)."""
+    auth_header = request.headers.get("Authorization", "")
+
+    if not auth_header.startswith("Bearer "):
+        return None, (jsonify({"success": False,
+                               "message": "Authorization header missing or malformed"}), 401)
+
+    token = auth_header.split(" ")[1]
+
+    try:
+        payload = decode_request_token(token)
+        if payload.get("type") != "access":
+            raise jwt.InvalidTokenError("Not an access token")
+        if revocations.is_revoked(payload):
+            raise jwt.InvalidTokenError("Token has been revoked")
+    except jwt.ExpiredSignatureError:
+        return None, (jsonify({"success": False, "message": "Token has expired"}), 401)
+    except jwt.InvalidTokenError as e:
+        return None, (jsonify({"success": False, "message": f"Invalid token: {e}"}), 401)
+
+    return {"id": payload["sub"], "role": payload["role"]}, None
+
+
 def token_required(f):
     """
-    Decorator — protects a route with JWT auth.
+    Decorator — protects a route (plain or coroutine view) with JWT auth.
     Injects `current_user` dict {id, role} into the wrapped function.
     """
-    @wraps(f)
-    def decorated(*args, **kwargs):
-        auth_header = request.headers.get("Authorization", "")
+    if inspect.iscoroutinefunction(f):
+        @wraps(f)
+        async def decorated_async(*args, **kwargs):
+            current_user, denied = _authenticate()
+            if denied:
+                return denied
+            return await f(current_user, *args, **kwargs)
 
-        if not auth_header.startswith("Bearer "):
-            return jsonify({"success": False,
-                            "message": "Authorization header missing or malformed"}), 401
-
-        token = auth_header.split(" ")[1]
-
-        try:
-            payload = decode_token(token)
-            if payload.get("type") != "access":
-                raise jwt.InvalidTokenError("Not an access token")
-            current_user = {"id": payload["sub"], "role": payload["role"]}
-        except jwt.ExpiredSignatureError:
-            return jsonify({"success": False, "message": "Token has expired"}), 401
-        except jwt.InvalidTokenError as e:
-            return jsonify({"success": False, "message": f"Invalid token: {e}"}), 401
+        return decorated_async
 
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        current_user, denied = _authenticate()
+        if denied:
+            return denied
         return f(current_user, *args, **kwargs)
 
     return decorated
@@ -75,7 +130,8 @@ def token_required(f):
 
 def admin_required(f):
     """
-    Decorator — same as token_required but also enforces admin role.
+    Decorator — same as token_required but also enforces admin role,
+    checked against the (cached) user row as well as the token.
     """
     @wraps(f)
     def decorated(*args, **kwargs):
@@ -88,10 +144,14 @@ def admin_required(f):
         token = auth_header.split(" ")[1]
 
         try:
-            payload = decode_token(token)
+            payload = decode_request_token(token)
             if payload.get("type") != "access":
                 raise jwt.InvalidTokenError("Not an access token")
-            if payload.get("role") != "admin":
+            if revocations.is_revoked(payload):
+                raise jwt.InvalidTokenError("Token has been revoked")
+            # The role claim is as old as the token: confirm it is still held
+            user = User.cached(payload["sub"]) if payload.get("role") == "admin" else None
+            if user is None or user.role != "admin":
                 return jsonify({"success": False,
                                 "message": "Admin access required"}), 403
             current_user = {"id": payload["sub"], "role": payload["role"]}
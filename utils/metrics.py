@@ -0,0 +1,254 @@
+"""
+utils/metrics.py
+────────────────
+In-process metrics exposed in Prometheus text format at GET /metrics.
+
+  • http_requests_total / http_request_duration_seconds /
+    http_requests_in_flight — per blueprint, route and method
+  • db_queries_total / db_query_duration_seconds — per statement fingerprint
+  • db_connection_acquire_seconds / db_errors_total
+
+Recording is lock-free on the hot path: every thread writes into its own
+shard (plain dicts), and only a scrape merges the shards. A lock is taken
+once per thread (shard registration) and once per scrape. Shards of
+threads that have exited are folded into one base shard then, so the
+thread-per-request development server does not grow the registry.
+
+Counts are per process. Under the prefork launcher (server.py) each
+worker has its own registry, and a scrape through the listening socket
+reaches whichever worker accepts it. Read the series as one worker's,
+sum them across scrapes only with a per-instance label from the scraper,
+or run a single worker per target.
+
+/metrics requires `Authorization: Bearer <METRICS_TOKEN>`. Without a
+token configured it only answers clients on the loopback interface.
+"""
+
+import hmac
+import threading
+from bisect import bisect_left
+from time import perf_counter
+
+from flask import request, g, Response
+from config import config
+from utils import db
+from utils.response import error
+
+
+# ── Metric families ────────────────────────────────────────────────────────────
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS      = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5)
+
+# name → (type, help, label names, buckets)
+FAMILIES = {
+    "http_requests_total": (
+        "counter", "HTTP requests by route and status code.",
+        ("blueprint", "route", "method", "status"), None),
+    "http_request_duration_seconds": (
+        "histogram", "HTTP request latency.",
+        ("blueprint", "route", "method"), REQUEST_BUCKETS),
+    "http_requests_in_flight": (
+        "gauge", "HTTP requests currently being served.",
+        ("blueprint", "route"), None),
+    "db_queries_total": (
+        "counter", "SQL statements executed.",
+        ("fingerprint",), None),
+    "db_query_duration_seconds": (
+        "histogram", "SQL statement execution + fetch time.",
+        ("fingerprint",), DB_BUCKETS),
+    "db_connection_acquire_seconds": (
+        "histogram", "Time to obtain a database connection.",
+        (), DB_BUCKETS),
+    "db_errors_total": (
+        "counter", "Failed SQL statements and connection attempts.",
+        ("kind",), None),
+}
+
+
+# ── Sharded registry ───────────────────────────────────────────────────────────
+
+class Registry:
+    """Per-thread shards of {(name, label_values): value}, plus the folded-in dead ones."""
+
+    def __init__(self):
+        self._local  = threading.local()
+        self._shards = {}   # live thread → its shard
+        self._base   = {}   # totals of threads that have exited
+        self._lock   = threading.Lock()
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._reap()
+                self._shards[threading.current_thread()] = shard
+            return shard
+
+    def _reap(self):
+        """Fold the shards of exited threads into the base shard (caller holds lock)."""
+        for thread in [t for t in self._shards if not t.is_alive()]:
+            _merge(self._base, self._shards.pop(thread))
+
+    def inc(self, name: str, labels: tuple = (), value: float = 1):
+        shard = self._shard()
+        key   = (name, labels)
+        shard[key] = shard.get(key, 0) + value
+
+    def observe(self, name: str, labels: tuple, value: float):
+        shard = self._shard()
+        key   = (name, labels)
+        hist  = shard.get(key)
+        if hist is None:
+            buckets = FAMILIES[name][3]
+            hist = shard[key] = [0] * (len(buckets) + 3)   # buckets.., +Inf, sum, count
+        hist[bisect_left(FAMILIES[name][3], value)] += 1
+        hist[-2] += value
+        hist[-1] += 1
+
+    def collect(self) -> dict:
+        """Merge every shard into {(name, labels): value | list}."""
+        with self._lock:
+            self._reap()
+            merged = {}
+            _merge(merged, self._base)
+            shards = list(self._shards.values())
+
+        for shard in shards:
+            _merge(merged, shard)
+        return merged
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        by_family = {}
+        for (name, labels), value in self.collect().items():
+            by_family.setdefault(name, []).append((labels, value))
+
+        lines = []
+        for name, (kind, help_text, label_names, buckets) in FAMILIES.items():
+            series = by_family.get(name)
+            if not series:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(series, key=lambda s: s[0]):
+                pairs = list(zip(label_names, labels))
+                if kind != "histogram":
+                    lines.append(f"{name}{_labels(pairs)} {_num(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(buckets + ("+Inf",), value):
+                    cumulative += count
+                    le = bound if bound == "+Inf" else _num(bound)
+                    lines.append(f"{name}_bucket{_labels(pairs + [('le', le)])} {cumulative}")
+                lines.append(f"{name}_sum{_labels(pairs)} {_num(value[-2])}")
+                lines.append(f"{name}_count{_labels(pairs)} {value[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+def _merge(into: dict, shard: dict):
+    """Add a shard's counters and histograms into `into`."""
+    for key, value in shard.copy().items():
+        if isinstance(value, list):
+            total = into.get(key)
+            if total is None:
+                into[key] = list(value)
+            else:
+                for i, v in enumerate(value):
+                    total[i] += v
+        else:
+            into[key] = into.get(key, 0) + value
+
+
+def _labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _num(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+registry = Registry()
+
+
+# ── DB instrumentation ─────────────────────────────────────────────────────────
+
+class DbMetrics(db.QueryListener):
+    """Feeds utils.db statement and connection timings into the registry."""
+
+    def on_acquire(self, seconds, error=None):
+        registry.observe("db_connection_acquire_seconds", (), seconds)
+        if error is not None:
+            registry.inc("db_errors_total", ("connect",))
+
+    def on_query(self, query, params, seconds, rows=None, error=None):
+        labels = (db.fingerprint(query),)
+        registry.inc("db_queries_total", labels)
+        registry.observe("db_query_duration_seconds", labels, seconds)
+        if error is not None:
+            registry.inc("db_errors_total", ("query",))
+
+
+db_metrics = DbMetrics()
+
+
+# ── Flask integration ──────────────────────────────────────────────────────────
+
+def init_metrics(app):
+    """Register request hooks, DB listener and the /metrics endpoint."""
+    if not config.METRICS_ENABLED:
+        return
+
+    db.add_listener(db_metrics)
+
+    def route_labels():
+        rule = request.url_rule
+        return (request.blueprint or "", rule.rule if rule else "<unmatched>")
+
+    @app.before_request
+    def _start_timer():
+        labels = route_labels()
+        g._metrics = (perf_counter(), labels)
+        registry.inc("http_requests_in_flight", labels)
+
+    @app.after_request
+    def _record_request(response):
+        state = g.get("_metrics")
+        if state:
+            started, (blueprint, route) = state
+            registry.inc("http_requests_total",
+                         (blueprint, route, request.method, str(response.status_code)))
+            registry.observe("http_request_duration_seconds",
+                             (blueprint, route, request.method), perf_counter() - started)
+        return response
+
+    @app.teardown_request
+    def _end_in_flight(exc):
+        state = g.pop("_metrics", None)
+        if state:
+            registry.inc("http_requests_in_flight", state[1], -1)
+
+    @app.route("/metrics")
+    def metrics():
+        if not _scrape_allowed():
+            return error("Metrics require a valid scrape token", 401)
+        return Response(registry.render(), mimetype="text/plain; version=0.0.4")
+
+
+_LOOPBACK = ("127.0.0.1", "::1")
+
+
+def _scrape_allowed() -> bool:
+    if not config.METRICS_TOKEN:
+        return request.remote_addr in _LOOPBACK
+    auth_header = request.headers.get("Authorization", "")
+    return hmac.compare_digest(auth_header.encode(), f"Bearer {config.METRICS_TOKEN}".encode())
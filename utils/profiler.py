@@ -0,0 +1,148 @@
+"""
+utils/profiler.py
+─────────────────
+Per-request query profiler (enable with QUERY_PROFILING=true).
+
+For every request it records each statement run through utils.db
+(fingerprint, number of params, rows, duration) and then:
+
+  • flags fingerprints repeated ≥ N_PLUS_ONE_THRESHOLD times as N+1
+  • logs statements slower than SLOW_QUERY_MS, with their EXPLAIN plan,
+    to SLOW_QUERY_LOG — as their fingerprint and parameter types only, so
+    emails, password hashes and tokens bound to them never reach the log
+  • adds `Server-Timing: db;dur=…` and `X-Query-Count` response headers
+
+When disabled nothing is registered, so it costs nothing.
+"""
+
+import contextvars
+import logging
+import os
+from collections import Counter
+from time import perf_counter
+
+from flask import request, g
+from config import config
+from utils import db
+
+log = logging.getLogger("ecommerce.db.profiler")
+
+# List of query records for the current request; None = not profiling
+_records    = contextvars.ContextVar("query_profile", default=None)
+_explaining = contextvars.ContextVar("query_profile_explaining", default=False)
+
+
+class QueryRecord:
+    __slots__ = ("fingerprint", "param_count", "rows", "seconds", "error")
+
+    def __init__(self, fingerprint, param_count, rows, seconds, error):
+        self.fingerprint = fingerprint
+        self.param_count = param_count
+        self.rows        = rows
+        self.seconds     = seconds
+        self.error       = error
+
+
+class QueryProfiler(db.QueryListener):
+    """Collects statements into the current request's profile."""
+
+    def on_query(self, query, params, seconds, rows=None, error=None):
+        records = _records.get()
+        if records is None or _explaining.get():
+            return
+
+        records.append(QueryRecord(db.fingerprint(query), len(params or ()),
+                                   rows, seconds, error))
+
+        if seconds * 1000 >= config.SLOW_QUERY_MS:
+            log_slow_query(query, params, seconds, rows)
+
+
+profiler = QueryProfiler()
+
+
+def log_slow_query(query: str, params: tuple, seconds: float, rows):
+    """Write a slow statement and (for SELECTs) its EXPLAIN plan to the slow log."""
+    plan = None
+    if query.lstrip().upper().startswith("SELECT"):
+        token = _explaining.set(True)
+        try:
+            plan = db.execute_query("EXPLAIN " + query, params, fetch="all")
+        except Exception as e:
+            plan = f"EXPLAIN failed: {db.fingerprint(str(e))}"   # errors may quote values
+        finally:
+            _explaining.reset(token)
+
+    log.warning(
+        "slow query %.1f ms rows=%s endpoint=%s\n  %s\n  params=%s\n  plan=%s",
+        seconds * 1000, rows, _endpoint(), db.fingerprint(query), _param_types(params), plan
+    )
+
+
+def _param_types(params) -> str:
+    """`(str, int, …)` — the types of the bound values, never the values."""
+    return "(" + ", ".join(type(p).__name__ for p in params or ()) + ")"
+
+
+def summarize(records: list) -> dict:
+    """Query count, total DB time and N+1 suspects for one request."""
+    counts = Counter(r.fingerprint for r in records)
+    return {
+        "queries":    len(records),
+        "db_ms":      sum(r.seconds for r in records) * 1000,
+        "n_plus_one": {fp: n for fp, n in counts.items()
+                       if n >= config.N_PLUS_ONE_THRESHOLD},
+    }
+
+
+def _endpoint() -> str:
+    try:
+        return f"{request.method} {request.path}"
+    except RuntimeError:   # outside a request (CLI, scripts)
+        return "-"
+
+
+# ── Flask integration ──────────────────────────────────────────────────────────
+
+def init_profiling(app):
+    """Register the profiler hooks when QUERY_PROFILING is on."""
+    if not config.QUERY_PROFILING:
+        return
+
+    if config.SLOW_QUERY_LOG and not log.handlers:
+        os.makedirs(os.path.dirname(config.SLOW_QUERY_LOG) or ".", exist_ok=True)
+        handler = logging.FileHandler(config.SLOW_QUERY_LOG)
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+        log.addHandler(handler)
+
+    db.add_listener(profiler)
+
+    @app.before_request
+    def _start_profile():
+        _records.set([])
+        g._query_started = perf_counter()
+
+    @app.after_request
+    def _finish_profile(response):
+        records = _records.get()
+        if records is None:
+            return response
+
+        summary = summarize(records)
+        for fp, n in summary["n_plus_one"].items():
+            log.warning("possible N+1 on %s: %d × %s", _endpoint(), n, fp)
+
+        if config.QUERY_PROFILE_HEADERS:
+            total_ms = (perf_counter() - g._query_started) * 1000
+            response.headers["Server-Timing"] = (
+                f'db;dur={summary["db_ms"]:.2f};desc="{summary["queries"]} queries", '
+                f'app;dur={total_ms:.2f}'
+            )
+            response.headers["X-Query-Count"] = str(summary["queries"])
+            if summary["n_plus_one"]:
+                response.headers["X-N-Plus-One"] = str(len(summary["n_plus_one"]))
+        return response
+
+    @app.teardown_request
+    def _end_profile(exc):
+        _records.set(None)
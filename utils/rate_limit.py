@@ -0,0 +1,204 @@
+"""
+utils/rate_limit.py
+───────────────────
+Request rate limiting and load shedding.
+
+  • Token bucket per client, per blueprint (policies in config.RATE_LIMITS).
+    Clients are keyed by the JWT subject when a valid bearer token is sent,
+    otherwise by remote IP.
+  • Buckets live in a store: MemoryStore (per process, default) or
+    RedisStore (shared between workers / hosts).
+  • A global in-flight counter sheds load with 503 once
+    config.MAX_IN_FLIGHT requests are already being served.
+
+Wire it up with init_rate_limiting(app) inside create_app().
+"""
+
+import abc
+import threading
+import time
+
+from flask import request, g
+from config import config
+from utils.jwt_handler import decode_request_token
+from utils.response import error
+
+
+# ── Bucket stores ──────────────────────────────────────────────────────────────
+
+class RateLimitStore(abc.ABC):
+    """
+    Backend interface. consume() atomically refills the bucket for `key`
+    and tries to take `cost` tokens.
+
+    Returns (allowed, remaining_tokens, retry_after_seconds).
+    """
+
+    @abc.abstractmethod
+    def consume(self, key: str, rate: float, burst: int, cost: int = 1):
+        ...
+
+
+class MemoryStore(RateLimitStore):
+    """In-process token buckets: key → [tokens, last_refill_monotonic]."""
+
+    SWEEP_EVERY = 10_000   # inserts between sweeps of idle (full) buckets
+
+    def __init__(self, max_keys: int = 100_000):
+        self._buckets  = {}
+        self._lock     = threading.Lock()
+        self._max_keys = max_keys
+        self._inserts  = 0
+
+    def consume(self, key: str, rate: float, burst: int, cost: int = 1):
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(burst), now]
+                self._inserts += 1
+                if self._inserts >= self.SWEEP_EVERY or len(self._buckets) > self._max_keys:
+                    self._sweep(now)
+            else:
+                tokens = bucket[0] + (now - bucket[1]) * rate
+                bucket[0] = tokens if tokens < burst else float(burst)
+                bucket[1] = now
+
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                return True, bucket[0], 0.0
+            return False, bucket[0], (cost - bucket[0]) / rate
+
+    def _sweep(self, now: float):
+        """Drop buckets idle long enough to have refilled completely (caller holds lock)."""
+        self._inserts = 0
+        idle_cutoff   = now - 60.0
+        stale = [k for k, (_, last) in self._buckets.items() if last < idle_cutoff]
+        for k in stale:
+            del self._buckets[k]
+
+
+class RedisStore(RateLimitStore):
+    """
+    Shared token buckets in Redis (one hash per key), updated atomically
+    by a Lua script so several workers enforce one limit.
+    Requires the optional `redis` package.
+    """
+
+    _SCRIPT = """
+    local rate, burst, cost, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+    local b = redis.call('HMGET', KEYS[1], 't', 'ts')
+    local tokens = tonumber(b[1]) or burst
+    local ts     = tonumber(b[2]) or now
+    tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+    local allowed = 0
+    if tokens >= cost then
+        tokens  = tokens - cost
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 't', tokens, 'ts', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, url: str):
+        import redis   # optional dependency
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(self._SCRIPT)
+
+    def consume(self, key: str, rate: float, burst: int, cost: int = 1):
+        allowed, tokens = self._script(keys=[f"rl:{key}"],
+                                       args=[rate, burst, cost, time.time()])
+        tokens = float(tokens)
+        if allowed:
+            return True, tokens, 0.0
+        return False, tokens, (cost - tokens) / rate
+
+
+def create_store() -> RateLimitStore:
+    if config.RATE_LIMIT_BACKEND == "redis":
+        return RedisStore(config.RATE_LIMIT_REDIS_URL)
+    return MemoryStore()
+
+
+# ── Global concurrency limiter ─────────────────────────────────────────────────
+
+class ConcurrencyLimiter:
+    """Counts in-flight requests; acquire() fails once `limit` is reached."""
+
+    def __init__(self, limit: int):
+        self.limit     = limit
+        self.in_flight = 0
+        self._lock     = threading.Lock()
+
+    def acquire(self) -> bool:
+        with self._lock:
+            if self.in_flight >= self.limit:
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+
+
+# ── Flask integration ──────────────────────────────────────────────────────────
+
+def client_key() -> str:
+    """JWT subject for authenticated callers, remote IP for everyone else."""
+    auth_header = request.headers.get("Authorization", "")
+    if auth_header.startswith("Bearer "):
+        try:
+            return f"u:{decode_request_token(auth_header[7:])['sub']}"
+        except Exception:
+            pass   # invalid token — the route decorator will reject it
+    return f"ip:{request.remote_addr}"
+
+
+def init_rate_limiting(app, store: RateLimitStore = None):
+    """Register the limiter hooks on `app`. Call once from create_app()."""
+    limiter = ConcurrencyLimiter(config.MAX_IN_FLIGHT)
+    store   = store or create_store()
+    app.extensions["rate_limit_store"] = store
+    app.extensions["concurrency_limiter"] = limiter
+
+    @app.before_request
+    def _shed_and_limit():
+        if not limiter.acquire():
+            return _reject("Server is busy, please retry shortly", 503, 1)
+        g._in_flight = True
+
+        if not config.RATE_LIMIT_ENABLED:
+            return None
+        policy = config.RATE_LIMITS.get(request.blueprint, config.RATE_LIMIT_DEFAULT)
+        if policy is None:
+            return None
+
+        rate, burst = policy
+        allowed, remaining, retry_after = store.consume(
+            f"{request.blueprint}:{client_key()}", rate, burst
+        )
+        g._rate_limit = (burst, remaining)
+        if not allowed:
+            return _reject("Too many requests", 429, retry_after)
+        return None
+
+    @app.after_request
+    def _rate_limit_headers(response):
+        state = g.get("_rate_limit")
+        if state:
+            response.headers["X-RateLimit-Limit"]     = str(state[0])
+            response.headers["X-RateLimit-Remaining"] = str(int(state[1]))
+        return response
+
+    @app.teardown_request
+    def _release(exc):
+        if g.pop("_in_flight", False):
+            limiter.release()
+
+
+def _reject(message: str, status: int, retry_after: float):
+    response, status = error(message, status)
+    response.headers["Retry-After"] = str(max(1, int(retry_after + 0.999)))
+    return response, status
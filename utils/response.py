@@ -3,18 +3,21 @@ utils/response.py
 ─────────────────
 Standardised API response helpers.
 Every endpoint returns the same envelope:
-  { success, message, data?, pagination? }
+  { success, message, data?, pagination?, meta? }
 """
 
 from flask import jsonify
 
 
-def success(message: str = "OK", data=None, status: int = 200, pagination: dict = None):
+def success(message: str = "OK", data=None, status: int = 200, pagination: dict = None,
+            meta: dict = None):
     body = {"success": True, "message": message}
     if data is not None:
         body["data"] = data
     if pagination:
         body["pagination"] = pagination
+    if meta:
+        body["meta"] = meta
     return jsonify(body), status
 
 
@@ -0,0 +1,81 @@
+"""
+utils/revocation.py
+───────────────────
+Per-process view of the token revocation log (models/token.py), checked
+by the JWT decorators on every authenticated request without touching
+the database.
+
+  • revoked jti   → dict jti → expires_at
+  • user cutoffs  → dict user_id → (not_before, expires_at); tokens of
+                    that user with iat < not_before are revoked
+
+services/token_service.py fills it on startup, adds this process's own
+revocations as they happen and pulls the other workers' ones every
+REVOCATION_SYNC_SECONDS. Entries are pruned once expired.
+
+Auto-increment ids are handed out in order but may commit out of it, so
+a sync cannot simply resume after the highest id it has seen: a lower
+id still in flight would be skipped for good. Rows are only settled —
+last_id moved past them — once they were logged more than
+REVOCATION_SYNC_MARGIN seconds before a sync started — both times read
+from the database's clock, so a skewed app host cannot settle them
+early; until then every sync re-reads them, and with them any lower id
+that has since committed.
+"""
+
+import threading
+
+
+class RevocationList:
+    """Revoked token ids + per-user cutoffs, safe for concurrent readers."""
+
+    def __init__(self):
+        self.last_id  = 0      # every token_revocations.id up to this one is applied
+        self._recent  = {}     # id → created (epoch s) of applied rows above last_id
+        self._jtis    = {}     # jti → expires_at
+        self._cutoffs = {}     # user_id → (not_before, expires_at)
+        self._lock    = threading.Lock()
+
+    def __len__(self):
+        return len(self._jtis) + len(self._cutoffs)
+
+    def is_revoked(self, payload: dict) -> bool:
+        """True if the decoded token was revoked by id or by a user cutoff."""
+        jti = payload.get("jti")
+        if jti is not None and jti in self._jtis:
+            return True
+        cutoff = self._cutoffs.get(payload.get("sub"))
+        return cutoff is not None and payload.get("iat", 0) < cutoff[0]
+
+    def add(self, user_id: int, expires_at: int, jti: str = None,
+            not_before: int = None, row_id: int = None, created: int = None):
+        with self._lock:
+            if jti is not None:
+                self._jtis[jti] = expires_at
+            if not_before is not None:
+                current = self._cutoffs.get(user_id)
+                if current is None or not_before > current[0]:
+                    self._cutoffs[user_id] = (not_before, expires_at)
+            if row_id is not None and row_id > self.last_id:
+                self._recent[row_id] = created
+
+    def settle(self, before: int):
+        """
+        Move last_id up to the newest applied row logged before `before`
+        (epoch s, database clock): any lower id was allocated earlier still and has had
+        time to commit, so it was read by now.
+        """
+        with self._lock:
+            settled = [i for i, created in self._recent.items() if created < before]
+            if settled:
+                self.last_id = max(self.last_id, max(settled))
+                self._recent = {i: c for i, c in self._recent.items() if i > self.last_id}
+
+    def prune(self, now: int):
+        """Drop entries whose tokens have all expired."""
+        with self._lock:
+            self._jtis    = {j: exp for j, exp in self._jtis.items() if exp > now}
+            self._cutoffs = {u: c for u, c in self._cutoffs.items() if c[1] > now}
+
+
+revocations = RevocationList()
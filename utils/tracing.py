@@ -0,0 +1,289 @@
+"""
+utils/tracing.py
+────────────────
+Lightweight span tracing: route → service → model → SQL statement.
+
+  • Incoming W3C `traceparent` headers are honoured (sampled parents stay
+    sampled); other requests are sampled at TRACE_SAMPLE_RATE.
+  • @traced() wraps service / model methods in child spans.
+  • Every statement through utils.db becomes a CLIENT span.
+  • Finished spans are batched by a background thread and appended to
+    TRACE_EXPORT_PATH as OTLP/JSON (one ExportTraceServiceRequest per line,
+    readable by the OpenTelemetry collector's otlpjsonfile receiver).
+
+When a request is not sampled the current span is None and @traced()
+costs one ContextVar lookup.
+"""
+
+import atexit
+import contextvars
+import inspect
+import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+from functools import wraps
+
+from flask import request, g
+from config import config
+from utils import db
+
+_current = contextvars.ContextVar("current_span", default=None)
+
+KIND_INTERNAL = 1
+KIND_SERVER   = 2
+KIND_CLIENT   = 3
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind",
+                 "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: str = None,
+                 kind: int = KIND_INTERNAL, start_ns: int = None):
+        self.trace_id   = trace_id
+        self.span_id    = f"{random.getrandbits(64):016x}"
+        self.parent_id  = parent_id
+        self.name       = name
+        self.kind       = kind
+        self.start_ns   = start_ns or time.time_ns()
+        self.end_ns     = None
+        self.attributes = {}
+        self.error      = None
+
+    def child(self, name: str, kind: int = KIND_INTERNAL, start_ns: int = None):
+        return Span(name, self.trace_id, self.span_id, kind, start_ns)
+
+    def end(self, end_ns: int = None):
+        self.end_ns = end_ns or time.time_ns()
+        exporter.export(self)
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId":           self.trace_id,
+            "spanId":            self.span_id,
+            "name":              self.name,
+            "kind":              self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano":   str(self.end_ns),
+            "attributes":        [_attribute(k, v) for k, v in self.attributes.items()],
+            "status":            {"code": 2, "message": self.error} if self.error else {"code": 0},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _attribute(key: str, value) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def current_span():
+    return _current.get()
+
+
+# ── Instrumentation ────────────────────────────────────────────────────────────
+
+def traced(name: str = None):
+    """
+    Decorator — run the function (or coroutine function) in a child span
+    of the current one. Place it under @staticmethod / @classmethod.
+    """
+    def decorator(fn):
+        span_name = name or fn.__qualname__
+
+        if inspect.iscoroutinefunction(fn):
+            @wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                parent = _current.get()
+                if parent is None:
+                    return await fn(*args, **kwargs)
+
+                span  = parent.child(span_name)
+                token = _current.set(span)
+                try:
+                    return await fn(*args, **kwargs)
+                except Exception as e:
+                    span.error = f"{type(e).__name__}: {e}"
+                    raise
+                finally:
+                    _current.reset(token)
+                    span.end()
+            return async_wrapper
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            parent = _current.get()
+            if parent is None:
+                return fn(*args, **kwargs)
+
+            span  = parent.child(span_name)
+            token = _current.set(span)
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                span.error = f"{type(e).__name__}: {e}"
+                raise
+            finally:
+                _current.reset(token)
+                span.end()
+        return wrapper
+    return decorator
+
+
+class SqlTracer(db.QueryListener):
+    """Turns each finished statement into a CLIENT span under the current span."""
+
+    def on_query(self, query, params, seconds, rows=None, error=None):
+        parent = _current.get()
+        if parent is None:
+            return
+        end_ns = time.time_ns()
+        span   = parent.child("SQL " + query.lstrip().split(None, 1)[0].upper(),
+                              KIND_CLIENT, end_ns - int(seconds * 1e9))
+        span.attributes["db.system"]    = "mysql"
+        span.attributes["db.statement"] = db.fingerprint(query)
+        if rows is not None:
+            span.attributes["db.rows"] = rows
+        if error is not None:
+            span.error = str(error)
+        span.end(end_ns)
+
+
+sql_tracer = SqlTracer()
+
+
+# ── Export ─────────────────────────────────────────────────────────────────────
+
+class FileExporter:
+    """Batches finished spans on a background thread and appends OTLP/JSON lines."""
+
+    FLUSH_INTERVAL = 1.0
+    MAX_BATCH      = 512
+
+    def __init__(self):
+        self._queue  = queue.SimpleQueue()
+        self._path   = None
+        self._thread = None
+
+    def start(self, path: str):
+        if self._thread:
+            return
+        self._path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def export(self, span: Span):
+        if self._thread:
+            self._queue.put(span)
+
+    def _run(self):
+        while True:
+            time.sleep(self.FLUSH_INTERVAL)
+            self.flush()
+
+    def flush(self):
+        spans = []
+        try:
+            while True:
+                spans.append(self._queue.get_nowait())
+                if len(spans) >= self.MAX_BATCH:
+                    self._write(spans)
+                    spans = []
+        except queue.Empty:
+            pass
+        if spans:
+            self._write(spans)
+
+    def _write(self, spans: list):
+        payload = {"resourceSpans": [{
+            "resource": {"attributes": [_attribute("service.name", config.TRACE_SERVICE_NAME)]},
+            "scopeSpans": [{
+                "scope": {"name": "ecommerce.tracing"},
+                "spans": [s.to_otlp() for s in spans],
+            }],
+        }]}
+        with open(self._path, "a") as f:
+            f.write(json.dumps(payload, separators=(",", ":")) + "\n")
+
+
+exporter = FileExporter()
+
+
+# ── Flask integration ──────────────────────────────────────────────────────────
+
+def _root_span():
+    """Start the request span, or return None when this request is not sampled."""
+    match = _TRACEPARENT.match(request.headers.get("traceparent", ""))
+    if match:
+        trace_id, parent_id, flags = match.groups()
+        if not int(flags, 16) & 1:
+            return None
+    elif random.random() < config.TRACE_SAMPLE_RATE:
+        trace_id, parent_id = f"{random.getrandbits(128):032x}", None
+    else:
+        return None
+
+    rule = request.url_rule
+    span = Span(f"{request.method} {rule.rule if rule else request.path}",
+                trace_id, parent_id, KIND_SERVER)
+    span.attributes["http.method"] = request.method
+    span.attributes["http.target"] = request.path
+    return span
+
+
+def start_exporter():
+    """Start this process's exporter thread (create_app / each prefork worker)."""
+    if config.TRACING_ENABLED:
+        exporter.start(config.TRACE_EXPORT_PATH)
+
+
+def init_tracing(app):
+    """Register request hooks and the SQL listener (start_exporter() runs the exporter)."""
+    if not config.TRACING_ENABLED:
+        return
+
+    db.add_listener(sql_tracer)
+
+    @app.before_request
+    def _start_trace():
+        span = _root_span()
+        if span is not None:
+            _current.set(span)
+            g._trace_span = span
+
+    @app.after_request
+    def _tag_trace(response):
+        span = g.get("_trace_span")
+        if span is not None:
+            span.attributes["http.status_code"] = response.status_code
+            if response.status_code >= 500:
+                span.error = f"HTTP {response.status_code}"
+            response.headers["traceresponse"] = span.traceparent
+        return response
+
+    @app.teardown_request
+    def _end_trace(exc):
+        span = g.pop("_trace_span", None)
+        _current.set(None)
+        if span is not None:
+            if exc is not None:
+                span.error = f"{type(exc).__name__}: {exc}"
+            span.end()